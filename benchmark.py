@@ -0,0 +1,484 @@
+"""
+Набір бенчмарків алгоритмів пошуку на синтетичних мережах різного розміру.
+
+Для кожного розміру мережа генерується network_generator.py (з фіксованим
+зерном, тож запуски порівнювані), вибираються однакові пари запитів, і
+кожна процедура пошуку вимірюється так:
+
+- час - time.perf_counter, збирач сміття під час вимірювання вимкнений;
+- спершу кілька прогрівальних запитів, результати яких відкидаються;
+- потім усі запити повторюються repeat разів;
+- звіт: середнє, мінімум, процентилі p50 / p90 / p99, максимум.
+
+Підготовка (індекс орієнтирів, ієрархія скорочень, граф NetworkX)
+вимірюється окремо. Процедури, що потребують nx.Graph або дорогої
+підготовки, пропускаються на мережах, більших за відповідний ліміт.
+
+Результати зберігаються в JSON; з --compare поточний запуск порівнюється
+з попереднім, і код виходу 1 сигналізує про регресію.
+
+Приклад:
+    python3 benchmark.py --sizes 1000 10000 100000 --output results.json
+    python3 benchmark.py --sizes 1000 10000 --compare results.json
+"""
+
+import argparse
+import gc
+import itertools
+import json
+import os
+import platform
+import random
+import sys
+import time
+from datetime import datetime, timezone
+
+import networkx as nx
+import numpy as np
+
+from all_pairs import many_to_many_dijkstra
+from contraction_hierarchy import build_contraction_hierarchy, ch_many_to_many, ch_query
+from csr_graph import (admissible_speed_factor, astar_csr, bidirectional_dijkstra_csr,
+                       dijkstra_csr, dijkstra_point_to_point_csr, geographic_heuristic)
+from k_shortest_paths import k_shortest_paths_csr
+from landmarks import build_landmark_index, alt_shortest_path
+from multimodal import build_multimodal_graph, multimodal_shortest_path, pareto_routes
+from network_generator import generate_city_network, network_to_graph
+from time_dependent import build_time_dependent_graph, profile_query, td_dijkstra
+
+DEFAULT_SIZES = (1000, 10_000, 100_000)
+
+# Найбільша мережа, для якої будується nx.Graph (процедури task2 / task3 і NetworkX)
+NX_LIMIT = 100_000
+
+# Найбільша мережа, для якої будується ієрархія скорочень
+CH_LIMIT = 50_000
+
+PERCENTILES = (50, 90, 99)
+
+# Обмеження процедур, кількість результатів яких необмежена: перебираються
+# прості шляхи, не довші за найкоротший більш ніж на SIMPLE_PATHS_SLACK,
+# до SIMPLE_PATHS_LIMIT шляхів або SIMPLE_PATHS_BUDGET секунд; K найкоротших -
+# до K_PATHS шляхів
+SIMPLE_PATHS_SLACK = 0.1
+SIMPLE_PATHS_LIMIT = 10
+SIMPLE_PATHS_BUDGET = 0.5
+K_PATHS = 3
+
+# Найбільша мережа для K найкоротших шляхів (кожен шлях - пошуки з вершин
+# попереднього) і профільних запитів (мітки - кусково-лінійні функції)
+K_PATHS_LIMIT = 100_000
+PROFILE_LIMIT = 10_000
+
+# Максимум пересадок для Парето-маршрутів
+PARETO_MAX_TRANSFERS = 3
+
+# Час відправлення (ранкова година пік) і вікно профільного запиту, хв
+DEPARTURE = 8 * 60
+PROFILE_WINDOW = (7 * 60 + 30, 8 * 60 + 30)
+
+# Розмір блоку many-to-many: запитана пара плюс стільки ж фіксованих вершин
+MANY_TO_MANY_EXTRA = 9
+
+
+def time_calls(func, queries, warmup=3, repeat=3):
+    """
+    Вимірює час виклику func для кожного запиту.
+
+    Args:
+        func (callable): Процедура, що приймає (початок, кінець)
+        queries (list): Пари (початок, кінець)
+        warmup (int): Кількість прогрівальних викликів (не враховуються)
+        repeat (int): Скільки разів повторити всі запити
+
+    Returns:
+        list: Час кожного виміряного виклику, с
+    """
+    for start, end in queries[:warmup]:
+        func(start, end)
+
+    samples = []
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            for start, end in queries:
+                call_start = time.perf_counter()
+                func(start, end)
+                samples.append(time.perf_counter() - call_start)
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+    return samples
+
+
+def summarize(samples):
+    """
+    Зводить виміри часу до статистик.
+
+    Args:
+        samples (list): Час викликів, с
+
+    Returns:
+        dict: count, mean, min, p50, p90, p99, max (с)
+    """
+    values = np.asarray(samples, dtype=np.float64)
+    summary = {
+        'count': len(values),
+        'mean': float(values.mean()),
+        'min': float(values.min())
+    }
+    for q, value in zip(PERCENTILES, np.percentile(values, PERCENTILES)):
+        summary[f'p{q}'] = float(value)
+    summary['max'] = float(values.max())
+    return summary
+
+
+class BenchmarkContext:
+    """
+    Мережа одного розміру та ліниво підготовлені структури для процедур.
+
+    Attributes:
+        network (StreamedNetwork): Згенерована мережа
+        csr (CSRGraph): Граф у форматі CSR
+        setup_times (dict): Час підготовки структур, с
+    """
+
+    def __init__(self, network):
+        self.network = network
+        self.csr = network.csr
+        self.setup_times = {}
+        self._prepared = {}
+
+    def prepared(self, name, build):
+        """Повертає структуру name, будуючи її один раз і вимірюючи час."""
+        if name not in self._prepared:
+            start_time = time.perf_counter()
+            self._prepared[name] = build()
+            self.setup_times[name] = time.perf_counter() - start_time
+        return self._prepared[name]
+
+    def graph(self):
+        return self.prepared('networkx_graph', lambda: network_to_graph(self.network))
+
+
+def _csr_search(search):
+    def setup(context):
+        csr = context.csr
+        return lambda s, t: search(csr, s, t)
+    return setup
+
+
+def _setup_dijkstra_tree(context):
+    csr = context.csr
+    return lambda s, t: dijkstra_csr(csr, s)
+
+
+def _setup_astar(context):
+    csr = context.csr
+    speed_factor = context.prepared('speed_factor', lambda: admissible_speed_factor(csr))
+    return lambda s, t: astar_csr(csr, s, t, geographic_heuristic(csr, t, speed_factor))
+
+
+def _setup_alt(context):
+    csr = context.csr
+    index = context.prepared('landmarks', lambda: build_landmark_index(None, csr=csr))
+    nodes = csr.nodes
+    return lambda s, t: alt_shortest_path(index, csr, nodes[s], nodes[t])
+
+
+def _setup_ch(context):
+    ch = context.prepared('contraction_hierarchy',
+                          lambda: build_contraction_hierarchy(None, csr=context.csr))
+    return lambda s, t: ch_query(ch, s, t)
+
+
+def _setup_dijkstra_algorithm(context):
+    from task3 import dijkstra_algorithm
+    graph, csr = context.graph(), context.csr
+    nodes = csr.nodes
+    return lambda s, t: dijkstra_algorithm(graph, nodes[s], csr=csr)
+
+
+def _setup_task2(name):
+    def setup(context):
+        import task2
+        search = getattr(task2, name)
+        graph = context.graph()
+        nodes = context.csr.nodes
+        return lambda s, t: search(graph, nodes[s], nodes[t])
+    return setup
+
+
+def _setup_simple_paths(context):
+    import task2
+    graph, csr = context.graph(), context.csr
+    nodes = csr.nodes
+
+    def search(s, t):
+        # Межа ваги - від найкоротшого шляху (його пошук входить у вимір)
+        shortest = dijkstra_point_to_point_csr(csr, s, t)[1]
+        paths = task2.simple_paths(graph, nodes[s], nodes[t],
+                                   max_weight=shortest * (1 + SIMPLE_PATHS_SLACK),
+                                   max_paths=SIMPLE_PATHS_LIMIT,
+                                   time_budget=SIMPLE_PATHS_BUDGET)
+        return sum(1 for _ in paths)
+    return search
+
+
+def _setup_k_shortest_paths(context):
+    csr = context.csr
+    return lambda s, t: list(itertools.islice(k_shortest_paths_csr(csr, s, t), K_PATHS))
+
+
+def _multimodal_graph(context):
+    return context.prepared('multimodal_graph',
+                            lambda: build_multimodal_graph(context.graph()))
+
+
+def _setup_multimodal(context):
+    mmg = _multimodal_graph(context)
+    nodes = context.csr.nodes
+    return lambda s, t: multimodal_shortest_path(mmg, nodes[s], nodes[t])
+
+
+def _setup_pareto(context):
+    mmg = _multimodal_graph(context)
+    nodes = context.csr.nodes
+    return lambda s, t: pareto_routes(mmg, nodes[s], nodes[t],
+                                      max_transfers=PARETO_MAX_TRANSFERS)
+
+
+def _time_dependent_graph(context):
+    tdg = context.prepared('time_dependent_graph',
+                           lambda: build_time_dependent_graph(context.graph()))
+    # Номери вершин графа з профілями - через назви, як у мультимодальному
+    index = tdg.csr.index
+    ids = [index[name] for name in context.csr.nodes]
+    return tdg, ids
+
+
+def _setup_td_dijkstra(context):
+    tdg, ids = _time_dependent_graph(context)
+    return lambda s, t: td_dijkstra(tdg, ids[s], DEPARTURE, target=ids[t])
+
+
+def _setup_profile_query(context):
+    tdg, ids = _time_dependent_graph(context)
+    return lambda s, t: profile_query(tdg, ids[s], ids[t], *PROFILE_WINDOW)
+
+
+def _many_to_many(search):
+    def setup(context):
+        structure = search(context)
+        # Фіксовані вершини блоку однакові для всіх запитів одного розміру
+        rng = random.Random(context.csr.num_nodes)
+        extra = rng.sample(range(context.csr.num_nodes),
+                           min(MANY_TO_MANY_EXTRA, context.csr.num_nodes))
+        return lambda s, t: structure([s] + extra, [t] + extra)
+    return setup
+
+
+def _dijkstra_many_to_many(context):
+    csr = context.csr
+    return lambda sources, targets: many_to_many_dijkstra(csr, sources, targets)
+
+
+def _ch_many_to_many(context):
+    ch = context.prepared('contraction_hierarchy',
+                          lambda: build_contraction_hierarchy(None, csr=context.csr))
+    return lambda sources, targets: ch_many_to_many(ch, sources, targets)
+
+
+def _setup_networkx(context):
+    graph = context.graph()
+    nodes = context.csr.nodes
+    return lambda s, t: nx.dijkstra_path_length(graph, nodes[s], nodes[t], weight='weight')
+
+
+# Назва → (підготовка, найбільша мережа або None)
+ROUTINES = {
+    'dijkstra_tree': (_setup_dijkstra_tree, None),
+    'dijkstra_p2p': (_csr_search(dijkstra_point_to_point_csr), None),
+    'bidirectional_dijkstra': (_csr_search(bidirectional_dijkstra_csr), None),
+    'astar': (_setup_astar, None),
+    'alt': (_setup_alt, None),
+    'ch': (_setup_ch, CH_LIMIT),
+    'dijkstra_algorithm': (_setup_dijkstra_algorithm, NX_LIMIT),
+    'bfs_single_path': (_setup_task2('bfs_single_path'), NX_LIMIT),
+    'bidirectional_bfs_path': (_setup_task2('bidirectional_bfs_path'), NX_LIMIT),
+    'dfs_single_path': (_setup_task2('dfs_single_path'), NX_LIMIT),
+    'simple_paths': (_setup_simple_paths, NX_LIMIT),
+    'k_shortest_paths': (_setup_k_shortest_paths, K_PATHS_LIMIT),
+    'multimodal': (_setup_multimodal, NX_LIMIT),
+    'pareto_routes': (_setup_pareto, NX_LIMIT),
+    'td_dijkstra': (_setup_td_dijkstra, NX_LIMIT),
+    'profile_query': (_setup_profile_query, PROFILE_LIMIT),
+    'many_to_many_dijkstra': (_many_to_many(_dijkstra_many_to_many), NX_LIMIT),
+    'ch_many_to_many': (_many_to_many(_ch_many_to_many), CH_LIMIT),
+    'networkx_dijkstra': (_setup_networkx, NX_LIMIT),
+}
+
+
+def sample_queries(num_nodes, count, seed=0):
+    """
+    Вибирає пари різних вершин для запитів.
+
+    Args:
+        num_nodes (int): Кількість вершин
+        count (int): Кількість пар
+        seed (int): Зерно генератора випадкових чисел
+
+    Returns:
+        list: Пари номерів вершин (початок, кінець)
+    """
+    rng = random.Random(seed)
+    queries = []
+    while len(queries) < count:
+        start, end = rng.randrange(num_nodes), rng.randrange(num_nodes)
+        if start != end:
+            queries.append((start, end))
+    return queries
+
+
+def run_benchmarks(sizes=DEFAULT_SIZES, routines=None, num_queries=20, warmup=3,
+                   repeat=3, seed=0, verbose=True):
+    """
+    Запускає бенчмарки для кожного розміру мережі та кожної процедури.
+
+    Args:
+        sizes (sequence): Кількості станцій
+        routines (list): Назви процедур з ROUTINES (None - усі)
+        num_queries (int): Кількість пар запитів
+        warmup (int): Кількість прогрівальних запитів
+        repeat (int): Кількість повторів усіх запитів
+        seed (int): Зерно генерації мереж і запитів
+        verbose (bool): Друкувати прогрес
+
+    Returns:
+        dict: metadata та results (список записів розмір × процедура)
+    """
+    routines = list(ROUTINES) if routines is None else list(routines)
+    unknown = [name for name in routines if name not in ROUTINES]
+    if unknown:
+        raise ValueError(f"Невідомі процедури: {', '.join(unknown)}")
+
+    results = []
+    for size in sizes:
+        start_time = time.perf_counter()
+        network = generate_city_network(size, seed=seed)
+        generation_time = time.perf_counter() - start_time
+        context = BenchmarkContext(network)
+        queries = sample_queries(size, num_queries, seed=seed)
+
+        if verbose:
+            print(f"\n📐 Мережа: {size:,} станцій, {network.csr.num_edges:,} ребер "
+                  f"(згенеровано за {generation_time:.2f} с)")
+
+        for name in routines:
+            setup, limit = ROUTINES[name]
+            if limit is not None and size > limit:
+                if verbose:
+                    print(f"   • {name}: пропущено (ліміт {limit:,} станцій)")
+                continue
+
+            # Структури, спільні з попередніми процедурами, уже побудовані
+            built_before = set(context.setup_times)
+            func = setup(context)
+            summary = summarize(time_calls(func, queries, warmup=warmup, repeat=repeat))
+            record = {'size': size, 'edges': network.csr.num_edges, 'routine': name,
+                      'generation_time': generation_time}
+            record.update(summary)
+            record['setup_times'] = {key: value for key, value in context.setup_times.items()
+                                     if key not in built_before}
+            results.append(record)
+
+            if verbose:
+                print(f"   • {name}: p50 {summary['p50'] * 1000:.3f} мс, "
+                      f"p90 {summary['p90'] * 1000:.3f} мс, p99 {summary['p99'] * 1000:.3f} мс")
+
+    metadata = {
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'python': sys.version.split()[0],
+        'numpy': np.__version__,
+        'networkx': nx.__version__,
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'seed': seed,
+        'queries': num_queries,
+        'warmup': warmup,
+        'repeat': repeat
+    }
+
+    return {'metadata': metadata, 'results': results}
+
+
+def compare_results(baseline, current, metric='p50', threshold=0.10):
+    """
+    Порівнює два запуски за метрикою часу.
+
+    Args:
+        baseline (dict): Попередній результат run_benchmarks
+        current (dict): Поточний результат run_benchmarks
+        metric (str): Метрика для порівняння (наприклад, 'p50')
+        threshold (float): Відносне сповільнення, яке вважається регресією
+
+    Returns:
+        list: Записи (розмір, процедура, було, стало, відношення, регресія)
+    """
+    previous = {(r['size'], r['routine']): r[metric] for r in baseline['results']}
+    rows = []
+    for record in current['results']:
+        key = (record['size'], record['routine'])
+        if key not in previous or previous[key] <= 0:
+            continue
+        ratio = record[metric] / previous[key]
+        rows.append((key[0], key[1], previous[key], record[metric], ratio,
+                     ratio > 1 + threshold))
+    return rows
+
+
+def main(argv=None):
+    """
+    Запускає бенчмарки з параметрами командного рядка.
+    """
+    parser = argparse.ArgumentParser(description="Бенчмарки алгоритмів пошуку шляхів")
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES))
+    parser.add_argument('--routines', nargs='+', choices=list(ROUTINES))
+    parser.add_argument('--queries', type=int, default=20)
+    parser.add_argument('--warmup', type=int, default=3)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default='benchmark_results.json')
+    parser.add_argument('--compare', help="JSON попереднього запуску")
+    parser.add_argument('--threshold', type=float, default=0.10)
+    args = parser.parse_args(argv)
+
+    print("⏱️  БЕНЧМАРКИ АЛГОРИТМІВ ПОШУКУ")
+    print("=" * 60)
+
+    report = run_benchmarks(args.sizes, args.routines, num_queries=args.queries,
+                            warmup=args.warmup, repeat=args.repeat, seed=args.seed)
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\n💾 Результати збережено: {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+        rows = compare_results(baseline, report, threshold=args.threshold)
+        print(f"\n📊 Порівняння з {args.compare} (p50):")
+        for size, routine, before, after, ratio, regression in rows:
+            mark = "⚠️ " if regression else "  "
+            print(f"   {mark}{routine} ({size:,}): {before * 1000:.3f} → "
+                  f"{after * 1000:.3f} мс (x{ratio:.2f})")
+        if any(row[-1] for row in rows):
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,298 @@
+"""
+Центральність за посередництвом і за близькістю (точна та наближена).
+
+Обидві міри рахуються за один прохід алгоритму Брандеса: з кожної
+опорної вершини s виконується BFS (або Дейкстра на CSR-графі для
+зважених ребер), що дає відстані d(s, v), кількість найкоротших шляхів
+і внесок δ_s(v) у посередництво. Той самий прохід дає ексцентриситет
+кожної опорної вершини, тож у точному режимі діаметр, радіус і центр
+(graph_metrics.eccentricity_summary) не потребують окремого пошуку.
+
+Точний режим використовує всі вершини як опорні - O(n·m), значення
+збігаються з nx.betweenness_centrality / nx.closeness_centrality.
+Наближений режим вибирає k випадкових опорних вершин і масштабує
+внески так само, як nx.betweenness_centrality з параметром k у NetworkX
+3.5+: сума внесків ділиться на (k - 1)(n - 2) для опорних вершин (сама
+вершина не може бути джерелом шляху через себе) і на k(n - 2) для решти.
+Оцінка незміщена навіть за умови, що вершина опорна чи ні: інші опорні
+вершини - рівномірна вибірка з решти n - 1 вершин. Старе масштабування
+n / k незміщене лише в середньому за всіма вибірками, а для опорних
+вершин занижує значення в n(k - 1) / (k(n - 1)) разів. За нерівністю
+Гефдінга з імовірністю не менше 1 - δ похибка нормованого посередництва
+кожної вершини не перевищує sqrt(ln(2n / δ) / (2(k - 1))).
+
+Пакети опорних вершин можна розподілити між процесами: кожен процес
+отримує CSR-масиви один раз (через initializer) і повертає часткові суми.
+"""
+
+import heapq
+import math
+import os
+import random
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from csr_graph import CSRGraph, build_csr_graph
+
+# Кількість опорних вершин за замовчуванням у наближеному режимі
+DEFAULT_PIVOTS = 256
+
+# Стан процесу-виконавця, заповнюється в _init_worker
+_worker_state = {}
+
+
+def _brandes_bfs(indptr, indices, n, source, betweenness, distance_sums, reach_counts,
+                 eccentricity):
+    dist = [-1] * n
+    sigma = [0] * n
+    delta = [0.0] * n
+    dist[source] = 0
+    sigma[source] = 1
+    order = []
+    queue = deque([source])
+
+    while queue:
+        v = queue.popleft()
+        order.append(v)
+        next_distance = dist[v] + 1
+        for k in range(indptr[v], indptr[v + 1]):
+            w = indices[k]
+            if dist[w] < 0:
+                dist[w] = next_distance
+                queue.append(w)
+            if dist[w] == next_distance:
+                sigma[w] += sigma[v]
+
+    # Зворотний прохід: попередники v - сусіди, ближчі до джерела на 1
+    for v in reversed(order):
+        coefficient = (1.0 + delta[v]) / sigma[v]
+        previous_distance = dist[v] - 1
+        for k in range(indptr[v], indptr[v + 1]):
+            u = indices[k]
+            if dist[u] == previous_distance:
+                delta[u] += sigma[u] * coefficient
+        if v != source:
+            betweenness[v] += delta[v]
+            distance_sums[v] += dist[v]
+            reach_counts[v] += 1
+
+    # Вершини обробляються в порядку відстані, тож остання - найвіддаленіша
+    eccentricity[source] = dist[order[-1]] if len(order) == n else float('infinity')
+
+
+def _brandes_dijkstra(indptr, indices, weights, n, source, betweenness,
+                      distance_sums, reach_counts, eccentricity):
+    inf = float('infinity')
+    dist = [inf] * n
+    sigma = [0] * n
+    delta = [0.0] * n
+    settled = [False] * n
+    dist[source] = 0.0
+    sigma[source] = 1
+    order = []
+    heap = [(0.0, source)]
+
+    while heap:
+        d, v = heapq.heappop(heap)
+        if settled[v]:
+            continue
+        settled[v] = True
+        order.append(v)
+        for k in range(indptr[v], indptr[v + 1]):
+            w = indices[k]
+            new_distance = d + weights[k]
+            if new_distance < dist[w]:
+                dist[w] = new_distance
+                sigma[w] = sigma[v]
+                heapq.heappush(heap, (new_distance, w))
+            elif new_distance == dist[w] and not settled[w]:
+                sigma[w] += sigma[v]
+
+    for v in reversed(order):
+        coefficient = (1.0 + delta[v]) / sigma[v]
+        dist_v = dist[v]
+        for k in range(indptr[v], indptr[v + 1]):
+            u = indices[k]
+            if dist[u] + weights[k] == dist_v:
+                delta[u] += sigma[u] * coefficient
+        if v != source:
+            betweenness[v] += delta[v]
+            distance_sums[v] += dist_v
+            reach_counts[v] += 1
+
+    eccentricity[source] = dist[order[-1]] if len(order) == n else float('infinity')
+
+
+def _accumulate(csr, pivots, weighted):
+    """
+    Сумує внески опорних вершин.
+
+    Args:
+        csr (CSRGraph): Граф у форматі CSR
+        pivots (list): Номери опорних вершин
+        weighted (bool): Враховувати ваги ребер (Дейкстра) чи ні (BFS)
+
+    Returns:
+        tuple: (суми δ_s(v), суми d(s, v), кількість опорних вершин, що досягають v,
+                ексцентриситет опорних вершин (-1 для решти, inf - досягає не всіх))
+    """
+    indptr, indices, weights = csr.adjacency_lists()
+    n = csr.num_nodes
+    betweenness = [0.0] * n
+    distance_sums = [0.0] * n
+    reach_counts = [0] * n
+    eccentricity = [-1.0] * n
+
+    for source in pivots:
+        if weighted:
+            _brandes_dijkstra(indptr, indices, weights, n, source,
+                              betweenness, distance_sums, reach_counts, eccentricity)
+        else:
+            _brandes_bfs(indptr, indices, n, source,
+                         betweenness, distance_sums, reach_counts, eccentricity)
+
+    return (np.array(betweenness), np.array(distance_sums),
+            np.array(reach_counts, dtype=np.int64), np.array(eccentricity))
+
+
+def _init_worker(num_nodes, indptr, indices, weights, weighted):
+    _worker_state['csr'] = CSRGraph(range(num_nodes), indptr, indices, weights)
+    _worker_state['weighted'] = weighted
+
+
+def _solve_pivots(pivots):
+    return _accumulate(_worker_state['csr'], pivots, _worker_state['weighted'])
+
+
+def betweenness_error_bound(num_nodes, num_pivots, delta=0.05):
+    """
+    Межа похибки нормованого посередництва для наближеного режиму.
+
+    Args:
+        num_nodes (int): Кількість вершин
+        num_pivots (int): Кількість опорних вершин
+        delta (float): Допустима ймовірність перевищення межі (для всіх вершин разом)
+
+    Returns:
+        float: Межа похибки (0 - точний результат)
+    """
+    if num_pivots >= num_nodes:
+        return 0.0
+    if num_pivots < 2:
+        return 1.0
+    return math.sqrt(math.log(2 * num_nodes / delta) / (2 * (num_pivots - 1)))
+
+
+def pivots_for_error(num_nodes, epsilon, delta=0.05):
+    """
+    Кількість опорних вершин, достатня для заданої межі похибки.
+
+    Args:
+        num_nodes (int): Кількість вершин
+        epsilon (float): Бажана межа похибки нормованого посередництва
+        delta (float): Допустима ймовірність перевищення межі
+
+    Returns:
+        int: Кількість опорних вершин (не більше num_nodes)
+    """
+    needed = math.ceil(math.log(2 * num_nodes / delta) / (2 * epsilon ** 2)) + 1
+    return min(num_nodes, needed)
+
+
+def compute_centrality(graph, mode='exact', k=None, weight=None, workers=1,
+                       seed=None, delta=0.05, csr=None):
+    """
+    Обчислює центральність за посередництвом і за близькістю за один прохід.
+
+    Args:
+        graph (nx.Graph): Граф
+        mode (str): 'exact' - усі вершини опорні, 'approx' - k випадкових
+        k (int): Кількість опорних вершин для 'approx' (за замовчуванням
+                 DEFAULT_PIVOTS)
+        weight (str): Атрибут ваги ребер (None - кількість ребер, як у NetworkX
+                      за замовчуванням)
+        workers (int): Кількість процесів (1 - у поточному процесі,
+                       None - за кількістю ядер)
+        seed (int): Зерно вибору опорних вершин
+        delta (float): Імовірність перевищення межі похибки
+        csr (CSRGraph): Готовий CSR-знімок графа (необов'язково)
+
+    Returns:
+        dict: betweenness, closeness (словники вершина → значення),
+              eccentricity (опорна вершина → ексцентриситет, inf - досягає не
+              всіх вершин; у точному режимі - усі вершини),
+              pivots (кількість опорних вершин), error_bound, execution_time
+    """
+    if csr is None:
+        csr = build_csr_graph(graph, weight=weight or 'weight')
+    n = csr.num_nodes
+    weighted = weight is not None
+
+    if mode == 'exact':
+        pivots = list(range(n))
+    elif mode == 'approx':
+        count = min(n, DEFAULT_PIVOTS if k is None else k)
+        pivots = random.Random(seed).sample(range(n), count)
+    else:
+        raise ValueError(f"Невідомий режим: {mode}")
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    start_time = time.perf_counter()
+
+    if workers <= 1 or len(pivots) < 2:
+        betweenness, distance_sums, reach_counts, eccentricity = _accumulate(csr, pivots,
+                                                                            weighted)
+    else:
+        # Кілька пакетів на процес, щоб навантаження вирівнювалося
+        batch = max(1, len(pivots) // (workers * 4))
+        batches = [pivots[i:i + batch] for i in range(0, len(pivots), batch)]
+        betweenness = np.zeros(n)
+        distance_sums = np.zeros(n)
+        reach_counts = np.zeros(n, dtype=np.int64)
+        eccentricity = np.full(n, -1.0)
+        init_args = (n, csr.indptr, csr.indices, csr.weights, weighted)
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=init_args) as executor:
+            for partial in executor.map(_solve_pivots, batches):
+                betweenness += partial[0]
+                distance_sums += partial[1]
+                reach_counts += partial[2]
+                np.maximum(eccentricity, partial[3], out=eccentricity)
+
+    end_time = time.perf_counter()
+
+    # Нормування як у NetworkX 3.5+: частка пар (s, t), s != t != v, тобто
+    # ділення на (кількість джерел для v) x (n - 2); опорна вершина не є
+    # джерелом для самої себе, тому для неї джерел k - 1
+    is_pivot = np.zeros(n, dtype=bool)
+    is_pivot[pivots] = True
+    sources = np.where(is_pivot, len(pivots) - 1, len(pivots)).astype(np.float64)
+    if n > 2:
+        with np.errstate(divide='ignore', invalid='ignore'):
+            betweenness = betweenness / (sources * (n - 2))
+
+    # Близькість з поправкою Вассермана-Фауста для незв'язних графів:
+    # (r / S) * (r / (n - 1)), де r - досяжні вершини, S - сума відстаней.
+    # У наближеному режимі r і S оцінюються за опорними вершинами.
+    closeness = np.zeros(n)
+    reachable = (reach_counts > 0) & (distance_sums > 0)
+    if n > 1:
+        scale = (n - 1) / sources[reachable]
+        estimated_reach = reach_counts[reachable] * scale
+        estimated_sum = distance_sums[reachable] * scale
+        closeness[reachable] = (estimated_reach / estimated_sum) * (estimated_reach / (n - 1))
+
+    nodes = csr.nodes
+    return {
+        'betweenness': dict(zip(nodes, betweenness.tolist())),
+        'closeness': dict(zip(nodes, closeness.tolist())),
+        'eccentricity': {nodes[i]: float(eccentricity[i]) for i in pivots},
+        'pivots': len(pivots),
+        'error_bound': betweenness_error_bound(n, len(pivots), delta),
+        'execution_time': end_time - start_time
+    }
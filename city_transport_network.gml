@@ -5,6 +5,8 @@ graph [
     district "&#1062;&#1077;&#1085;&#1090;&#1088;"
     type "metro"
     population 50000
+    x 0.0
+    y 0.0
   ]
   node [
     id 1
@@ -12,6 +14,8 @@ graph [
     district "&#1062;&#1077;&#1085;&#1090;&#1088;"
     type "metro"
     population 30000
+    x -1.2
+    y 1.2
   ]
   node [
     id 2
@@ -19,6 +23,8 @@ graph [
     district "&#1062;&#1077;&#1085;&#1090;&#1088;"
     type "metro"
     population 40000
+    x 0.5
+    y 1.6
   ]
   node [
     id 3
@@ -26,6 +32,8 @@ graph [
     district "&#1055;&#1110;&#1074;&#1085;&#1110;&#1095;"
     type "train"
     population 35000
+    x 0.5
+    y 4.3
   ]
   node [
     id 4
@@ -33,6 +41,8 @@ graph [
     district "&#1055;&#1110;&#1074;&#1085;&#1110;&#1095;"
     type "bus"
     population 25000
+    x -1.5
+    y 6.5
   ]
   node [
     id 5
@@ -40,6 +50,8 @@ graph [
     district "&#1055;&#1110;&#1074;&#1085;&#1110;&#1095;"
     type "bus"
     population 15000
+    x 0.8
+    y 7.5
   ]
   node [
     id 6
@@ -47,6 +59,8 @@ graph [
     district "&#1057;&#1093;&#1110;&#1076;"
     type "metro"
     population 45000
+    x 4.5
+    y -1.0
   ]
   node [
     id 7
@@ -54,6 +68,8 @@ graph [
     district "&#1057;&#1093;&#1110;&#1076;"
     type "bus"
     population 20000
+    x 4.5
+    y -3.1
   ]
   node [
     id 8
@@ -61,6 +77,8 @@ graph [
     district "&#1057;&#1093;&#1110;&#1076;"
     type "bus"
     population 30000
+    x 6.0
+    y -3.5
   ]
   node [
     id 9
@@ -68,6 +86,8 @@ graph [
     district "&#1047;&#1072;&#1093;&#1110;&#1076;"
     type "train"
     population 25000
+    x -9.0
+    y 6.5
   ]
   node [
     id 10
@@ -75,6 +95,8 @@ graph [
     district "&#1047;&#1072;&#1093;&#1110;&#1076;"
     type "metro"
     population 40000
+    x -5.8
+    y 0.8
   ]
   node [
     id 11
@@ -82,6 +104,8 @@ graph [
     district "&#1047;&#1072;&#1093;&#1110;&#1076;"
     type "bus"
     population 20000
+    x -6.5
+    y 3.2
   ]
   node [
     id 12
@@ -89,6 +113,8 @@ graph [
     district "&#1055;&#1110;&#1074;&#1076;&#1077;&#1085;&#1100;"
     type "train"
     population 30000
+    x -1.0
+    y -7.0
   ]
   node [
     id 13
@@ -96,6 +122,8 @@ graph [
     district "&#1055;&#1110;&#1074;&#1076;&#1077;&#1085;&#1100;"
     type "bus"
     population 35000
+    x 0.8
+    y -7.6
   ]
   node [
     id 14
@@ -103,6 +131,8 @@ graph [
     district "&#1055;&#1110;&#1074;&#1076;&#1077;&#1085;&#1100;"
     type "bus"
     population 40000
+    x 3.0
+    y -7.6
   ]
   edge [
     source 0
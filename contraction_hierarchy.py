@@ -0,0 +1,476 @@
+"""
+Ієрархії скорочень (Contraction Hierarchies) для швидких запитів точка-точка.
+
+Попередня обробка по черзі "стискає" вершини від найменш до найбільш
+важливих. Стиснення вершини v видаляє її з графа і, якщо потрібно,
+додає ребро-скорочення u - w з вагою w(u, v) + w(v, w), щоб відстані між
+рештою вершин не змінилися. Запит - це двонаправлений Дейкстра, який
+рухається лише "вгору" за рангом вершин, тому обробляє дуже мало вузлів.
+Скорочення розгортаються назад у ланцюжок станцій за збереженою
+середньою вершиною.
+"""
+
+import heapq
+import time
+
+import numpy as np
+
+from csr_graph import build_csr_graph
+
+
+class ContractionHierarchy:
+    """
+    Побудована ієрархія скорочень.
+
+    Висхідний граф зберігається у форматі CSR: для кожної вершини - лише
+    ребра до вершин з вищим рангом (і вихідні ребра, і скорочення).
+
+    Attributes:
+        nodes (list): Назви вершин у порядку їх номерів
+        index (dict): Відображення назва вершини → номер
+        rank (np.ndarray): Ранг (порядковий номер стиснення) кожної вершини
+        up_indptr (np.ndarray): Зсуви списків висхідних ребер (n + 1)
+        up_indices (np.ndarray): Кінці висхідних ребер
+        up_weights (np.ndarray): Ваги висхідних ребер
+        up_middle (np.ndarray): Середня вершина скорочення (-1 - вихідне ребро)
+    """
+
+    def __init__(self, nodes, rank, up_indptr, up_indices, up_weights, up_middle):
+        self.nodes = list(nodes)
+        self.index = {node: i for i, node in enumerate(self.nodes)}
+        self.rank = np.asarray(rank, dtype=np.int32)
+        self.up_indptr = np.asarray(up_indptr, dtype=np.int64)
+        self.up_indices = np.asarray(up_indices, dtype=np.int32)
+        self.up_weights = np.asarray(up_weights, dtype=np.float64)
+        self.up_middle = np.asarray(up_middle, dtype=np.int32)
+        self._lists = None
+
+    @property
+    def num_nodes(self):
+        return len(self.nodes)
+
+    @property
+    def num_shortcuts(self):
+        return int(np.count_nonzero(self.up_middle >= 0))
+
+    @property
+    def order(self):
+        """Номери вершин у порядку стиснення."""
+        return np.argsort(self.rank).astype(np.int32)
+
+    def adjacency_lists(self):
+        """
+        Повертає масиви висхідного графа як списки Python.
+
+        Returns:
+            tuple: (indptr, indices, weights, middle) у вигляді списків
+        """
+        if self._lists is None:
+            self._lists = (self.up_indptr.tolist(),
+                           self.up_indices.tolist(),
+                           self.up_weights.tolist(),
+                           self.up_middle.tolist())
+        return self._lists
+
+    def save(self, path):
+        """
+        Зберігає ієрархію у файл .npz.
+
+        Args:
+            path (str): Шлях до файлу
+        """
+        np.savez(path,
+                 nodes=np.array([str(node) for node in self.nodes]),
+                 rank=self.rank,
+                 up_indptr=self.up_indptr,
+                 up_indices=self.up_indices,
+                 up_weights=self.up_weights,
+                 up_middle=self.up_middle)
+
+    def _middle_of(self, lower, higher):
+        """Повертає середню вершину висхідного ребра lower → higher."""
+        indptr, indices, _, middle = self.adjacency_lists()
+        for k in range(indptr[lower], indptr[lower + 1]):
+            if indices[k] == higher:
+                return middle[k]
+        raise KeyError((lower, higher))
+
+    def unpack_edge(self, a, b, middle, path):
+        """
+        Розгортає ребро a → b (можливо, скорочення) і дописує вершини до шляху.
+
+        Вершина a вже має бути останньою в path. Розгортання виконується
+        явним стеком, тому глибина вкладених скорочень не обмежена.
+
+        Args:
+            a (int): Номер початкової вершини ребра
+            b (int): Номер кінцевої вершини ребра
+            middle (int): Середня вершина скорочення (-1 - вихідне ребро)
+            path (list): Шлях, до якого дописуються вершини
+        """
+        stack = [(a, b, middle)]
+        while stack:
+            x, y, m = stack.pop()
+            if m == -1:
+                path.append(y)
+                continue
+            # Середня вершина має нижчий ранг за обидва кінці скорочення
+            stack.append((m, y, self._middle_of(m, y)))
+            stack.append((x, m, self._middle_of(m, x)))
+
+
+def load_contraction_hierarchy(path):
+    """
+    Завантажує ієрархію скорочень з файлу .npz.
+
+    Args:
+        path (str): Шлях до файлу
+
+    Returns:
+        ContractionHierarchy: Завантажена ієрархія
+    """
+    with np.load(path) as data:
+        return ContractionHierarchy(data['nodes'].tolist(), data['rank'],
+                                    data['up_indptr'], data['up_indices'],
+                                    data['up_weights'], data['up_middle'])
+
+
+def _witness_search(adjacency, source, excluded, targets, max_distance, settle_limit):
+    """
+    Обмежений пошук Дейкстри в ще не стиснутому графі без вершини excluded.
+
+    Args:
+        adjacency (list): Списки суміжності {сусід: (вага, середня вершина)}
+        source (int): Початкова вершина
+        excluded (int): Вершина, яку стискаємо
+        targets (set): Вершини, відстані до яких потрібні
+        max_distance (float): Далі цієї відстані шукати не потрібно
+        settle_limit (int): Максимальна кількість оброблених вершин
+
+    Returns:
+        dict: Знайдені (верхні оцінки) відстані
+    """
+    inf = float('infinity')
+    dist = {source: 0.0}
+    heap = [(0.0, source)]
+    remaining = set(targets)
+    settled = 0
+
+    while heap and remaining and settled < settle_limit:
+        current_distance, current = heapq.heappop(heap)
+        if current_distance > dist[current]:
+            continue
+        if current_distance > max_distance:
+            break
+
+        remaining.discard(current)
+        settled += 1
+
+        for neighbor, (weight, _) in adjacency[current].items():
+            if neighbor == excluded:
+                continue
+            new_distance = current_distance + weight
+            if new_distance < dist.get(neighbor, inf):
+                dist[neighbor] = new_distance
+                heapq.heappush(heap, (new_distance, neighbor))
+
+    return dist
+
+
+def _required_shortcuts(adjacency, node, settle_limit):
+    """
+    Визначає скорочення, потрібні при стисненні вершини.
+
+    Args:
+        adjacency (list): Списки суміжності {сусід: (вага, середня вершина)}
+        node (int): Вершина, яку стискаємо
+        settle_limit (int): Обмеження пошуку свідків
+
+    Returns:
+        list: Скорочення (u, w, вага)
+    """
+    inf = float('infinity')
+    neighbors = sorted(adjacency[node].items())
+    shortcuts = []
+
+    for i, (u, (weight_u, _)) in enumerate(neighbors):
+        candidates = neighbors[i + 1:]
+        if not candidates:
+            continue
+
+        max_distance = weight_u + max(weight for _, (weight, _) in candidates)
+        witness = _witness_search(adjacency, u, node, {w for w, _ in candidates},
+                                  max_distance, settle_limit)
+
+        for w, (weight_w, _) in candidates:
+            via_node = weight_u + weight_w
+            # Якщо є шлях-свідок не довший за шлях через вершину, скорочення не потрібне
+            if witness.get(w, inf) > via_node:
+                shortcuts.append((u, w, via_node))
+
+    return shortcuts
+
+
+def build_contraction_hierarchy(graph, weight='weight', settle_limit=200, csr=None):
+    """
+    Будує ієрархію скорочень для зваженого графа.
+
+    Порядок стиснення визначається евристикою "різниці ребер": кількість
+    потрібних скорочень мінус степінь вершини плюс кількість уже стиснутих
+    сусідів. Пріоритети оновлюються ліниво: вершина з вершини купи
+    перераховується і стискається, лише якщо вона досі найменш важлива.
+
+    Args:
+        graph (nx.Graph): Зважений граф (з load_and_prepare_weighted_graph)
+        weight (str): Атрибут ребра з вагою
+        settle_limit (int): Обмеження пошуку свідків (більше - менше скорочень)
+        csr (CSRGraph): Готове CSR-представлення графа (будується, якщо не задано)
+
+    Returns:
+        ContractionHierarchy: Побудована ієрархія
+    """
+    if csr is None:
+        csr = build_csr_graph(graph, weight=weight)
+
+    n = csr.num_nodes
+    indptr, indices, weights = csr.adjacency_lists()
+
+    # Поточний (ще не стиснутий) граф: {сусід: (вага, середня вершина)}
+    adjacency = [dict() for _ in range(n)]
+    for u in range(n):
+        for k in range(indptr[u], indptr[u + 1]):
+            v = indices[k]
+            if v == u:
+                continue
+            if weights[k] < adjacency[u].get(v, (float('infinity'), -1))[0]:
+                adjacency[u][v] = (weights[k], -1)
+
+    deleted_neighbors = [0] * n
+
+    def priority(node):
+        shortcuts = _required_shortcuts(adjacency, node, settle_limit)
+        return len(shortcuts) - len(adjacency[node]) + deleted_neighbors[node]
+
+    heap = [(priority(node), node) for node in range(n)]
+    heapq.heapify(heap)
+
+    rank = np.empty(n, dtype=np.int32)
+    upward = [None] * n
+    contracted = 0
+
+    while heap:
+        _, node = heapq.heappop(heap)
+
+        # Ліниве оновлення: перераховуємо пріоритет перед стисненням
+        shortcuts = _required_shortcuts(adjacency, node, settle_limit)
+        current = len(shortcuts) - len(adjacency[node]) + deleted_neighbors[node]
+        if heap and current > heap[0][0]:
+            heapq.heappush(heap, (current, node))
+            continue
+
+        rank[node] = contracted
+        contracted += 1
+
+        # Усі сусіди, що залишилися, мають вищий ранг - це висхідні ребра
+        upward[node] = sorted(adjacency[node].items())
+
+        for u, w, via_weight in shortcuts:
+            if via_weight < adjacency[u].get(w, (float('infinity'), -1))[0]:
+                adjacency[u][w] = (via_weight, node)
+                adjacency[w][u] = (via_weight, node)
+
+        for neighbor in adjacency[node]:
+            del adjacency[neighbor][node]
+            deleted_neighbors[neighbor] += 1
+        adjacency[node] = {}
+
+    counts = [len(edges) for edges in upward]
+    up_indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(counts, out=up_indptr[1:])
+    up_indices = [v for edges in upward for v, _ in edges]
+    up_weights = [w for edges in upward for _, (w, _) in edges]
+    up_middle = [m for edges in upward for _, (_, m) in edges]
+
+    return ContractionHierarchy(csr.nodes, rank, up_indptr, up_indices, up_weights, up_middle)
+
+
+def ch_query(ch, source, target):
+    """
+    Двонаправлений висхідний пошук у ієрархії скорочень.
+
+    Обидва пошуки рухаються лише до вершин з вищим рангом; найкоротший
+    шлях проходить через вершину з найвищим рангом на ньому, яку
+    досягають обидва пошуки.
+
+    Args:
+        ch (ContractionHierarchy): Ієрархія скорочень
+        source (int): Номер початкової вершини
+        target (int): Номер кінцевої вершини
+
+    Returns:
+        tuple: (номери вершин шляху або None, відстань, статистика)
+    """
+    indptr, indices, weights, middle = ch.adjacency_lists()
+    inf = float('infinity')
+
+    # Індекс 0 - прямий пошук, 1 - зворотний; попередник - (вершина, номер ребра)
+    dist = ({source: 0.0}, {target: 0.0})
+    pred = ({source: (-1, -1)}, {target: (-1, -1)})
+    heaps = ([(0.0, source)], [(0.0, target)])
+    settled = [0, 0]
+
+    best = inf
+    meeting = -1
+    iterations = 0
+
+    start_time = time.perf_counter()
+
+    while heaps[0] or heaps[1]:
+        if heaps[0] and (not heaps[1] or heaps[0][0][0] <= heaps[1][0][0]):
+            side = 0
+        else:
+            side = 1
+
+        # Обидві купи не містять нічого кращого за знайдений шлях
+        if heaps[side][0][0] >= best:
+            break
+
+        iterations += 1
+        current_distance, current = heapq.heappop(heaps[side])
+        own_dist = dist[side]
+        if current_distance > own_dist[current]:
+            continue
+
+        settled[side] += 1
+        other_distance = dist[1 - side].get(current)
+        if other_distance is not None and current_distance + other_distance < best:
+            best = current_distance + other_distance
+            meeting = current
+
+        for k in range(indptr[current], indptr[current + 1]):
+            neighbor = indices[k]
+            new_distance = current_distance + weights[k]
+            if new_distance < own_dist.get(neighbor, inf):
+                own_dist[neighbor] = new_distance
+                pred[side][neighbor] = (current, k)
+                heapq.heappush(heaps[side], (new_distance, neighbor))
+
+    end_time = time.perf_counter()
+
+    path = None
+    if meeting != -1:
+        # Висхідні ребра від початку до точки зустрічі
+        forward_edges = []
+        node = meeting
+        while pred[0][node][0] != -1:
+            previous, k = pred[0][node]
+            forward_edges.append((previous, node, middle[k]))
+            node = previous
+        forward_edges.reverse()
+
+        # Висхідні ребра від кінця до точки зустрічі (проходимо у зворотному напрямку)
+        backward_edges = []
+        node = meeting
+        while pred[1][node][0] != -1:
+            previous, k = pred[1][node]
+            backward_edges.append((node, previous, middle[k]))
+            node = previous
+
+        path = [source]
+        for a, b, m in forward_edges + backward_edges:
+            ch.unpack_edge(a, b, m, path)
+
+    stats = {
+        'iterations': iterations,
+        'execution_time': end_time - start_time,
+        'settled_nodes': settled[0] + settled[1],
+        'algorithm': 'CH'
+    }
+
+    return path, best, stats
+
+
+def _upward_distances(ch, source):
+    """Відстані від вершини до всіх вершин, досяжних висхідними ребрами."""
+    indptr, indices, weights, _ = ch.adjacency_lists()
+    inf = float('infinity')
+
+    dist = {source: 0.0}
+    settled = {}
+    heap = [(0.0, source)]
+
+    while heap:
+        current_distance, current = heapq.heappop(heap)
+        if current in settled:
+            continue
+        settled[current] = current_distance
+
+        for k in range(indptr[current], indptr[current + 1]):
+            neighbor = indices[k]
+            new_distance = current_distance + weights[k]
+            if new_distance < dist.get(neighbor, inf):
+                dist[neighbor] = new_distance
+                heapq.heappush(heap, (new_distance, neighbor))
+
+    return settled
+
+
+def ch_many_to_many(ch, sources, targets):
+    """
+    Блок матриці відстаней джерела x цілі з кошиками (bucket-based).
+
+    Спочатку з кожної цілі виконується висхідний пошук, і в кошик кожної
+    досягнутої вершини v записується пара (стовпець, d(v, ціль)). Потім
+    висхідний пошук з кожного джерела для кожної досягнутої вершини
+    переглядає її кошик: d(s, t) = min по v (d(s, v) + d(v, t)). Вершини з
+    високим рангом спільні для багатьох пошуків, тож робота ділиться між
+    усіма парами.
+
+    Args:
+        ch (ContractionHierarchy): Ієрархія скорочень
+        sources (list): Номери вершин-джерел
+        targets (list): Номери вершин-цілей
+
+    Returns:
+        np.ndarray: Матриця |sources| x |targets| (inf - недосяжно)
+    """
+    buckets = {}
+    for j, target in enumerate(targets):
+        for node, distance in _upward_distances(ch, target).items():
+            bucket = buckets.setdefault(node, ([], []))
+            bucket[0].append(j)
+            bucket[1].append(distance)
+
+    # Кошики як масиви: перегляд кошика - одна векторна операція
+    buckets = {node: (np.array(columns, dtype=np.int64), np.array(distances))
+               for node, (columns, distances) in buckets.items()}
+
+    block = np.full((len(sources), len(targets)), np.inf)
+    for i, source in enumerate(sources):
+        row = block[i]
+        for node, distance in _upward_distances(ch, source).items():
+            bucket = buckets.get(node)
+            if bucket is not None:
+                columns, distances = bucket
+                row[columns] = np.minimum(row[columns], distances + distance)
+
+    return block
+
+
+def ch_shortest_path(ch, start, end):
+    """
+    Запит точка-точка до ієрархії скорочень за назвами станцій.
+
+    Args:
+        ch (ContractionHierarchy): Ієрархія скорочень
+        start (str): Початкова вершина
+        end (str): Кінцева вершина
+
+    Returns:
+        tuple: (шлях як у reconstruct_path або None, відстань, статистика)
+    """
+    path_ids, distance, stats = ch_query(ch, ch.index[start], ch.index[end])
+    path = [ch.nodes[i] for i in path_ids] if path_ids is not None else None
+    stats['total_nodes'] = ch.num_nodes
+
+    return path, distance, stats
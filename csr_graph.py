@@ -0,0 +1,582 @@
+"""
+Компактне CSR-представлення зваженого графа транспортної мережі.
+
+Граф NetworkX зберігає ребра у вкладених словниках, тому кожна релаксація
+в алгоритмі Дейкстри коштує кілька пошуків у словниках. Тут граф один раз
+перетворюється на стиснутий розріджений рядковий формат (CSR): вершини
+отримують цілі номери, а суміжність зберігається у масивах NumPy
+`indptr` / `indices` / `weights`.
+"""
+
+import heapq
+import math
+import time
+
+import numpy as np
+
+
+class CSRGraph:
+    """
+    Неорієнтований зважений граф у форматі CSR.
+
+    Сусіди вершини `u` - це `indices[indptr[u]:indptr[u + 1]]`, а ваги
+    відповідних ребер - `weights[indptr[u]:indptr[u + 1]]`. Кожне
+    неорієнтоване ребро зберігається двічі (u → v та v → u), а `edge_ids`
+    вказує на його номер у вихідному списку ребер.
+
+    Attributes:
+        nodes (list): Назви вершин у порядку їх номерів
+        index (dict): Відображення назва вершини → номер
+        indptr (np.ndarray): Зсуви початку списків суміжності (n + 1)
+        indices (np.ndarray): Номери сусідів
+        weights (np.ndarray): Ваги ребер
+        edge_ids (np.ndarray): Номер неорієнтованого ребра для кожного запису
+        coords (np.ndarray): Координати вершин (n x 2, NaN - невідомі) або None
+    """
+
+    def __init__(self, nodes, indptr, indices, weights, edge_ids=None, coords=None):
+        self.nodes = list(nodes)
+        self.index = {node: i for i, node in enumerate(self.nodes)}
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.indices = np.asarray(indices, dtype=np.int32)
+        self.weights = np.asarray(weights, dtype=np.float64)
+        if edge_ids is None:
+            edge_ids = np.full(len(self.indices), -1, dtype=np.int32)
+        self.edge_ids = np.asarray(edge_ids, dtype=np.int32)
+        self.coords = None if coords is None else np.asarray(coords, dtype=np.float64)
+        self._lists = None
+
+    @property
+    def num_nodes(self):
+        return len(self.nodes)
+
+    @property
+    def num_edges(self):
+        # Кожне неорієнтоване ребро зберігається двічі
+        return len(self.indices) // 2
+
+    def adjacency_lists(self):
+        """
+        Повертає масиви CSR як списки Python для швидких внутрішніх циклів.
+
+        Поелементний доступ до масивів NumPy з Python повільніший за доступ
+        до списків, тому алгоритми працюють зі списками, закешованими тут.
+
+        Returns:
+            tuple: (indptr, indices, weights) у вигляді списків
+        """
+        if self._lists is None:
+            self._lists = (self.indptr.tolist(),
+                           self.indices.tolist(),
+                           self.weights.tolist())
+        return self._lists
+
+    def neighbors(self, node_id):
+        """
+        Повертає сусідів вершини та ваги відповідних ребер.
+
+        Args:
+            node_id (int): Номер вершини
+
+        Returns:
+            tuple: (номери сусідів, ваги ребер)
+        """
+        lo, hi = self.indptr[node_id], self.indptr[node_id + 1]
+        return self.indices[lo:hi], self.weights[lo:hi]
+
+
+def csr_from_edges(nodes, sources, targets, weights, coords=None):
+    """
+    Будує CSR-граф з масивів неорієнтованих ребер.
+
+    Args:
+        nodes (list): Назви вершин у порядку їх номерів
+        sources (array-like): Номери початкових вершин ребер
+        targets (array-like): Номери кінцевих вершин ребер
+        weights (array-like): Ваги ребер
+        coords (array-like): Координати вершин (n x 2) або None
+
+    Returns:
+        CSRGraph: Граф у форматі CSR
+    """
+    n = len(nodes)
+    sources = np.asarray(sources, dtype=np.int64)
+    targets = np.asarray(targets, dtype=np.int64)
+    weights = np.asarray(weights, dtype=np.float64)
+    edge_numbers = np.arange(len(sources), dtype=np.int32)
+
+    # Кожне ребро додаємо в обох напрямках
+    tails = np.concatenate([sources, targets])
+    heads = np.concatenate([targets, sources])
+    both_weights = np.concatenate([weights, weights])
+    both_ids = np.concatenate([edge_numbers, edge_numbers])
+
+    # Стабільне сортування зберігає порядок ребер усередині рядка
+    order = np.argsort(tails, kind='stable')
+    counts = np.bincount(tails, minlength=n)
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(counts, out=indptr[1:])
+
+    return CSRGraph(nodes, indptr, heads[order], both_weights[order], both_ids[order],
+                    coords=coords)
+
+
+def build_csr_graph(graph, weight='weight', default_weight=1.0):
+    """
+    Перетворює граф NetworkX на CSR-представлення.
+
+    Координати вершин беруться з атрибутів `x` / `y`, якщо вони є хоча б
+    в однієї вершини.
+
+    Args:
+        graph (nx.Graph): Зважений граф
+        weight (str): Атрибут ребра з вагою
+        default_weight (float): Вага для ребер без атрибута
+
+    Returns:
+        CSRGraph: Граф у форматі CSR
+    """
+    nodes = list(graph.nodes())
+    index = {node: i for i, node in enumerate(nodes)}
+
+    num_edges = graph.number_of_edges()
+    sources = np.empty(num_edges, dtype=np.int64)
+    targets = np.empty(num_edges, dtype=np.int64)
+    weights = np.empty(num_edges, dtype=np.float64)
+
+    for i, (u, v, data) in enumerate(graph.edges(data=True)):
+        sources[i] = index[u]
+        targets[i] = index[v]
+        weights[i] = data.get(weight, default_weight)
+
+    coords = None
+    if any('x' in data and 'y' in data for _, data in graph.nodes(data=True)):
+        coords = np.array([(data.get('x', np.nan), data.get('y', np.nan))
+                           for _, data in graph.nodes(data=True)], dtype=np.float64)
+
+    return csr_from_edges(nodes, sources, targets, weights, coords=coords)
+
+
+# Типи транспорту в порядку їх кодів (атрибут ребра transport_type)
+TRANSPORT_TYPES = ('metro', 'train', 'bus')
+
+# Коефіцієнти для різних типів транспорту (час подорожі на км)
+TRANSPORT_COEFFICIENTS = {
+    'metro': 1.0,    # Найшвидший
+    'train': 1.2,    # Трохи повільніше через зупинки
+    'bus': 1.8       # Найповільніше через трафік
+}
+
+# Коефіцієнт для невідомого типу транспорту
+DEFAULT_TRANSPORT_COEFFICIENT = 1.5
+
+
+def edge_attribute_codes(graph, attribute, categories):
+    """
+    Кодує категорійний атрибут ребер цілими числами.
+
+    Порядок ребер збігається з graph.edges(), тобто з номерами edge_ids
+    CSR-графа, побудованого build_csr_graph; значення для кожного запису
+    CSR - codes[csr.edge_ids].
+
+    Args:
+        graph (nx.Graph): Граф
+        attribute (str): Атрибут ребра
+        categories (sequence): Можливі значення атрибута в порядку кодів
+
+    Returns:
+        np.ndarray: Коди ребер (int16, -1 - атрибут відсутній або невідомий)
+    """
+    lookup = {category: code for code, category in enumerate(categories)}
+    return np.array([lookup.get(data.get(attribute), -1)
+                     for _, _, data in graph.edges(data=True)], dtype=np.int16)
+
+
+def transport_codes(graph, csr):
+    """
+    Повертає код типу транспорту (індекс у TRANSPORT_TYPES) для кожного запису CSR.
+
+    Args:
+        graph (nx.Graph): Граф, з якого побудовано csr
+        csr (CSRGraph): Граф у форматі CSR
+
+    Returns:
+        np.ndarray: Коди типів транспорту (-1 - невідомий тип)
+    """
+    codes = edge_attribute_codes(graph, 'transport_type', TRANSPORT_TYPES)
+    return codes[csr.edge_ids]
+
+
+def dijkstra_csr(csr, source):
+    """
+    Алгоритм Дейкстри на CSR-графі.
+
+    Args:
+        csr (CSRGraph): Граф у форматі CSR
+        source (int): Номер початкової вершини
+
+    Returns:
+        tuple: (масив відстаней, масив попередників (-1 - немає), статистика)
+    """
+    indptr, indices, weights = csr.adjacency_lists()
+    n = csr.num_nodes
+    inf = float('infinity')
+
+    dist = [inf] * n
+    pred = [-1] * n
+    settled = [False] * n
+    dist[source] = 0.0
+
+    heap = [(0.0, source)]
+    iterations = 0
+    processed = 0
+
+    start_time = time.perf_counter()
+
+    while heap:
+        iterations += 1
+        current_distance, current = heapq.heappop(heap)
+
+        if settled[current]:
+            continue
+
+        settled[current] = True
+        processed += 1
+
+        for k in range(indptr[current], indptr[current + 1]):
+            neighbor = indices[k]
+            if settled[neighbor]:
+                continue
+            new_distance = current_distance + weights[k]
+            if new_distance < dist[neighbor]:
+                dist[neighbor] = new_distance
+                pred[neighbor] = current
+                heapq.heappush(heap, (new_distance, neighbor))
+
+    end_time = time.perf_counter()
+
+    distances = np.array(dist, dtype=np.float64)
+    stats = {
+        'iterations': iterations,
+        'execution_time': end_time - start_time,
+        'nodes_processed': processed,
+        'reachable_nodes': int(np.count_nonzero(np.isfinite(distances)))
+    }
+
+    return distances, np.array(pred, dtype=np.int32), stats
+
+
+def reconstruct_path_csr(predecessors, start, end):
+    """
+    Відновлює шлях з масиву попередників.
+
+    Args:
+        predecessors (array-like): Масив попередників (-1 - немає)
+        start (int): Номер початкової вершини
+        end (int): Номер кінцевої вершини
+
+    Returns:
+        list: Номери вершин шляху або None, якщо шлях не знайдено
+    """
+    path = []
+    current = end
+
+    while current != -1:
+        path.append(current)
+        current = int(predecessors[current])
+
+    path.reverse()
+
+    if path[0] != start:
+        return None
+
+    return path
+
+
+def dijkstra_point_to_point_csr(csr, source, target):
+    """
+    Алгоритм Дейкстри з ранньою зупинкою, щойно цільову вершину остаточно оброблено.
+
+    Args:
+        csr (CSRGraph): Граф у форматі CSR
+        source (int): Номер початкової вершини
+        target (int): Номер кінцевої вершини
+
+    Returns:
+        tuple: (номери вершин шляху або None, відстань, статистика)
+    """
+    indptr, indices, weights = csr.adjacency_lists()
+    inf = float('infinity')
+
+    dist = {source: 0.0}
+    pred = {source: -1}
+    settled = set()
+
+    heap = [(0.0, source)]
+    iterations = 0
+
+    start_time = time.perf_counter()
+
+    while heap:
+        iterations += 1
+        current_distance, current = heapq.heappop(heap)
+
+        if current in settled:
+            continue
+
+        settled.add(current)
+
+        # Відстань до цілі остаточна - решту графа можна не обробляти
+        if current == target:
+            break
+
+        for k in range(indptr[current], indptr[current + 1]):
+            neighbor = indices[k]
+            if neighbor in settled:
+                continue
+            new_distance = current_distance + weights[k]
+            if new_distance < dist.get(neighbor, inf):
+                dist[neighbor] = new_distance
+                pred[neighbor] = current
+                heapq.heappush(heap, (new_distance, neighbor))
+
+    end_time = time.perf_counter()
+
+    path = None
+    if target in settled:
+        path = [target]
+        while pred[path[-1]] != -1:
+            path.append(pred[path[-1]])
+        path.reverse()
+
+    stats = {
+        'iterations': iterations,
+        'execution_time': end_time - start_time,
+        'settled_nodes': len(settled),
+        'algorithm': 'Dijkstra'
+    }
+
+    return path, dist.get(target, inf), stats
+
+
+def bidirectional_dijkstra_csr(csr, source, target):
+    """
+    Двонаправлений алгоритм Дейкстри: пошук одночасно від початку та від кінця.
+
+    Пошуки по черзі обробляють вершину з меншою поточною відстанню і
+    зупиняються, коли сума вершин обох куп не менша за найкращий знайдений
+    шлях через точку зустрічі.
+
+    Args:
+        csr (CSRGraph): Граф у форматі CSR
+        source (int): Номер початкової вершини
+        target (int): Номер кінцевої вершини
+
+    Returns:
+        tuple: (номери вершин шляху або None, відстань, статистика)
+    """
+    indptr, indices, weights = csr.adjacency_lists()
+    inf = float('infinity')
+
+    if source == target:
+        stats = {'iterations': 0, 'execution_time': 0.0, 'settled_nodes': 1,
+                 'algorithm': 'Bidirectional Dijkstra'}
+        return [source], 0.0, stats
+
+    # Індекс 0 - прямий пошук, 1 - зворотний
+    dist = ({source: 0.0}, {target: 0.0})
+    pred = ({source: -1}, {target: -1})
+    settled = (set(), set())
+    heaps = ([(0.0, source)], [(0.0, target)])
+
+    best = inf
+    meeting = -1
+    iterations = 0
+
+    start_time = time.perf_counter()
+
+    while heaps[0] and heaps[1]:
+        if heaps[0][0][0] + heaps[1][0][0] >= best:
+            break
+
+        iterations += 1
+        side = 0 if heaps[0][0][0] <= heaps[1][0][0] else 1
+        current_distance, current = heapq.heappop(heaps[side])
+
+        if current in settled[side]:
+            continue
+
+        settled[side].add(current)
+        own_dist, own_pred = dist[side], pred[side]
+        other_dist = dist[1 - side]
+
+        for k in range(indptr[current], indptr[current + 1]):
+            neighbor = indices[k]
+            if neighbor in settled[side]:
+                continue
+            new_distance = current_distance + weights[k]
+            if new_distance < own_dist.get(neighbor, inf):
+                own_dist[neighbor] = new_distance
+                own_pred[neighbor] = current
+                heapq.heappush(heaps[side], (new_distance, neighbor))
+
+            # Перевіряємо, чи не знайдено кращий шлях через точку зустрічі
+            if neighbor in other_dist:
+                candidate = own_dist[neighbor] + other_dist[neighbor]
+                if candidate < best:
+                    best = candidate
+                    meeting = neighbor
+
+    end_time = time.perf_counter()
+
+    path = None
+    if meeting != -1:
+        forward = [meeting]
+        while pred[0][forward[-1]] != -1:
+            forward.append(pred[0][forward[-1]])
+        forward.reverse()
+
+        backward = []
+        current = pred[1][meeting]
+        while current != -1:
+            backward.append(current)
+            current = pred[1][current]
+
+        path = forward + backward
+
+    stats = {
+        'iterations': iterations,
+        'execution_time': end_time - start_time,
+        'settled_nodes': len(settled[0]) + len(settled[1]),
+        'algorithm': 'Bidirectional Dijkstra'
+    }
+
+    return path, best, stats
+
+
+def admissible_speed_factor(csr):
+    """
+    Обчислює коефіцієнт, з яким пряма відстань не переоцінює вагу шляху.
+
+    Коефіцієнт дорівнює мінімуму відношення ваги ребра до прямої відстані
+    між його кінцями. Вага будь-якого шляху тоді не менша за пряму відстань
+    між його кінцями, помножену на цей коефіцієнт, тобто евристика A*
+    залишається допустимою (і узгодженою, тому оброблені вершини не
+    потрібно відкривати повторно).
+
+    Якщо координати відомі не для всіх вершин, евристика вимикається:
+    нульова оцінка для частини вершин порушила б узгодженість.
+
+    Args:
+        csr (CSRGraph): Граф у форматі CSR
+
+    Returns:
+        float: Коефіцієнт (0.0, якщо координат немає)
+    """
+    if csr.coords is None or len(csr.indices) == 0 or np.isnan(csr.coords).any():
+        return 0.0
+
+    tails = np.repeat(np.arange(csr.num_nodes), np.diff(csr.indptr))
+    deltas = csr.coords[tails] - csr.coords[csr.indices]
+    lengths = np.hypot(deltas[:, 0], deltas[:, 1])
+
+    # Ребра нульової довжини не обмежують коефіцієнт
+    known = lengths > 0
+    if not np.any(known):
+        return 0.0
+
+    return float(np.min(csr.weights[known] / lengths[known]))
+
+
+def geographic_heuristic(csr, target, speed_factor):
+    """
+    Будує евристику A*: пряма відстань до цілі, помножена на коефіцієнт.
+
+    Args:
+        csr (CSRGraph): Граф у форматі CSR
+        target (int): Номер кінцевої вершини
+        speed_factor (float): Коефіцієнт з admissible_speed_factor
+
+    Returns:
+        callable: Функція номер вершини → нижня оцінка відстані до цілі
+    """
+    if csr.coords is None or speed_factor <= 0:
+        return lambda node: 0.0
+
+    xs = csr.coords[:, 0].tolist()
+    ys = csr.coords[:, 1].tolist()
+    tx, ty = xs[target], ys[target]
+
+    def heuristic(node):
+        return speed_factor * math.hypot(xs[node] - tx, ys[node] - ty)
+
+    return heuristic
+
+
+def astar_csr(csr, source, target, heuristic):
+    """
+    Алгоритм A* на CSR-графі.
+
+    Args:
+        csr (CSRGraph): Граф у форматі CSR
+        source (int): Номер початкової вершини
+        target (int): Номер кінцевої вершини
+        heuristic (callable): Допустима нижня оцінка відстані до цілі
+
+    Returns:
+        tuple: (номери вершин шляху або None, відстань, статистика)
+    """
+    indptr, indices, weights = csr.adjacency_lists()
+    inf = float('infinity')
+
+    dist = {source: 0.0}
+    pred = {source: -1}
+    estimates = {}
+    settled = set()
+
+    heap = [(heuristic(source), 0.0, source)]
+    iterations = 0
+
+    start_time = time.perf_counter()
+
+    while heap:
+        iterations += 1
+        _, current_distance, current = heapq.heappop(heap)
+
+        if current in settled:
+            continue
+
+        settled.add(current)
+
+        if current == target:
+            break
+
+        for k in range(indptr[current], indptr[current + 1]):
+            neighbor = indices[k]
+            if neighbor in settled:
+                continue
+            new_distance = current_distance + weights[k]
+            if new_distance < dist.get(neighbor, inf):
+                dist[neighbor] = new_distance
+                pred[neighbor] = current
+                if neighbor not in estimates:
+                    estimates[neighbor] = heuristic(neighbor)
+                heapq.heappush(heap, (new_distance + estimates[neighbor], new_distance, neighbor))
+
+    end_time = time.perf_counter()
+
+    path = None
+    if target in settled:
+        path = [target]
+        while pred[path[-1]] != -1:
+            path.append(pred[path[-1]])
+        path.reverse()
+
+    stats = {
+        'iterations': iterations,
+        'execution_time': end_time - start_time,
+        'settled_nodes': len(settled),
+        'algorithm': 'A*'
+    }
+
+    return path, dist.get(target, inf), stats
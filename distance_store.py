@@ -0,0 +1,176 @@
+"""
+Бінарне сховище матриці відстаней з доступом через np.memmap.
+
+Формат файлу:
+    - 4 байти сигнатури b'DMAT'
+    - uint32 версія формату та uint32 довжина заголовка (little-endian)
+    - заголовок JSON: кількість станцій, тип даних і назви станцій
+    - вирівнювання нулями до межі 64 байти
+    - матриця n x n float32 (little-endian) по рядках
+
+Служба пошуку відкриває файл через np.memmap і читає лише потрібні
+рядки, тож відповідь distance(a, b) не вимагає завантаження всієї матриці.
+"""
+
+import json
+import struct
+
+import numpy as np
+import pandas as pd
+
+MAGIC = b'DMAT'
+FORMAT_VERSION = 1
+ALIGNMENT = 64
+
+# Скільки рядків матриці копіюється за один раз під час запису
+_WRITE_CHUNK_ROWS = 1024
+
+
+def _data_offset(header_length):
+    prefix = len(MAGIC) + 8 + header_length
+    return (prefix + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def save_distance_store(path, nodes, matrix, dtype=np.float32):
+    """
+    Записує матрицю відстаней у бінарний файл.
+
+    Args:
+        path (str): Шлях до файлу
+        nodes (list): Назви станцій у порядку рядків матриці
+        matrix (array-like): Матриця відстаней n x n (inf - недосяжно)
+        dtype: Тип даних у файлі (float32 за замовчуванням)
+    """
+    nodes = [str(node) for node in nodes]
+    n = len(nodes)
+    matrix = np.asarray(matrix)
+    if matrix.shape != (n, n):
+        raise ValueError(f"Очікується матриця {n}x{n}, отримано {matrix.shape}")
+
+    dtype = np.dtype(dtype).newbyteorder('<')
+    header = json.dumps({'num_nodes': n, 'dtype': dtype.str, 'nodes': nodes},
+                        ensure_ascii=False).encode('utf-8')
+    offset = _data_offset(len(header))
+
+    with open(path, 'wb') as f:
+        f.write(MAGIC)
+        f.write(struct.pack('<II', FORMAT_VERSION, len(header)))
+        f.write(header)
+        f.write(b'\0' * (offset - f.tell()))
+
+    if n == 0:
+        return
+
+    data = np.memmap(path, dtype=dtype, mode='r+', offset=offset, shape=(n, n))
+    for lo in range(0, n, _WRITE_CHUNK_ROWS):
+        data[lo:lo + _WRITE_CHUNK_ROWS] = matrix[lo:lo + _WRITE_CHUNK_ROWS]
+    data.flush()
+    del data
+
+
+class DistanceStore:
+    """
+    Матриця відстаней з бінарного файлу, відображена в пам'ять.
+
+    Attributes:
+        nodes (list): Назви станцій
+        index (dict): Відображення назва станції → номер рядка
+        matrix (np.memmap): Матриця відстаней n x n (лише читання)
+    """
+
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"Файл '{path}' не є сховищем матриці відстаней")
+            version, header_length = struct.unpack('<II', f.read(8))
+            if version != FORMAT_VERSION:
+                raise ValueError(f"Непідтримувана версія формату: {version}")
+            header = json.loads(f.read(header_length).decode('utf-8'))
+
+        self.path = path
+        self.nodes = header['nodes']
+        self.index = {node: i for i, node in enumerate(self.nodes)}
+        n = header['num_nodes']
+
+        if n == 0:
+            self.matrix = np.zeros((0, 0), dtype=header['dtype'])
+        else:
+            self.matrix = np.memmap(path, dtype=header['dtype'], mode='r',
+                                    offset=_data_offset(header_length), shape=(n, n))
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Звільняє відображення файлу в пам'ять."""
+        self.matrix = None
+
+    def distance(self, start, end):
+        """
+        Повертає відстань між двома станціями.
+
+        Args:
+            start (str): Початкова станція
+            end (str): Кінцева станція
+
+        Returns:
+            float: Відстань (inf - недосяжно)
+        """
+        return float(self.matrix[self.index[start], self.index[end]])
+
+    def row(self, start):
+        """
+        Повертає відстані від станції до всіх інших.
+
+        Args:
+            start (str): Початкова станція
+
+        Returns:
+            np.ndarray: Рядок матриці відстаней
+        """
+        return np.asarray(self.matrix[self.index[start]])
+
+    def to_dataframe(self):
+        """
+        Завантажує всю матрицю в DataFrame (як create_distance_matrix).
+
+        Тип даних зберігається, тому float32 записується в CSV без
+        "хвостів" на кшталт 9.15999984741211.
+
+        Returns:
+            pd.DataFrame: Матриця відстаней
+        """
+        return pd.DataFrame(np.array(self.matrix), index=self.nodes, columns=self.nodes)
+
+
+def export_csv(store_path, csv_path):
+    """
+    Експортує бінарне сховище у CSV у форматі distance_matrix.csv.
+
+    Args:
+        store_path (str): Шлях до бінарного файлу
+        csv_path (str): Шлях до CSV-файлу
+    """
+    with DistanceStore(store_path) as store:
+        store.to_dataframe().to_csv(csv_path)
+
+
+def import_csv(csv_path, store_path, dtype=np.float32):
+    """
+    Імпортує матрицю відстаней з CSV (формат distance_matrix.csv) у бінарне сховище.
+
+    Args:
+        csv_path (str): Шлях до CSV-файлу
+        store_path (str): Шлях до бінарного файлу
+        dtype: Тип даних у файлі (float32 за замовчуванням)
+    """
+    df = pd.read_csv(csv_path, index_col=0)
+    if list(df.index) != list(df.columns):
+        raise ValueError("Рядки та стовпці матриці відстаней не збігаються")
+    save_distance_store(store_path, list(df.index), df.to_numpy(dtype=np.float64), dtype=dtype)
@@ -0,0 +1,302 @@
+"""
+Інкрементальне оновлення найкоротших шляхів після зміни ваги ребра.
+
+Зберігаються матриці відстаней і попередників для всіх пар (рядок на
+кожне джерело) та поточні ваги ребер. Після зміни ребра u - v
+перераховуються лише ті частини дерев найкоротших шляхів, яких ця зміна
+стосується:
+
+    - вага зменшилась (або ребро додано): рядки, в яких d(s, u) + w < d(s, v)
+      (чи навпаки), знаходяться векторно; від покращеної вершини
+      запускається Дейкстра, що поширює лише покращення;
+    - вага збільшилась (або ребро видалено): змінюються лише рядки, в
+      дереві яких є це ребро. Відстані піддерева під ним скидаються і
+      відновлюються Дейкстрою, засіяною з меж піддерева.
+
+Граф вважається неорієнтованим, ваги - невід'ємними.
+"""
+
+import heapq
+import time
+
+import numpy as np
+
+from csr_graph import build_csr_graph
+from all_pairs import all_pairs_dijkstra, ShortestPathsView, ShortestDistancesView
+from route_cache import bump_graph_version
+from streaming_loader import DEFAULT_TRANSPORT_TYPE
+
+
+class DynamicShortestPaths:
+    """
+    Найкоротші шляхи між усіма парами, що підтримуються при зміні ребер.
+
+    Attributes:
+        graph (nx.Graph): Граф, у якому також змінюються ваги ребер
+        weight (str): Атрибут ребра з вагою
+        nodes (list): Назви вершин у порядку рядків матриць
+        index (dict): Відображення назва вершини → номер
+        distances (np.ndarray): Матриця відстаней n x n (inf - недосяжно)
+        predecessors (np.ndarray): Матриця попередників n x n (-1 - немає)
+    """
+
+    def __init__(self, graph, distances=None, predecessors=None, weight='weight'):
+        """
+        Args:
+            graph (nx.Graph): Зважений граф
+            distances: Поточна матриця відстаней або ShortestDistancesView
+                       (None - обчислити заново)
+            predecessors: Поточна матриця попередників або ShortestPathsView
+            weight (str): Атрибут ребра з вагою
+        """
+        csr = build_csr_graph(graph, weight=weight)
+        self.graph = graph
+        self.weight = weight
+        self.nodes = csr.nodes
+        self.index = csr.index
+
+        # Поточні ваги ребер: номер вершини → {номер сусіда: вага}
+        self._adjacency = [dict() for _ in range(csr.num_nodes)]
+        indptr, indices, weights = csr.adjacency_lists()
+        for i in range(csr.num_nodes):
+            neighbors = self._adjacency[i]
+            for k in range(indptr[i], indptr[i + 1]):
+                neighbors[indices[k]] = weights[k]
+
+        if distances is None or predecessors is None:
+            distances, predecessors = all_pairs_dijkstra(csr)
+        else:
+            distances = self._table(distances, 'matrix')
+            predecessors = self._table(predecessors, 'predecessors')
+
+        n = csr.num_nodes
+        self.distances = np.array(distances, dtype=np.float64)
+        self.predecessors = np.array(predecessors, dtype=np.int32)
+        if self.distances.shape != (n, n) or self.predecessors.shape != (n, n):
+            raise ValueError(f"Очікуються матриці {n}x{n}")
+
+    def _table(self, table, attribute):
+        if hasattr(table, attribute):
+            if list(table.nodes) != self.nodes:
+                raise ValueError("Порядок вершин таблиці не збігається з графом")
+            return getattr(table, attribute)
+        return table
+
+    def views(self):
+        """
+        Повертає поточні таблиці як ліниві словники (як find_all_shortest_paths).
+
+        Returns:
+            tuple: (ShortestPathsView, ShortestDistancesView)
+        """
+        return (ShortestPathsView(self.nodes, self.distances, self.predecessors),
+                ShortestDistancesView(self.nodes, self.distances, self.predecessors))
+
+    def update_edge(self, u, v, new_weight, **attributes):
+        """
+        Змінює вагу ребра та відновлює уражені частини дерев шляхів.
+
+        Зміна записується і в граф: для ваги 'weight' синхронно оновлюється
+        travel_time (у графах завдань вони рівні), новому ребру без типу
+        транспорту призначається DEFAULT_TRANSPORT_TYPE. Версія графа
+        збільшується, тож CachingRouter скидає свій кеш.
+
+        Args:
+            u (str): Перша вершина ребра
+            v (str): Друга вершина ребра
+            new_weight (float): Нова вага (None - видалити ребро; якщо ребра
+                                немає, воно додається)
+            attributes: Інші атрибути ребра (наприклад, distance,
+                        transport_type)
+
+        Returns:
+            dict: Статистика (affected_sources, repaired_nodes, execution_time)
+        """
+        i, j = self.index[u], self.index[v]
+        if i == j:
+            raise ValueError("Петлі не впливають на найкоротші шляхи")
+        if new_weight is not None and new_weight < 0:
+            raise ValueError("Вага ребра не може бути від'ємною")
+
+        inf = float('infinity')
+        old_weight = self._adjacency[i].get(j, inf)
+        weight = inf if new_weight is None else float(new_weight)
+
+        start_time = time.perf_counter()
+
+        if new_weight is None:
+            self._adjacency[i].pop(j, None)
+            self._adjacency[j].pop(i, None)
+            if self.graph.has_edge(u, v):
+                self.graph.remove_edge(u, v)
+        else:
+            self._adjacency[i][j] = weight
+            self._adjacency[j][i] = weight
+            data = dict(attributes)
+            data[self.weight] = weight
+            if self.weight == 'weight':
+                data['travel_time'] = weight
+            if self.graph.has_edge(u, v):
+                self.graph[u][v].update(data)
+            else:
+                data.setdefault('transport_type', DEFAULT_TRANSPORT_TYPE)
+                self.graph.add_edge(u, v, **data)
+        bump_graph_version(self.graph)
+
+        repaired = 0
+        if weight < old_weight:
+            sources = self._decrease_sources(i, j, weight)
+            for source in sources:
+                repaired += self._propagate_decrease(source, i, j, weight)
+        elif weight > old_weight:
+            sources = self._increase_sources(i, j)
+            for source in sources:
+                repaired += self._repair_increase(source, i, j)
+        else:
+            sources = []
+
+        end_time = time.perf_counter()
+
+        return {
+            'affected_sources': len(sources),
+            'repaired_nodes': repaired,
+            'execution_time': end_time - start_time
+        }
+
+    def _decrease_sources(self, i, j, weight):
+        dist = self.distances
+        improves = (dist[:, i] + weight < dist[:, j]) | (dist[:, j] + weight < dist[:, i])
+        return np.flatnonzero(improves).tolist()
+
+    def _increase_sources(self, i, j):
+        pred = self.predecessors
+        uses_edge = (pred[:, j] == i) | (pred[:, i] == j)
+        return np.flatnonzero(uses_edge).tolist()
+
+    def _propagate_decrease(self, source, i, j, weight):
+        dist = self.distances[source]
+        pred = self.predecessors[source]
+        adjacency = self._adjacency
+
+        heap = []
+        for a, b in ((i, j), (j, i)):
+            candidate = float(dist[a]) + weight
+            if candidate < dist[b]:
+                dist[b] = candidate
+                pred[b] = a
+                heapq.heappush(heap, (candidate, b))
+
+        settled = set()
+        while heap:
+            current_distance, current = heapq.heappop(heap)
+            if current in settled or current_distance > dist[current]:
+                continue
+            settled.add(current)
+
+            for neighbor, edge_weight in adjacency[current].items():
+                new_distance = current_distance + edge_weight
+                if new_distance < dist[neighbor]:
+                    dist[neighbor] = new_distance
+                    pred[neighbor] = current
+                    heapq.heappush(heap, (new_distance, neighbor))
+
+        return len(settled)
+
+    def _subtree(self, pred, root):
+        """Вершини піддерева дерева найкоротших шляхів з коренем root."""
+        order = np.argsort(pred, kind='stable')
+        sorted_pred = pred[order]
+        subtree = [root]
+        k = 0
+        while k < len(subtree):
+            node = subtree[k]
+            lo, hi = np.searchsorted(sorted_pred, (node, node + 1))
+            subtree.extend(order[lo:hi].tolist())
+            k += 1
+        return subtree
+
+    def _repair_increase(self, source, i, j):
+        dist = self.distances[source]
+        pred = self.predecessors[source]
+        adjacency = self._adjacency
+        inf = float('infinity')
+
+        # Ребро лежить у дереві лише в одному напрямку
+        child = j if pred[j] == i else i
+        affected = self._subtree(pred, child)
+        affected_set = set(affected)
+        dist[affected] = inf
+        pred[affected] = -1
+
+        # Засіюємо кожну уражену вершину найкращим входом ззовні піддерева
+        heap = []
+        for node in affected:
+            best_distance, best_parent = inf, -1
+            for neighbor, edge_weight in adjacency[node].items():
+                if neighbor in affected_set:
+                    continue
+                candidate = float(dist[neighbor]) + edge_weight
+                if candidate < best_distance:
+                    best_distance, best_parent = candidate, neighbor
+            if best_parent != -1:
+                dist[node] = best_distance
+                pred[node] = best_parent
+                heap.append((best_distance, node))
+        heapq.heapify(heap)
+
+        settled = set()
+        while heap:
+            current_distance, current = heapq.heappop(heap)
+            if current in settled or current_distance > dist[current]:
+                continue
+            settled.add(current)
+
+            for neighbor, edge_weight in adjacency[current].items():
+                if neighbor not in affected_set or neighbor in settled:
+                    continue
+                new_distance = current_distance + edge_weight
+                if new_distance < dist[neighbor]:
+                    dist[neighbor] = new_distance
+                    pred[neighbor] = current
+                    heapq.heappush(heap, (new_distance, neighbor))
+
+        return len(affected)
+
+    def verify(self, tolerance=1e-9):
+        """
+        Порівнює таблиці з повним перерахунком для поточних ваг.
+
+        Відстані мають збігатися з точністю tolerance. Попередники можуть
+        відрізнятися за наявності рівноцінних шляхів, тому для них
+        перевіряється, що кожен з них лежить на найкоротшому шляху:
+        d(s, v) = d(s, pred(v)) + w(pred(v), v).
+
+        Args:
+            tolerance (float): Допустима похибка відстаней
+
+        Returns:
+            bool: True, якщо таблиці збігаються з повним перерахунком
+        """
+        csr = build_csr_graph(self.graph, weight=self.weight)
+        if csr.nodes != self.nodes:
+            raise ValueError("Порядок вершин графа змінився")
+        expected, _ = all_pairs_dijkstra(csr)
+
+        finite = np.isfinite(expected)
+        if not np.array_equal(finite, np.isfinite(self.distances)):
+            return False
+        if not np.allclose(expected[finite], self.distances[finite], rtol=0, atol=tolerance):
+            return False
+
+        for source in range(len(self.nodes)):
+            dist = self.distances[source]
+            for node, parent in enumerate(self.predecessors[source].tolist()):
+                if node == source or not np.isfinite(dist[node]):
+                    if parent != -1:
+                        return False
+                    continue
+                weight = self._adjacency[node].get(parent)
+                if weight is None or abs(dist[parent] + weight - dist[node]) > tolerance:
+                    return False
+
+        return True
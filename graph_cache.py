@@ -0,0 +1,117 @@
+"""
+Кеш підготовленого графа поруч із GML-файлом.
+
+Розбір GML і перерахунок ваг у циклі Python домінують у часі холодного
+старту короткоживучих процесів. Тому після першого завантаження граф
+(разом з атрибутами та обчисленими вагами) зберігається в бінарний
+знімок pickle. Знімок прив'язаний до вихідного файлу: перевіряються час
+модифікації та розмір, а якщо вони змінилися - хеш SHA-256 вмісту. Знімок
+перебудовується лише тоді, коли GML справді змінився.
+"""
+
+import hashlib
+import os
+import pickle
+
+import networkx as nx
+
+SNAPSHOT_FORMAT = 1
+
+
+def _file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def cache_path_for(gml_path, variant):
+    """
+    Повертає шлях до знімка для GML-файлу та варіанту підготовки.
+
+    Args:
+        gml_path (str): Шлях до GML-файлу
+        variant (str): Назва варіанту (наприклад, 'raw' або 'weighted')
+
+    Returns:
+        str: Шлях до файлу знімка
+    """
+    return f"{gml_path}.{variant}.cache"
+
+
+def _read_snapshot(cache_path):
+    try:
+        with open(cache_path, 'rb') as f:
+            snapshot = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+        return None
+    if not isinstance(snapshot, dict) or snapshot.get('format') != SNAPSHOT_FORMAT:
+        return None
+    return snapshot
+
+
+def _write_snapshot(cache_path, snapshot):
+    # Записуємо через тимчасовий файл, щоб паралельні процеси не прочитали половину
+    temp_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        with open(temp_path, 'wb') as f:
+            pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, cache_path)
+    except OSError:
+        # Кеш - лише оптимізація: якщо запис неможливий, працюємо без нього
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+
+def load_graph_cached(gml_path, prepare=None, variant='raw', prepare_key=None):
+    """
+    Завантажує граф з GML, використовуючи бінарний знімок, якщо він актуальний.
+
+    Args:
+        gml_path (str): Шлях до GML-файлу
+        prepare (callable): Функція підготовки графа (наприклад, обчислення ваг),
+                            результат якої теж кешується
+        variant (str): Назва варіанту підготовки (частина імені файлу знімка)
+        prepare_key (str): Опис параметрів підготовки; знімок з іншим ключем
+                           вважається застарілим
+
+    Returns:
+        nx.Graph: Граф
+
+    Raises:
+        FileNotFoundError: Якщо GML-файл не існує
+    """
+    source_stat = os.stat(gml_path)
+    cache_path = cache_path_for(gml_path, variant)
+    snapshot = _read_snapshot(cache_path)
+
+    if snapshot is not None and snapshot['prepare_key'] == prepare_key:
+        if (snapshot['source_mtime_ns'] == source_stat.st_mtime_ns
+                and snapshot['source_size'] == source_stat.st_size):
+            return snapshot['graph']
+
+        # Файл змінено або "торкнуто" - порівнюємо вміст
+        source_hash = _file_sha256(gml_path)
+        if snapshot['source_sha256'] == source_hash:
+            snapshot['source_mtime_ns'] = source_stat.st_mtime_ns
+            snapshot['source_size'] = source_stat.st_size
+            _write_snapshot(cache_path, snapshot)
+            return snapshot['graph']
+    else:
+        source_hash = _file_sha256(gml_path)
+
+    G = nx.read_gml(gml_path)
+    if prepare is not None:
+        G = prepare(G)
+
+    _write_snapshot(cache_path, {
+        'format': SNAPSHOT_FORMAT,
+        'prepare_key': prepare_key,
+        'source_mtime_ns': source_stat.st_mtime_ns,
+        'source_size': source_stat.st_size,
+        'source_sha256': source_hash,
+        'graph': G
+    })
+
+    return G
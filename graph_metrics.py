@@ -0,0 +1,199 @@
+"""
+Метрики відстаней графа: діаметр, радіус, центр і зв'язність.
+
+nx.diameter, nx.radius, nx.center та nx.closeness_centrality кожна окремо
+запускають пошук з усіх вершин. Тут окремого проходу немає: прохід
+Брандеса з кожної вершини (centrality.compute_centrality) уже дає
+ексцентриситети та близькість, а eccentricity_summary зводить
+ексцентриситети до діаметра, радіуса й центру.
+
+Для дуже великих графів діаметр рахується алгоритмом iFUB: подвійний
+прохід (double sweep) дає нижню межу та вершину посередині довгого
+шляху, а BFS запускається лише з вершин найдальших рівнів відносно неї,
+доки верхня межа не зійдеться з нижньою. На реальних мережах це зазвичай
+кілька десятків BFS замість n.
+"""
+
+import math
+import time
+from collections import deque
+
+import numpy as np
+
+from csr_graph import build_csr_graph
+
+
+def _bfs_distances(indptr, indices, n, source):
+    dist = [-1] * n
+    dist[source] = 0
+    queue = deque([source])
+    while queue:
+        v = queue.popleft()
+        next_distance = dist[v] + 1
+        for k in range(indptr[v], indptr[v + 1]):
+            w = indices[k]
+            if dist[w] < 0:
+                dist[w] = next_distance
+                queue.append(w)
+    return dist
+
+
+def connected_components_csr(csr):
+    """
+    Розбиває граф на компоненти зв'язності.
+
+    Args:
+        csr (CSRGraph): Граф у форматі CSR
+
+    Returns:
+        tuple: (номер компоненти для кожної вершини, кількість компонент)
+    """
+    indptr, indices, _ = csr.adjacency_lists()
+    n = csr.num_nodes
+    labels = [-1] * n
+    count = 0
+    for start in range(n):
+        if labels[start] >= 0:
+            continue
+        labels[start] = count
+        queue = deque([start])
+        while queue:
+            v = queue.popleft()
+            for k in range(indptr[v], indptr[v + 1]):
+                w = indices[k]
+                if labels[w] < 0:
+                    labels[w] = count
+                    queue.append(w)
+        count += 1
+    return np.array(labels, dtype=np.int32), count
+
+
+def eccentricity_summary(eccentricity):
+    """
+    Діаметр, радіус і центр з ексцентриситетів усіх вершин.
+
+    Ексцентриситети можна отримати з будь-якого проходу з кожної вершини,
+    наприклад з compute_centrality(mode='exact') (centrality.py), без
+    окремого пошуку.
+
+    Args:
+        eccentricity (dict): Вершина → ексцентриситет (inf - досягає не всіх
+                             вершин, тобто граф незв'язний)
+
+    Returns:
+        dict: is_connected, eccentricity, diameter, radius, center (для
+              незв'язного графа - None, як помилка в NetworkX)
+    """
+    values = list(eccentricity.values())
+    if not values or any(math.isinf(value) for value in values):
+        return {'is_connected': False, 'eccentricity': None, 'diameter': None,
+                'radius': None, 'center': None}
+
+    # Відстані в кількості ребер повертаємо цілими, як NetworkX
+    if all(float(value).is_integer() for value in values):
+        eccentricity = {node: int(value) for node, value in eccentricity.items()}
+    diameter = max(eccentricity.values())
+    radius = min(eccentricity.values())
+    return {
+        'is_connected': True,
+        'eccentricity': dict(eccentricity),
+        'diameter': diameter,
+        'radius': radius,
+        'center': [node for node, value in eccentricity.items() if value == radius]
+    }
+
+
+def double_sweep(csr, start=None):
+    """
+    Подвійний прохід: нижня межа діаметра та найдовший знайдений шлях.
+
+    BFS із start знаходить найдальшу вершину a, другий BFS з a -
+    найдальшу від неї вершину b; ecc(a) - нижня межа діаметра.
+
+    Args:
+        csr (CSRGraph): Граф у форматі CSR (зв'язний)
+        start (int): Номер початкової вершини (за замовчуванням - з
+                     найбільшим степенем)
+
+    Returns:
+        tuple: (нижня межа, номери вершин шляху a → b)
+    """
+    indptr, indices, _ = csr.adjacency_lists()
+    n = csr.num_nodes
+    if start is None:
+        start = int(np.argmax(np.diff(csr.indptr)))
+
+    dist = _bfs_distances(indptr, indices, n, start)
+    a = max(range(n), key=dist.__getitem__)
+
+    dist = _bfs_distances(indptr, indices, n, a)
+    b = max(range(n), key=dist.__getitem__)
+
+    # Відновлюємо шлях b → a, рухаючись до сусіда, ближчого до a
+    path = [b]
+    while path[-1] != a:
+        v = path[-1]
+        for k in range(indptr[v], indptr[v + 1]):
+            if dist[indices[k]] == dist[v] - 1:
+                path.append(indices[k])
+                break
+    path.reverse()
+
+    return dist[b], path
+
+
+def ifub_diameter(graph, csr=None):
+    """
+    Точний діаметр зв'язного графа алгоритмом iFUB.
+
+    Args:
+        graph (nx.Graph): Зв'язний граф
+        csr (CSRGraph): Готовий CSR-знімок графа (необов'язково)
+
+    Returns:
+        tuple: (діаметр, статистика з кількістю BFS)
+
+    Raises:
+        ValueError: Якщо граф незв'язний
+    """
+    if csr is None:
+        csr = build_csr_graph(graph)
+    indptr, indices, _ = csr.adjacency_lists()
+    n = csr.num_nodes
+    if n == 0:
+        raise ValueError("Діаметр не визначений для порожнього графа")
+
+    start_time = time.perf_counter()
+
+    lower, path = double_sweep(csr)
+    bfs_runs = 2
+
+    # Вершина посередині довгого шляху має малий ексцентриситет
+    middle = path[len(path) // 2]
+    dist = _bfs_distances(indptr, indices, n, middle)
+    bfs_runs += 1
+    if min(dist) < 0:
+        raise ValueError("Граф незв'язний: діаметр нескінченний")
+
+    levels = {}
+    for node, level in enumerate(dist):
+        levels.setdefault(level, []).append(node)
+
+    level = max(levels)
+    lower = max(lower, level)
+    upper = 2 * level
+
+    # Вершини рівня i мають ексцентриситет щонайменше i; пари з ближчих
+    # рівнів не можуть бути далі за 2(i - 1)
+    while upper > lower:
+        for node in levels[level]:
+            lower = max(lower, max(_bfs_distances(indptr, indices, n, node)))
+            bfs_runs += 1
+        if lower > 2 * (level - 1):
+            break
+        upper = 2 * (level - 1)
+        level -= 1
+
+    end_time = time.perf_counter()
+
+    return lower, {'bfs_runs': bfs_runs, 'execution_time': end_time - start_time}
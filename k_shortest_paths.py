@@ -0,0 +1,206 @@
+"""
+K найкоротших простих шляхів (алгоритм Єна) для альтернативних маршрутів.
+
+Кожен наступний шлях отримується відхиленням від уже знайденого: для
+кожної вершини відхилення (spur) шукається найкоротший шлях до цілі, в
+якому заборонено вершини кореневого префікса та ребра, якими вже
+знайдені шляхи з тим самим префіксом виходять з цієї вершини.
+
+Щоб не повторювати роботу між ітераціями:
+    - шлях, отриманий відхиленням у вершині з номером d, перевіряє лише
+      вершини відхилення від d і далі (модифікація Лоулера): для коротших
+      префіксів кандидати вже були згенеровані батьківським шляхом;
+    - для кожного кореневого префікса зберігається множина заборонених
+      наступних вершин, яка доповнюється при прийнятті шляху, а накопичені
+      вартості зберігаються разом із шляхом, тож вартість префікса не
+      перераховується;
+    - дерево найкоротших шляхів до цілі будується один раз: його
+      відстані - евристика A* для пошуків від вершин відхилення, а якщо
+      шлях по дереву не зачіпає заборон, пошук не потрібен взагалі;
+    - результат пошуку від вершини відхилення кешується за префіксом:
+      коли заборон для префікса стає більше, а збережений шлях жодної з
+      нових заборон не порушує, він лишається оптимальним і пошук не
+      повторюється.
+
+Генератор лінивий: K-й шлях обчислюється лише тоді, коли його запитали.
+"""
+
+import heapq
+import itertools
+
+from csr_graph import build_csr_graph, dijkstra_csr
+
+
+def _tree_path(next_hop, to_target, source, target, banned_nodes, banned_next):
+    """Шлях до цілі по дереву найкоротших шляхів, якщо він не порушує заборон."""
+    first = next_hop[source]
+    if first == -1 or first in banned_next:
+        return None, None
+    path = [source]
+    node = source
+    while node != target:
+        node = next_hop[node]
+        if node in banned_nodes:
+            return None, None
+        path.append(node)
+    return path, [to_target[source] - to_target[node] for node in path]
+
+
+def restricted_search_csr(csr, source, target, to_target, next_hop,
+                          banned_nodes=(), banned_next=()):
+    """
+    Найкоротший шлях до цілі з забороненими вершинами і ребрами.
+
+    Відстані до цілі в повному графі не перевищують відстаней у графі з
+    забороною, тому вони є узгодженою евристикою A*. Якщо ж шлях по
+    дереву найкоротших шляхів до цілі не зачіпає заборон, він
+    повертається одразу без пошуку.
+
+    Args:
+        csr (CSRGraph): Граф у форматі CSR
+        source (int): Номер початкової вершини
+        target (int): Номер кінцевої вершини
+        to_target (list): Відстані від кожної вершини до цілі в повному графі
+        next_hop (list): Наступна вершина на найкоротшому шляху до цілі (-1 - немає)
+        banned_nodes (set): Вершини, через які не можна проходити
+        banned_next (set): Вершини, в які заборонено переходити безпосередньо
+                           з source (заборонені ребра source → v)
+
+    Returns:
+        tuple: (номери вершин шляху або None, відстані до вершин шляху від source)
+    """
+    if source == target:
+        return [source], [0.0]
+
+    path, costs = _tree_path(next_hop, to_target, source, target, banned_nodes, banned_next)
+    if path is not None:
+        return path, costs
+
+    indptr, indices, weights = csr.adjacency_lists()
+    inf = float('infinity')
+
+    dist = {source: 0.0}
+    pred = {source: -1}
+    settled = set()
+    heap = [(to_target[source], 0.0, source)]
+
+    while heap:
+        _, current_distance, current = heapq.heappop(heap)
+        if current in settled:
+            continue
+        settled.add(current)
+
+        if current == target:
+            break
+
+        for k in range(indptr[current], indptr[current + 1]):
+            neighbor = indices[k]
+            if neighbor in settled or neighbor in banned_nodes:
+                continue
+            if current == source and neighbor in banned_next:
+                continue
+            estimate = to_target[neighbor]
+            if estimate == inf:
+                continue
+            new_distance = current_distance + weights[k]
+            if new_distance < dist.get(neighbor, inf):
+                dist[neighbor] = new_distance
+                pred[neighbor] = current
+                heapq.heappush(heap, (new_distance + estimate, new_distance, neighbor))
+
+    if target not in settled:
+        return None, None
+
+    path = [target]
+    while pred[path[-1]] != -1:
+        path.append(pred[path[-1]])
+    path.reverse()
+    return path, [dist[node] for node in path]
+
+
+def k_shortest_paths_csr(csr, source, target):
+    """
+    Лінивий генератор простих шляхів CSR-графа в порядку зростання вартості.
+
+    Args:
+        csr (CSRGraph): Граф у форматі CSR
+        source (int): Номер початкової вершини
+        target (int): Номер кінцевої вершини
+
+    Yields:
+        tuple: (номери вершин шляху, вартість)
+    """
+    # Граф неорієнтований: дерево Дейкстри від цілі дає відстані до неї
+    # та наступну вершину на найкоротшому шляху до неї з кожної вершини
+    to_target, next_hop, _ = dijkstra_csr(csr, target)
+    to_target = to_target.tolist()
+    next_hop = next_hop.tolist()
+
+    path, costs = restricted_search_csr(csr, source, target, to_target, next_hop)
+    if path is None:
+        return
+
+    # Кореневий префікс → вершини, в які з нього вже виходять прийняті шляхи
+    banned_next = {}
+    # Кеш пошуків від вершини відхилення: префікс → (шлях, відстані)
+    spur_cache = {}
+    seen = {tuple(path)}
+    counter = itertools.count()
+    # Кандидати: (вартість, порядковий номер, шлях, накопичені вартості, вершина відхилення)
+    candidates = [(costs[-1], next(counter), path, costs, 0)]
+
+    while candidates:
+        cost, _, path, costs, deviation = heapq.heappop(candidates)
+        yield path, cost
+
+        for i in range(len(path) - 1):
+            banned_next.setdefault(tuple(path[:i + 1]), set()).add(path[i + 1])
+
+        for i in range(deviation, len(path) - 1):
+            root = tuple(path[:i + 1])
+            banned = banned_next[root]
+            cached = spur_cache.get(root)
+            if cached is None or (cached[0] is not None and cached[0][1] in banned):
+                cached = restricted_search_csr(csr, path[i], target, to_target, next_hop,
+                                              banned_nodes=set(root[:-1]),
+                                              banned_next=banned)
+                spur_cache[root] = cached
+            spur_path, spur_costs = cached
+            if spur_path is None:
+                continue
+
+            candidate = path[:i] + spur_path
+            candidate_key = tuple(candidate)
+            if candidate_key in seen:
+                continue
+            seen.add(candidate_key)
+
+            root_cost = costs[i]
+            candidate_costs = costs[:i] + [root_cost + c for c in spur_costs]
+            heapq.heappush(candidates, (candidate_costs[-1], next(counter),
+                                        candidate, candidate_costs, i))
+
+
+def k_shortest_paths(graph, start, end, k=None, weight='weight', csr=None):
+    """
+    Лінивий генератор K найкоротших простих шляхів між двома станціями.
+
+    Args:
+        graph (nx.Graph): Зважений граф
+        start (str): Початкова станція
+        end (str): Кінцева станція
+        k (int): Максимальна кількість шляхів (None - без обмеження)
+        weight (str): Атрибут ваги ребра (наприклад, 'weight' або 'travel_time')
+        csr (CSRGraph): Готовий CSR-знімок графа (необов'язково)
+
+    Yields:
+        tuple: (шлях, вартість)
+    """
+    if csr is None:
+        csr = build_csr_graph(graph, weight=weight)
+    if start not in csr.index or end not in csr.index:
+        raise KeyError(f"Станції '{start}' або '{end}' немає в графі")
+
+    paths = k_shortest_paths_csr(csr, csr.index[start], csr.index[end])
+    for path, cost in itertools.islice(paths, k):
+        yield [csr.nodes[i] for i in path], cost
@@ -0,0 +1,363 @@
+"""
+Індекс орієнтирів (ALT: A*, Landmarks, Triangle inequality).
+
+Попередня обробка один раз обирає K вершин-орієнтирів і зберігає відстані
+від кожної вершини до кожного орієнтира в масиві NumPy. Для запиту
+s → t нерівність трикутника дає нижню оцінку відстані від будь-якої
+вершини v до цілі:
+
+    d(v, t) >= |d(L, t) - d(L, v)|
+
+Ця оцінка є допустимою та узгодженою евристикою для A*, тому пошук
+відсікає вершини, які явно ведуть "не туди".
+"""
+
+import hashlib
+import random
+import time
+import weakref
+
+import numpy as np
+
+from csr_graph import build_csr_graph, dijkstra_csr, astar_csr
+
+
+class LandmarkIndex:
+    """
+    Попередньо обчислені відстані від вершин графа до орієнтирів.
+
+    Attributes:
+        nodes (list): Назви вершин у порядку номерів CSR-графа
+        landmarks (np.ndarray): Номери вершин-орієнтирів (K)
+        distances (np.ndarray): Відстані вершина → орієнтир (n x K)
+        signature (str): Відбиток структури та ваг графа (graph_signature)
+    """
+
+    def __init__(self, nodes, landmarks, distances, signature=None):
+        self.nodes = list(nodes)
+        self.landmarks = np.asarray(landmarks, dtype=np.int32)
+        self.distances = np.asarray(distances, dtype=np.float64)
+        self.signature = signature
+        self._rows = None
+        # CSR-граф → контрольна сума ваг, з якою він пройшов перевірку
+        self._verified = weakref.WeakKeyDictionary()
+
+    @property
+    def num_landmarks(self):
+        return len(self.landmarks)
+
+    def rows(self):
+        """
+        Повертає відстані до орієнтирів як список рядків Python.
+
+        Евристика обчислюється для кожної розкритої вершини окремо, і для
+        таких коротких рядків цикл Python швидший за виклики NumPy.
+
+        Returns:
+            list: Рядки відстаней для кожної вершини
+        """
+        if self._rows is None:
+            self._rows = self.distances.tolist()
+        return self._rows
+
+    def save(self, path):
+        """
+        Зберігає індекс у файл .npz.
+
+        Args:
+            path (str): Шлях до файлу
+        """
+        np.savez(path,
+                 nodes=np.array([str(node) for node in self.nodes]),
+                 landmarks=self.landmarks,
+                 distances=self.distances,
+                 signature=np.array(self.signature or ''))
+
+    def check_compatible(self, csr):
+        """
+        Перевіряє, що індекс побудовано для того самого графа.
+
+        Оцінки орієнтирів для іншого або зміненого графа можуть
+        переоцінювати відстань, і A* тоді повертає неоптимальні шляхи,
+        тому окрім вершин порівнюється відбиток суміжності та ваг.
+        Повний SHA-256 рахується лише тоді, коли змінилася дешева
+        контрольна сума масивів графа (_array_checksum), тож зміна ваг
+        на місці після першої перевірки теж буде помічена.
+
+        Args:
+            csr (CSRGraph): Граф у форматі CSR
+
+        Raises:
+            ValueError: Якщо вершини, ребра або ваги графа та індексу не збігаються
+        """
+        checksum = _array_checksum(csr)
+        if self._verified.get(csr) == checksum:
+            return
+        if [str(node) for node in csr.nodes] != [str(node) for node in self.nodes]:
+            raise ValueError("Індекс орієнтирів побудовано для іншого графа")
+        if self.signature is None:
+            raise ValueError("Індекс орієнтирів не містить відбитка графа - перебудуйте його")
+        if graph_signature(csr) != self.signature:
+            raise ValueError("Граф змінився після побудови індексу орієнтирів")
+        self._verified[csr] = checksum
+
+
+def _array_checksum(csr):
+    """Дешева контрольна сума ваг і номерів сусідів (сума бітових представлень)."""
+    return (int(csr.weights.view(np.uint64).sum()),
+            int(csr.indices.astype(np.int64, copy=False).sum()))
+
+
+def graph_signature(csr):
+    """
+    Обчислює відбиток CSR-графа: SHA-256 масивів суміжності та ваг.
+
+    Args:
+        csr (CSRGraph): Граф у форматі CSR
+
+    Returns:
+        str: Шістнадцятковий хеш
+    """
+    digest = hashlib.sha256()
+    for array in (csr.indptr, csr.indices, csr.weights):
+        digest.update(np.ascontiguousarray(array).tobytes())
+    return digest.hexdigest()
+
+
+def load_landmark_index(path, csr=None):
+    """
+    Завантажує індекс орієнтирів з файлу .npz.
+
+    Args:
+        path (str): Шлях до файлу
+        csr (CSRGraph): Граф, для якого використовуватиметься індекс; якщо
+                        задано, сумісність перевіряється одразу
+
+    Returns:
+        LandmarkIndex: Завантажений індекс
+
+    Raises:
+        ValueError: Якщо індекс побудовано для іншого графа
+    """
+    with np.load(path) as data:
+        signature = str(data['signature']) if 'signature' in data.files else ''
+        index = LandmarkIndex(data['nodes'].tolist(), data['landmarks'], data['distances'],
+                              signature=signature or None)
+    if csr is not None:
+        index.check_compatible(csr)
+    return index
+
+
+def select_landmarks(csr, k, strategy='farthest', seed=0):
+    """
+    Обирає вершини-орієнтири та обчислює відстані до них.
+
+    Стратегія 'farthest' щоразу бере вершину, найвіддаленішу від уже
+    обраних орієнтирів (недосяжні вершини вважаються найвіддаленішими,
+    тож кожна компонента зв'язності отримає свій орієнтир). Стратегія
+    'random' обирає випадкові вершини.
+
+    Args:
+        csr (CSRGraph): Граф у форматі CSR
+        k (int): Кількість орієнтирів
+        strategy (str): 'farthest' або 'random'
+        seed (int): Зерно генератора випадкових чисел
+
+    Returns:
+        tuple: (номери орієнтирів, матриця відстаней n x K)
+    """
+    n = csr.num_nodes
+    k = min(k, n)
+    rng = random.Random(seed)
+
+    if strategy == 'random':
+        landmarks = rng.sample(range(n), k)
+        columns = [dijkstra_csr(csr, landmark)[0] for landmark in landmarks]
+    elif strategy == 'farthest':
+        landmarks = []
+        columns = []
+        # Перший орієнтир - найвіддаленіша вершина від випадкової
+        first_distances = dijkstra_csr(csr, rng.randrange(n))[0]
+        closest = np.where(np.isfinite(first_distances), first_distances, -1.0)
+        candidate = int(np.argmax(closest))
+        closest = np.full(n, np.inf)
+
+        for _ in range(k):
+            landmarks.append(candidate)
+            column = dijkstra_csr(csr, candidate)[0]
+            columns.append(column)
+            np.minimum(closest, column, out=closest)
+            closest[landmarks] = -1.0
+            candidate = int(np.argmax(closest))
+    else:
+        raise ValueError(f"Невідома стратегія вибору орієнтирів: {strategy}")
+
+    if not columns:
+        return np.array(landmarks, dtype=np.int32), np.zeros((n, 0))
+
+    return np.array(landmarks, dtype=np.int32), np.column_stack(columns)
+
+
+def build_landmark_index(graph, k=8, strategy='farthest', seed=0, csr=None):
+    """
+    Офлайн-побудова індексу орієнтирів для зваженого графа.
+
+    Args:
+        graph (nx.Graph): Зважений граф (з load_and_prepare_weighted_graph)
+        k (int): Кількість орієнтирів
+        strategy (str): 'farthest' або 'random'
+        seed (int): Зерно генератора випадкових чисел
+        csr (CSRGraph): Готове CSR-представлення графа (будується, якщо не задано)
+
+    Returns:
+        LandmarkIndex: Побудований індекс
+    """
+    if csr is None:
+        csr = build_csr_graph(graph)
+
+    landmarks, distances = select_landmarks(csr, k, strategy=strategy, seed=seed)
+    index = LandmarkIndex(csr.nodes, landmarks, distances, signature=graph_signature(csr))
+    index._verified[csr] = _array_checksum(csr)
+    return index
+
+
+def landmark_heuristic(index, source, target, active_landmarks=None):
+    """
+    Будує евристику A* з нижніх оцінок через нерівність трикутника.
+
+    Щоб зменшити вартість обчислення оцінки, можна використовувати лише
+    кілька "активних" орієнтирів, які дають найкращу оцінку для пари
+    source → target.
+
+    Args:
+        index (LandmarkIndex): Індекс орієнтирів
+        source (int): Номер початкової вершини
+        target (int): Номер кінцевої вершини
+        active_landmarks (int): Кількість активних орієнтирів (усі, якщо None)
+
+    Returns:
+        callable: Функція номер вершини → нижня оцінка відстані до цілі
+    """
+    rows = index.rows()
+    inf = float('infinity')
+    target_row = rows[target]
+    source_row = rows[source]
+
+    def bound(row, columns):
+        best = 0.0
+        for j in columns:
+            to_target = target_row[j]
+            to_node = row[j]
+            if to_target == inf and to_node == inf:
+                continue
+            gap = abs(to_target - to_node)
+            if gap > best:
+                best = gap
+        return best
+
+    columns = range(index.num_landmarks)
+    if active_landmarks is not None and active_landmarks < index.num_landmarks:
+        gaps = [(bound(source_row, [j]), j) for j in columns]
+        gaps.sort(reverse=True)
+        columns = [j for _, j in gaps[:active_landmarks]]
+
+    return lambda node: bound(rows[node], columns)
+
+
+def alt_shortest_path(index, csr, start, end, active_landmarks=4):
+    """
+    Відповідає на запит точка-точка за допомогою A* з оцінками орієнтирів.
+
+    Args:
+        index (LandmarkIndex): Індекс орієнтирів
+        csr (CSRGraph): Граф у форматі CSR, для якого побудовано індекс
+        start (str): Початкова вершина
+        end (str): Кінцева вершина
+        active_landmarks (int): Кількість активних орієнтирів (усі, якщо None)
+
+    Returns:
+        tuple: (шлях або None, відстань, статистика)
+
+    Raises:
+        ValueError: Якщо індекс побудовано для іншого або зміненого графа
+    """
+    index.check_compatible(csr)
+    source, target = csr.index[start], csr.index[end]
+    heuristic = landmark_heuristic(index, source, target, active_landmarks)
+    path_ids, distance, stats = astar_csr(csr, source, target, heuristic)
+
+    path = [csr.nodes[i] for i in path_ids] if path_ids is not None else None
+    stats['algorithm'] = 'ALT'
+    stats['total_nodes'] = csr.num_nodes
+
+    return path, distance, stats
+
+
+def benchmark_landmarks(graph, k=8, num_queries=100, seed=0, active_landmarks=4):
+    """
+    Порівнює запити ALT зі звичайним dijkstra_algorithm на випадкових парах.
+
+    Args:
+        graph (nx.Graph): Зважений граф
+        k (int): Кількість орієнтирів
+        num_queries (int): Кількість випадкових запитів
+        seed (int): Зерно генератора випадкових чисел
+        active_landmarks (int): Кількість активних орієнтирів
+
+    Returns:
+        dict: Час побудови, середній час запиту та кількість оброблених вузлів
+    """
+    from task3 import dijkstra_algorithm, reconstruct_path
+
+    csr = build_csr_graph(graph)
+
+    start_time = time.perf_counter()
+    index = build_landmark_index(graph, k=k, seed=seed, csr=csr)
+    build_time = time.perf_counter() - start_time
+
+    rng = random.Random(seed)
+    nodes = csr.nodes
+    queries = [(rng.choice(nodes), rng.choice(nodes)) for _ in range(num_queries)]
+
+    dijkstra_time = 0.0
+    dijkstra_settled = 0
+    alt_time = 0.0
+    alt_settled = 0
+    mismatches = 0
+
+    for start, end in queries:
+        query_start = time.perf_counter()
+        distances, predecessors, stats = dijkstra_algorithm(graph, start, csr=csr)
+        reconstruct_path(predecessors, start, end)
+        dijkstra_time += time.perf_counter() - query_start
+        dijkstra_settled += stats['nodes_processed']
+
+        query_start = time.perf_counter()
+        _, distance, stats = alt_shortest_path(index, csr, start, end, active_landmarks)
+        alt_time += time.perf_counter() - query_start
+        alt_settled += stats['settled_nodes']
+
+        if abs(distance - distances[end]) > 1e-9:
+            mismatches += 1
+
+    results = {
+        'num_nodes': csr.num_nodes,
+        'num_landmarks': index.num_landmarks,
+        'build_time': build_time,
+        'dijkstra_avg_time': dijkstra_time / num_queries,
+        'alt_avg_time': alt_time / num_queries,
+        'dijkstra_avg_settled': dijkstra_settled / num_queries,
+        'alt_avg_settled': alt_settled / num_queries,
+        'mismatches': mismatches
+    }
+
+    print(f"\n🗺️  ALT ({index.num_landmarks} орієнтирів) проти dijkstra_algorithm, "
+          f"{csr.num_nodes} вершин, {num_queries} запитів")
+    print(f"   • Побудова індексу: {build_time*1000:.1f} мс")
+    print(f"   • Дейкстра: {results['dijkstra_avg_time']*1000:.3f} мс/запит, "
+          f"{results['dijkstra_avg_settled']:.1f} вузлів")
+    print(f"   • ALT: {results['alt_avg_time']*1000:.3f} мс/запит, "
+          f"{results['alt_avg_settled']:.1f} вузлів")
+    print(f"   • Розбіжностей у відстанях: {mismatches}")
+
+    return results
@@ -0,0 +1,289 @@
+"""
+Мультимодальні маршрути зі штрафами за пересадку між видами транспорту.
+
+Стан пошуку - пара (станція, вид транспорту, яким на неї прибули). Перехід
+ребром іншого виду транспорту коштує додатковий штраф з матриці
+penalties[з якого виду][на який] і рахується як пересадка. Перша посадка
+на станції відправлення безкоштовна.
+
+Простір станів не будується явно: номер стану - station * (M + 1) + mode, а
+переходи обчислюються на льоту з CSR-графа та кодів виду транспорту його
+записів, тож граф не копіюється.
+
+Окрім пошуку найшвидшого маршруту, підтримується багатокритеріальний
+режим: множина Парето-оптимальних маршрутів за (час, кількість пересадок).
+"""
+
+import heapq
+import time
+
+import numpy as np
+
+from csr_graph import TRANSPORT_TYPES, build_csr_graph, transport_codes
+
+# Види транспорту в порядку кодів; останній - ребра з невідомим типом
+MODES = TRANSPORT_TYPES + ('other',)
+
+# Штраф за пересадку між парою видів транспорту (хвилини)
+DEFAULT_TRANSFER_PENALTIES = {
+    ('metro', 'train'): 4.0,
+    ('train', 'metro'): 4.0,
+    ('metro', 'bus'): 6.0,
+    ('bus', 'metro'): 6.0,
+    ('train', 'bus'): 6.0,
+    ('bus', 'train'): 6.0,
+}
+
+# Штраф для пар, яких немає в словнику штрафів
+DEFAULT_TRANSFER_PENALTY = 5.0
+
+
+class MultimodalGraph:
+    """
+    CSR-граф з видом транспорту кожного запису та матрицею штрафів.
+
+    Attributes:
+        csr (CSRGraph): Граф у форматі CSR
+        arc_modes (np.ndarray): Код виду транспорту (індекс у MODES) для кожного запису
+        penalties (np.ndarray): Матриця штрафів за пересадку M x M
+    """
+
+    def __init__(self, csr, arc_modes, penalties):
+        self.csr = csr
+        self.arc_modes = np.asarray(arc_modes, dtype=np.int16)
+        self.penalties = np.asarray(penalties, dtype=np.float64)
+
+
+def transfer_penalty_matrix(penalties=None, default=DEFAULT_TRANSFER_PENALTY):
+    """
+    Будує матрицю штрафів за пересадку.
+
+    Args:
+        penalties (dict): (вид, вид) → штраф; за замовчуванням
+                          DEFAULT_TRANSFER_PENALTIES
+        default (float): Штраф для пар, яких немає в словнику
+
+    Returns:
+        np.ndarray: Матриця M x M (нулі на діагоналі)
+    """
+    if penalties is None:
+        penalties = DEFAULT_TRANSFER_PENALTIES
+
+    matrix = np.full((len(MODES), len(MODES)), float(default))
+    np.fill_diagonal(matrix, 0.0)
+    for (from_mode, to_mode), penalty in penalties.items():
+        if penalty < 0:
+            raise ValueError("Штраф за пересадку не може бути від'ємним")
+        matrix[MODES.index(from_mode), MODES.index(to_mode)] = penalty
+    return matrix
+
+
+def build_multimodal_graph(graph, penalties=None, weight='weight'):
+    """
+    Готує граф до мультимодального пошуку.
+
+    Args:
+        graph (nx.Graph): Зважений граф з атрибутом ребер transport_type
+        penalties (dict | np.ndarray): Штрафи за пересадку (словник пар або
+                                       готова матриця M x M)
+        weight (str): Атрибут ребра з вагою
+
+    Returns:
+        MultimodalGraph: Граф для мультимодального пошуку
+    """
+    csr = build_csr_graph(graph, weight=weight)
+    arc_modes = transport_codes(graph, csr)
+    arc_modes[arc_modes < 0] = MODES.index('other')
+
+    if not isinstance(penalties, np.ndarray):
+        penalties = transfer_penalty_matrix(penalties)
+
+    return MultimodalGraph(csr, arc_modes, penalties)
+
+
+def _search_penalties(mmg):
+    """Рядки штрафів як списки; останній рядок - старт, з якого пересадок немає."""
+    return mmg.penalties.tolist() + [[0.0] * len(MODES)]
+
+
+def multimodal_dijkstra(mmg, source, target):
+    """
+    Найшвидший маршрут з урахуванням штрафів за пересадку.
+
+    Номер стану - station * (M + 1) + mode, де mode = M означає старт
+    (на станцію відправлення ще нічим не прибули).
+
+    Args:
+        mmg (MultimodalGraph): Граф для мультимодального пошуку
+        source (int): Номер початкової станції
+        target (int): Номер кінцевої станції
+
+    Returns:
+        tuple: (номер кінцевого стану або -1, час, попередники станів, статистика)
+    """
+    indptr, indices, weights = mmg.csr.adjacency_lists()
+    arc_modes = mmg.arc_modes.tolist()
+    penalties = _search_penalties(mmg)
+    width = len(MODES) + 1
+    inf = float('infinity')
+
+    start_state = source * width + len(MODES)
+    dist = {start_state: 0.0}
+    parents = {start_state: -1}
+    settled = set()
+    heap = [(0.0, start_state)]
+    iterations = 0
+    found = -1
+
+    start_time = time.perf_counter()
+
+    while heap:
+        iterations += 1
+        current_time, state = heapq.heappop(heap)
+        if state in settled:
+            continue
+        settled.add(state)
+
+        node, mode = divmod(state, width)
+        if node == target:
+            found = state
+            break
+
+        mode_penalties = penalties[mode]
+        for k in range(indptr[node], indptr[node + 1]):
+            edge_mode = arc_modes[k]
+            neighbor = indices[k] * width + edge_mode
+            if neighbor in settled:
+                continue
+            new_time = current_time + weights[k] + mode_penalties[edge_mode]
+            if new_time < dist.get(neighbor, inf):
+                dist[neighbor] = new_time
+                parents[neighbor] = state
+                heapq.heappush(heap, (new_time, neighbor))
+
+    end_time = time.perf_counter()
+
+    stats = {
+        'iterations': iterations,
+        'execution_time': end_time - start_time,
+        'settled_states': len(settled)
+    }
+
+    return found, dist.get(found, inf), parents, stats
+
+
+def _count_transfers(modes):
+    return sum(1 for a, b in zip(modes, modes[1:]) if a != b)
+
+
+def multimodal_shortest_path(mmg, start, end):
+    """
+    Знаходить найшвидший маршрут між станціями з урахуванням пересадок.
+
+    Args:
+        mmg (MultimodalGraph): Граф для мультимодального пошуку
+        start (str): Початкова станція
+        end (str): Кінцева станція
+
+    Returns:
+        tuple: (станції або None, вид транспорту кожного перегону, час,
+                кількість пересадок, статистика)
+    """
+    csr = mmg.csr
+    state, total_time, parents, stats = multimodal_dijkstra(mmg, csr.index[start],
+                                                            csr.index[end])
+    if state == -1:
+        return None, [], total_time, 0, stats
+
+    width = len(MODES) + 1
+    stations, modes = [], []
+    while state != -1:
+        node, mode = divmod(state, width)
+        stations.append(csr.nodes[node])
+        modes.append(mode)
+        state = parents[state]
+    stations.reverse()
+    # Вид транспорту перегону - той, яким прибули в його кінець
+    modes = [MODES[mode] for mode in reversed(modes[:-1])]
+
+    return stations, modes, total_time, _count_transfers(modes), stats
+
+
+def pareto_routes(mmg, start, end, max_transfers=None):
+    """
+    Парето-оптимальні маршрути за критеріями (час, кількість пересадок).
+
+    Мітки обробляються в лексикографічному порядку (час, пересадки), тому
+    мітка стану (станція, вид транспорту) домінована, якщо цей стан уже
+    має мітку з не більшою кількістю пересадок. Так само мітка
+    відкидається, якщо ціль уже досягнуто з не більшою кількістю пересадок.
+
+    Args:
+        mmg (MultimodalGraph): Граф для мультимодального пошуку
+        start (str): Початкова станція
+        end (str): Кінцева станція
+        max_transfers (int): Максимальна кількість пересадок (необов'язково)
+
+    Returns:
+        list: Маршрути (станції, види транспорту перегонів, час, пересадки)
+              від найшвидшого до маршруту з найменшою кількістю пересадок
+    """
+    csr = mmg.csr
+    indptr, indices, weights = csr.adjacency_lists()
+    arc_modes = mmg.arc_modes.tolist()
+    penalties = _search_penalties(mmg)
+    start_mode = len(MODES)
+    source, target = csr.index[start], csr.index[end]
+
+    if source == target:
+        return [([start], [], 0.0, 0)]
+
+    # Мітка: (час, пересадки, станція, вид транспорту, номер батьківської мітки)
+    labels = []
+    best_transfers = {}
+    target_transfers = float('infinity')
+    routes = []
+    heap = [(0.0, 0, source, start_mode, -1)]
+
+    while heap:
+        current_time, transfers, node, mode, parent = heapq.heappop(heap)
+        if transfers >= target_transfers:
+            continue
+        state = (node, mode)
+        if transfers >= best_transfers.get(state, float('infinity')):
+            continue
+        best_transfers[state] = transfers
+        labels.append((node, mode, parent))
+        label = len(labels) - 1
+
+        if node == target:
+            target_transfers = transfers
+            routes.append((label, current_time, transfers))
+            if transfers == 0:
+                break
+            continue
+
+        for k in range(indptr[node], indptr[node + 1]):
+            edge_mode = arc_modes[k]
+            new_time = current_time + weights[k] + penalties[mode][edge_mode]
+            new_transfers = transfers
+            if mode != start_mode and edge_mode != mode:
+                new_transfers += 1
+            if max_transfers is not None and new_transfers > max_transfers:
+                continue
+            if new_transfers >= best_transfers.get((indices[k], edge_mode), float('infinity')):
+                continue
+            heapq.heappush(heap, (new_time, new_transfers, indices[k], edge_mode, label))
+
+    result = []
+    for label, total_time, transfers in routes:
+        stations, modes = [], []
+        while label != -1:
+            node, mode, label = labels[label]
+            stations.append(csr.nodes[node])
+            modes.append(mode)
+        stations.reverse()
+        modes.reverse()
+        result.append((stations, [MODES[m] for m in modes[1:]], total_time, transfers))
+
+    return result
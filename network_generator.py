@@ -0,0 +1,283 @@
+"""
+Генератор синтетичних міських транспортних мереж від тисяч до мільйонів станцій.
+
+Демонстраційний граф із 15 станцій не показує, як алгоритми масштабуються,
+тому тут мережа будується за спрощеною моделлю міста:
+
+- станції стоять на збуреній квадратній сітці з кроком spacing км і
+  з'єднані автобусними ребрами з сусідами по сітці (частина вертикальних
+  ребер випадково відкидається, але мережа залишається зв'язною);
+- місто поділене на райони - області Вороного навколо випадкових центрів;
+  станція, найближча до центру району, стає залізничним вузлом, а вузли
+  з'єднані приміськими поїздами по колу та з центральним районом;
+- частка станцій hub_fraction - вузли метро; лінії метро проходять через
+  місто прямими коридорами й з'єднують вузли, що в них потрапили.
+
+Усе будується масивами NumPy без NetworkX, результат - той самий
+StreamedNetwork, що й у streaming_loader.py. Для невеликих мереж
+network_to_graph повертає nx.Graph з атрибутами як у task1.py.
+"""
+
+import math
+
+import networkx as nx
+import numpy as np
+import pandas as pd
+
+from csr_graph import TRANSPORT_COEFFICIENTS, TRANSPORT_TYPES, csr_from_edges
+from streaming_loader import StreamedNetwork, deduplicate_edges
+
+# Кількість станцій, на яку в середньому припадає один район
+STATIONS_PER_DISTRICT = 2000
+
+# Межі кількості районів
+MIN_DISTRICTS = 4
+MAX_DISTRICTS = 64
+
+# Розмір частини вершин при пошуку найближчого центру району
+_ASSIGN_CHUNK = 100_000
+
+
+def _assign_districts(coords, centers):
+    """Номер найближчого центру району для кожної станції (частинами)."""
+    districts = np.empty(len(coords), dtype=np.int32)
+    for lo in range(0, len(coords), _ASSIGN_CHUNK):
+        block = coords[lo:lo + _ASSIGN_CHUNK]
+        deltas = block[:, None, :] - centers[None, :, :]
+        districts[lo:lo + _ASSIGN_CHUNK] = np.argmin((deltas ** 2).sum(axis=2), axis=1)
+    return districts
+
+
+def _nearest_stations(coords, centers):
+    """Номер станції, найближчої до кожного центру району."""
+    return np.array([np.argmin(((coords - center) ** 2).sum(axis=1)) for center in centers],
+                    dtype=np.int64)
+
+
+def _grid_edges(n, side, keep_vertical, rng):
+    """Автобусні ребра сітки: усі горизонтальні та частина вертикальних."""
+    ids = np.arange(n)
+    columns = ids % side
+
+    horizontal = ids[(columns < side - 1) & (ids + 1 < n)]
+    vertical = ids[ids + side < n]
+    # Вертикальні ребра першого стовпця зберігаються завжди - вони
+    # з'єднують рядки, тому мережа залишається зв'язною
+    kept = (columns[vertical] == 0) | (rng.random(len(vertical)) < keep_vertical)
+    vertical = vertical[kept]
+
+    sources = np.concatenate([horizontal, vertical])
+    targets = np.concatenate([horizontal + 1, vertical + side])
+    return sources, targets
+
+
+def _metro_edges(coords, hubs, num_lines, rng):
+    """Ребра ліній метро: вузли в коридорі прямої, з'єднані вздовж неї."""
+    if len(hubs) < 2:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64), np.zeros(len(coords), bool)
+
+    extent = np.ptp(coords, axis=0).max()
+    width = extent / (4 * num_lines)
+    on_line = np.zeros(len(coords), dtype=bool)
+    sources, targets = [], []
+
+    for _ in range(num_lines):
+        angle = rng.uniform(0, math.pi)
+        direction = np.array([math.cos(angle), math.sin(angle)])
+        normal = np.array([-direction[1], direction[0]])
+        offset = rng.normal(0, extent / 10)
+
+        hub_coords = coords[hubs]
+        corridor = np.abs(hub_coords @ normal - offset) < width
+        stations = hubs[corridor]
+        if len(stations) < 2:
+            continue
+        stations = stations[np.argsort(coords[stations] @ direction)]
+        sources.append(stations[:-1])
+        targets.append(stations[1:])
+        on_line[stations] = True
+
+    if not sources:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64), on_line
+    return np.concatenate(sources), np.concatenate(targets), on_line
+
+
+def _train_edges(coords, terminals, central):
+    """Приміські поїзди: коло через вузли районів і радіальні лінії до центру."""
+    if len(terminals) < 2:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+
+    angles = np.arctan2(coords[terminals, 1], coords[terminals, 0])
+    ring = terminals[np.argsort(angles)]
+    sources = [ring, terminals[terminals != central]]
+    targets = [np.roll(ring, -1), np.full((terminals != central).sum(), central)]
+    return np.concatenate(sources), np.concatenate(targets)
+
+
+def generate_city_network(num_nodes, num_districts=None, hub_fraction=0.02,
+                          metro_lines=None, spacing=0.5, keep_vertical=0.8, seed=0):
+    """
+    Генерує зв'язну міську транспортну мережу.
+
+    Args:
+        num_nodes (int): Кількість станцій
+        num_districts (int): Кількість районів (за замовчуванням - одна на
+                             STATIONS_PER_DISTRICT станцій, у межах 4..64)
+        hub_fraction (float): Частка станцій, що є кандидатами у вузли метро
+        metro_lines (int): Кількість ліній метро (за замовчуванням ~√районів)
+        spacing (float): Крок сітки станцій, км
+        keep_vertical (float): Імовірність зберегти вертикальне ребро сітки
+        seed (int): Зерно генератора випадкових чисел
+
+    Returns:
+        StreamedNetwork: Мережа (CSR з вагами - часом подорожі, відстані й
+                         типи транспорту ребер, атрибути станцій)
+    """
+    if num_nodes < 2:
+        raise ValueError("Мережа повинна мати щонайменше 2 станції")
+
+    rng = np.random.default_rng(seed)
+    n = num_nodes
+    side = math.ceil(math.sqrt(n))
+
+    # Координати: сітка зі збуренням, початок - у центрі міста
+    ids = np.arange(n)
+    coords = np.column_stack([ids % side, ids // side]).astype(np.float64) * spacing
+    coords += rng.normal(0, spacing * 0.15, size=(n, 2))
+    coords -= coords.mean(axis=0)
+
+    # Райони: центри відсортовані за відстанню до центру міста, тож район 0 -
+    # центральний
+    if num_districts is None:
+        num_districts = min(MAX_DISTRICTS, max(MIN_DISTRICTS, n // STATIONS_PER_DISTRICT))
+    num_districts = min(num_districts, n)
+    low, high = coords.min(axis=0), coords.max(axis=0)
+    centers = rng.uniform(low, high, size=(num_districts, 2))
+    centers[0] = 0.0
+    centers = centers[np.argsort(np.hypot(centers[:, 0], centers[:, 1]))]
+    districts = _assign_districts(coords, centers)
+
+    # Залізничні вузли - станції, найближчі до центрів районів
+    nearest = _nearest_stations(coords, centers)
+    terminals = np.unique(nearest)
+    central = nearest[0]
+
+    # Кандидати у вузли метро; ближче до центру міста їх більше
+    distance_to_center = np.hypot(coords[:, 0], coords[:, 1])
+    hub_probability = hub_fraction * 2 * (1 - distance_to_center / distance_to_center.max())
+    hubs = ids[rng.random(n) < hub_probability]
+    if metro_lines is None:
+        metro_lines = max(2, round(math.sqrt(num_districts)))
+
+    bus_sources, bus_targets = _grid_edges(n, side, keep_vertical, rng)
+    metro_sources, metro_targets, on_metro = _metro_edges(coords, hubs, metro_lines, rng)
+    train_sources, train_targets = _train_edges(coords, terminals, central)
+
+    modes = [(TRANSPORT_TYPES.index('bus'), bus_sources, bus_targets),
+             (TRANSPORT_TYPES.index('metro'), metro_sources, metro_targets),
+             (TRANSPORT_TYPES.index('train'), train_sources, train_targets)]
+    sources = np.concatenate([s for _, s, _ in modes]).astype(np.int32)
+    targets = np.concatenate([t for _, _, t in modes]).astype(np.int32)
+    transport = np.concatenate([np.full(len(s), code, dtype=np.int16) for code, s, _ in modes])
+
+    distances = np.hypot(*(coords[sources] - coords[targets]).T)
+    coefficients = np.array([TRANSPORT_COEFFICIENTS[t] for t in TRANSPORT_TYPES])
+    weights = distances * coefficients[transport]
+
+    keep = deduplicate_edges(sources, targets, weights)
+    sources, targets = sources[keep], targets[keep]
+    distances, weights, transport = distances[keep], weights[keep], transport[keep]
+
+    # Атрибути станцій як у task1.py
+    station_types = np.full(n, 'bus', dtype=object)
+    station_types[on_metro] = 'metro'
+    station_types[terminals] = 'train'
+    district_names = np.array(['Центр'] + [f'Район {d}' for d in range(1, num_districts)],
+                              dtype=object)
+    population = rng.lognormal(math.log(5000), 0.6, size=n).astype(np.int64)
+    population[terminals] *= 3
+
+    stations = {
+        'district': district_names[districts],
+        'type': station_types,
+        'population': population,
+        'x': coords[:, 0],
+        'y': coords[:, 1]
+    }
+
+    names = [f'S{i}' for i in range(n)]
+    csr = csr_from_edges(names, sources, targets, weights, coords=coords)
+
+    return StreamedNetwork(csr, distances, transport, stations)
+
+
+def _edge_endpoints(network):
+    """Кінці неорієнтованих ребер у порядку їх номерів."""
+    csr = network.csr
+    tails = np.repeat(np.arange(csr.num_nodes), np.diff(csr.indptr))
+    forward = tails < csr.indices
+    sources = np.empty(len(network.distances), dtype=np.int64)
+    targets = np.empty(len(network.distances), dtype=np.int64)
+    sources[csr.edge_ids[forward]] = tails[forward]
+    targets[csr.edge_ids[forward]] = csr.indices[forward]
+    return sources, targets
+
+
+def network_to_graph(network):
+    """
+    Перетворює мережу на nx.Graph з атрибутами як у create_city_transport_network.
+
+    Для мільйонів станцій граф NetworkX займає гігабайти - використовуйте
+    лише для мереж, з якими працюють функції task1-task3.
+
+    Args:
+        network (StreamedNetwork): Мережа
+
+    Returns:
+        nx.Graph: Граф з атрибутами станцій і ребер (включно з weight та travel_time)
+    """
+    csr = network.csr
+    graph = nx.Graph()
+
+    columns = list(network.stations)
+    values = [network.stations[column].tolist() for column in columns]
+    graph.add_nodes_from((name, dict(zip(columns, row)))
+                         for name, row in zip(csr.nodes, zip(*values)))
+
+    sources, targets = _edge_endpoints(network)
+    nodes = csr.nodes
+    transport = [TRANSPORT_TYPES[code] if code >= 0 else None
+                 for code in network.transport.tolist()]
+    weights = csr.weights[np.argsort(csr.edge_ids, kind='stable')[::2]].tolist()
+    for u, v, distance, transport_type, weight in zip(sources.tolist(), targets.tolist(),
+                                                      network.distances.tolist(), transport,
+                                                      weights):
+        graph.add_edge(nodes[u], nodes[v], distance=distance, transport_type=transport_type,
+                       weight=weight, travel_time=weight)
+
+    return graph
+
+
+def write_network_csv(network, edges_path, stations_path):
+    """
+    Зберігає мережу у файли, які читає streaming_loader.load_network.
+
+    Args:
+        network (StreamedNetwork): Мережа
+        edges_path (str): Файл ребер (source, target, distance, transport_type)
+        stations_path (str): Файл станцій (station та атрибути станцій)
+    """
+    nodes = np.array(network.csr.nodes, dtype=object)
+    sources, targets = _edge_endpoints(network)
+    transport_names = np.array(TRANSPORT_TYPES + (None,), dtype=object)
+
+    pd.DataFrame({
+        'source': nodes[sources],
+        'target': nodes[targets],
+        'distance': network.distances,
+        'transport_type': transport_names[network.transport]
+    }).to_csv(edges_path, index=False)
+
+    stations = pd.DataFrame(network.stations)
+    stations.insert(0, 'station', nodes)
+    stations.to_csv(stations_path, index=False)
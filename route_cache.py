@@ -0,0 +1,208 @@
+"""
+Кешуючий маршрутизатор для повторюваних запитів від тих самих станцій.
+
+Запити сильно зосереджені на кількох популярних станціях відправлення,
+тому дерево найкоротших шляхів (відстані та попередники) для кожного
+джерела обчислюється один раз і зберігається в LRU-кеші, розмір якого
+обмежено в байтах.
+
+Кеш прив'язаний до лічильника версії графа graph.graph['version'] та
+кількості вершин і ребер. Функції, що змінюють ваги ребер (set_edge_weight,
+apply_travel_time_weights, DynamicShortestPaths.update_edge), збільшують
+версію, і наступний запит скидає весь кеш.
+"""
+
+from collections import OrderedDict
+
+from csr_graph import build_csr_graph, dijkstra_csr, reconstruct_path_csr
+
+# Типовий ліміт кешу: 64 МіБ
+DEFAULT_CACHE_BYTES = 64 * 1024 * 1024
+
+
+def graph_version(graph):
+    """
+    Повертає лічильник версії графа (0, якщо ваги ще не змінювалися).
+
+    Args:
+        graph (nx.Graph): Граф
+
+    Returns:
+        int: Версія графа
+    """
+    return graph.graph.get('version', 0)
+
+
+def bump_graph_version(graph):
+    """
+    Збільшує лічильник версії графа після зміни ваг ребер.
+
+    Args:
+        graph (nx.Graph): Граф
+
+    Returns:
+        int: Нова версія графа
+    """
+    graph.graph['version'] = graph_version(graph) + 1
+    return graph.graph['version']
+
+
+def set_edge_weight(graph, u, v, weight, attribute='weight'):
+    """
+    Змінює вагу ребра (додає ребро, якщо його немає) та версію графа.
+
+    Args:
+        graph (nx.Graph): Граф
+        u (str): Перша вершина ребра
+        v (str): Друга вершина ребра
+        weight (float): Нова вага
+        attribute (str): Атрибут ребра з вагою
+    """
+    if graph.has_edge(u, v):
+        graph[u][v][attribute] = weight
+    else:
+        graph.add_edge(u, v, **{attribute: weight})
+    bump_graph_version(graph)
+
+
+class CachingRouter:
+    """
+    Маршрутизатор з LRU-кешем дерев найкоротших шляхів за джерелом.
+
+    Кеш скидається, коли змінюється версія графа або кількість вершин чи
+    ребер. Пряма зміна атрибута (G[u][v]['weight'] = x) чи заміна ребра
+    без зміни їх кількості (remove_edge + add_edge) не помітна: після
+    неї викличте bump_graph_version або змінюйте ваги через
+    set_edge_weight, інакше повертатимуться застарілі маршрути.
+
+    Attributes:
+        graph (nx.Graph): Зважений граф
+        weight (str): Атрибут ребра з вагою
+        max_bytes (int): Ліміт розміру кешу в байтах
+        hits (int): Кількість запитів, обслужених з кешу
+        misses (int): Кількість запитів, для яких запускалася Дейкстра
+        evictions (int): Кількість витіснених з кешу дерев
+        invalidations (int): Кількість скидань кешу через зміну версії графа
+    """
+
+    def __init__(self, graph, max_bytes=DEFAULT_CACHE_BYTES, weight='weight'):
+        self.graph = graph
+        self.weight = weight
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._csr = None
+        self._version = None
+
+    def _sync(self):
+        """Перебудовує CSR-знімок і скидає кеш, якщо граф змінився."""
+        # Кількість вершин і ребер - дешева перевірка змін, що оминули версію
+        version = (graph_version(self.graph), self.graph.number_of_nodes(),
+                   self.graph.number_of_edges())
+        if self._csr is not None and version == self._version:
+            return
+        if self._csr is not None:
+            self.invalidations += 1
+        self.clear()
+        self._csr = build_csr_graph(self.graph, weight=self.weight)
+        self._version = version
+
+    def clear(self):
+        """Очищує кеш (лічильники зберігаються)."""
+        self._entries.clear()
+        self._bytes = 0
+
+    def tree(self, start):
+        """
+        Повертає дерево найкоротших шляхів від станції (з кешу або обчислене).
+
+        Масиви спільні з кешем, тому доступні лише для читання.
+
+        Args:
+            start (str): Початкова станція
+
+        Returns:
+            tuple: (масив відстаней, масив попередників (-1 - немає))
+        """
+        self._sync()
+        source = self._csr.index[start]
+
+        entry = self._entries.get(source)
+        if entry is not None:
+            self.hits += 1
+            self._entries.move_to_end(source)
+            return entry
+
+        self.misses += 1
+        dist, pred, _ = dijkstra_csr(self._csr, source)
+        dist.flags.writeable = False
+        pred.flags.writeable = False
+        entry = (dist, pred)
+
+        size = dist.nbytes + pred.nbytes
+        if size <= self.max_bytes:
+            self._entries[source] = entry
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, (old_dist, old_pred) = self._entries.popitem(last=False)
+                self._bytes -= old_dist.nbytes + old_pred.nbytes
+                self.evictions += 1
+
+        return entry
+
+    def distance(self, start, end):
+        """
+        Повертає довжину найкоротшого шляху між станціями.
+
+        Args:
+            start (str): Початкова станція
+            end (str): Кінцева станція
+
+        Returns:
+            float: Відстань (inf - недосяжно)
+        """
+        dist, _ = self.tree(start)
+        return float(dist[self._csr.index[end]])
+
+    def shortest_path(self, start, end):
+        """
+        Знаходить найкоротший шлях між станціями.
+
+        Args:
+            start (str): Початкова станція
+            end (str): Кінцева станція
+
+        Returns:
+            tuple: (шлях або None, відстань)
+        """
+        dist, pred = self.tree(start)
+        index = self._csr.index
+        path = reconstruct_path_csr(pred, index[start], index[end])
+        if path is None:
+            return None, float('infinity')
+        nodes = self._csr.nodes
+        return [nodes[i] for i in path], float(dist[index[end]])
+
+    def stats(self):
+        """
+        Повертає статистику кешу.
+
+        Returns:
+            dict: Лічильники, кількість дерев і зайняті байти
+        """
+        requests = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / requests if requests else 0.0,
+            'evictions': self.evictions,
+            'invalidations': self.invalidations,
+            'entries': len(self._entries),
+            'bytes': self._bytes,
+            'max_bytes': self.max_bytes
+        }
@@ -0,0 +1,393 @@
+"""
+Потокове завантаження великих списків ребер і станцій (CSV / Parquet).
+
+Експорт з GTFS містить мільйони рядків, тому граф NetworkX (словник
+атрибутів на кожне ребро) для нього не будується. Файли читаються
+частинами по chunk_rows рядків:
+
+- назви станцій інтернуються в цілі номери під час читання: pd.factorize
+  знаходить унікальні назви частини, і лише вони проходять через словник;
+- ваги (час подорожі) рахуються для всієї частини одразу за тими самими
+  правилами, що й apply_travel_time_weights у task3.py;
+- з накопичених масивів будується CSRGraph (csr_from_edges).
+
+Parquet читається через pyarrow, якщо він встановлений; CSV - через pandas.
+"""
+
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from csr_graph import (DEFAULT_TRANSPORT_COEFFICIENT, TRANSPORT_COEFFICIENTS,
+                       TRANSPORT_TYPES, csr_from_edges)
+
+try:
+    import pyarrow.parquet as pq
+except ImportError:
+    pq = None
+
+# Кількість рядків в одній частині файлу
+DEFAULT_CHUNK_ROWS = 500_000
+
+# Вага ребра без відстані (як у apply_travel_time_weights)
+DEFAULT_EDGE_WEIGHT = 5.0
+
+# Тип транспорту ребра, для якого його не вказано
+DEFAULT_TRANSPORT_TYPE = 'bus'
+
+
+class StationIndex:
+    """
+    Інтернування назв станцій у цілі номери в порядку першої появи.
+
+    Attributes:
+        names (list): Назви станцій у порядку номерів
+        index (dict): Відображення назва → номер
+    """
+
+    def __init__(self, names=()):
+        self.names = []
+        self.index = {}
+        for name in names:
+            self.add(name)
+
+    def __len__(self):
+        return len(self.names)
+
+    def add(self, name):
+        """
+        Повертає номер станції, додаючи її, якщо вона нова.
+
+        Args:
+            name (str): Назва станції
+
+        Returns:
+            int: Номер станції
+        """
+        station_id = self.index.get(name)
+        if station_id is None:
+            station_id = len(self.names)
+            self.index[name] = station_id
+            self.names.append(name)
+        return station_id
+
+    def ids(self, names):
+        """
+        Інтернує стовпець назв станцій.
+
+        Args:
+            names (array-like): Назви станцій (стовпець частини файлу)
+
+        Returns:
+            np.ndarray: Номери станцій (int32)
+
+        Raises:
+            ValueError: Якщо серед назв є пропущені (NaN / None)
+        """
+        codes, uniques = pd.factorize(np.asarray(names, dtype=object))
+        if (codes < 0).any():
+            raise ValueError("Назва станції не може бути порожньою")
+        lookup = np.fromiter((self.add(name) for name in uniques),
+                             dtype=np.int32, count=len(uniques))
+        return lookup[codes]
+
+
+class StreamedNetwork:
+    """
+    Мережа, завантажена потоково, без графа NetworkX.
+
+    Attributes:
+        csr (CSRGraph): Граф у форматі CSR з вагами - часом подорожі
+        distances (np.ndarray): Відстань кожного ребра (NaN - не вказана)
+        transport (np.ndarray): Код типу транспорту кожного ребра (індекс у
+                                TRANSPORT_TYPES, -1 - невідомий)
+        stations (dict): Атрибути станцій (стовпець → масив у порядку номерів)
+    """
+
+    def __init__(self, csr, distances, transport, stations):
+        self.csr = csr
+        self.distances = distances
+        self.transport = transport
+        self.stations = stations
+
+    def arc_transport(self):
+        """
+        Повертає код типу транспорту для кожного запису CSR.
+
+        Returns:
+            np.ndarray: Коди типів транспорту (як csr_graph.transport_codes)
+        """
+        return self.transport[self.csr.edge_ids]
+
+
+def _as_text(values):
+    """Стовпець як рядки; пропущені та порожні значення - None."""
+    missing = values.isna()
+    text = values.astype(str)
+    missing |= text.str.strip() == ''
+    return text.astype(object).where(~missing, None)
+
+
+def iter_chunks(path, columns=None, chunk_rows=DEFAULT_CHUNK_ROWS, text_columns=()):
+    """
+    Читає таблицю частинами.
+
+    Формат визначається за розширенням: .parquet / .pq - Parquet (потрібен
+    pyarrow), інакше - CSV (зокрема стиснутий, наприклад .csv.gz).
+
+    pd.read_csv визначає тип стовпця окремо для кожної частини, тож та сама
+    станція могла б прочитатися і як число 3, і як рядок '3'. Стовпці
+    text_columns тому завжди повертаються рядками (пропуски - None).
+
+    Args:
+        path (str): Шлях до файлу
+        columns (list): Стовпці, які потрібно прочитати (None - усі)
+        chunk_rows (int): Кількість рядків в одній частині
+        text_columns (tuple): Стовпці, що читаються як рядки (назви станцій)
+
+    Yields:
+        pd.DataFrame: Частина таблиці
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension in ('.parquet', '.pq'):
+        if pq is None:
+            raise ImportError("Для читання Parquet потрібен пакет pyarrow")
+        parquet_file = pq.ParquetFile(path)
+        chunks = (batch.to_pandas()
+                  for batch in parquet_file.iter_batches(batch_size=chunk_rows, columns=columns))
+    else:
+        chunks = pd.read_csv(path, usecols=columns, chunksize=chunk_rows,
+                             dtype={column: str for column in text_columns})
+
+    for chunk in chunks:
+        for column in text_columns:
+            if column in chunk:
+                chunk[column] = _as_text(chunk[column])
+        yield chunk
+
+
+def travel_time_weights(distances, transport_types, coefficients=None,
+                        default_coefficient=DEFAULT_TRANSPORT_COEFFICIENT):
+    """
+    Обчислює час подорожі для масиву ребер.
+
+    Правила ті самі, що в apply_travel_time_weights: вага = відстань x
+    коефіцієнт типу транспорту; тип не вказано - 'bus'; тип невідомий -
+    default_coefficient; відстань не вказано - DEFAULT_EDGE_WEIGHT.
+
+    Args:
+        distances (array-like): Відстані ребер (NaN - не вказана)
+        transport_types (array-like): Типи транспорту (None/NaN - не вказано)
+        coefficients (dict): Коефіцієнти за типом (за замовчуванням
+                             TRANSPORT_COEFFICIENTS)
+        default_coefficient (float): Коефіцієнт невідомого типу
+
+    Returns:
+        np.ndarray: Ваги ребер
+    """
+    if coefficients is None:
+        coefficients = TRANSPORT_COEFFICIENTS
+
+    distances = np.asarray(distances, dtype=np.float64)
+    types = pd.Series(transport_types, dtype=object).fillna(DEFAULT_TRANSPORT_TYPE)
+    codes, uniques = pd.factorize(types)
+    lookup = np.array([coefficients.get(name, default_coefficient) for name in uniques],
+                      dtype=np.float64)
+
+    weights = distances * lookup[codes]
+    weights[np.isnan(distances)] = DEFAULT_EDGE_WEIGHT
+    return weights
+
+
+def load_stations(path, station_index=None, name_column='station',
+                  chunk_rows=DEFAULT_CHUNK_ROWS):
+    """
+    Потоково читає таблицю станцій.
+
+    Args:
+        path (str): Шлях до файлу станцій
+        station_index (StationIndex): Індекс, у який додаються станції
+        name_column (str): Стовпець з назвою станції
+        chunk_rows (int): Кількість рядків в одній частині
+
+    Returns:
+        tuple: (StationIndex, атрибути: стовпець → масив у порядку номерів;
+                числові стовпці - float з NaN для відсутніх значень)
+
+    Raises:
+        ValueError: Якщо в рядках файлу станцій немає назви
+    """
+    if station_index is None:
+        station_index = StationIndex()
+
+    id_chunks = []
+    column_chunks = {}
+    for chunk in iter_chunks(path, chunk_rows=chunk_rows, text_columns=(name_column,)):
+        missing = int(chunk[name_column].isna().sum())
+        if missing:
+            raise ValueError(f"У файлі станцій {path} є рядки без назви станції: {missing}")
+        id_chunks.append(station_index.ids(chunk[name_column].to_numpy()))
+        for column in chunk.columns:
+            if column != name_column:
+                column_chunks.setdefault(column, []).append(chunk[column].to_numpy())
+
+    ids = np.concatenate(id_chunks) if id_chunks else np.empty(0, dtype=np.int32)
+    attributes = {}
+    for column, chunks in column_chunks.items():
+        values = np.concatenate(chunks)
+        if values.dtype.kind in 'iuf':
+            column_values = np.full(len(station_index), np.nan)
+        else:
+            column_values = np.full(len(station_index), None, dtype=object)
+        # Для повторних рядків тієї самої станції діє останній
+        column_values[ids] = values
+        attributes[column] = column_values
+
+    return station_index, attributes
+
+
+def _extend_attributes(attributes, size):
+    """Доповнює атрибути станцій, що з'явилися лише у файлі ребер."""
+    for column, values in attributes.items():
+        if len(values) < size:
+            fill = np.nan if values.dtype.kind == 'f' else None
+            extra = np.full(size - len(values), fill, dtype=values.dtype)
+            attributes[column] = np.concatenate([values, extra])
+
+
+def deduplicate_edges(sources, targets, weights):
+    """
+    Залишає одне ребро на пару станцій - з найменшою вагою - і прибирає петлі.
+
+    Args:
+        sources (np.ndarray): Номери початкових станцій ребер
+        targets (np.ndarray): Номери кінцевих станцій ребер
+        weights (np.ndarray): Ваги ребер
+
+    Returns:
+        np.ndarray: Номери рядків, що залишаються (у порядку файлу)
+    """
+    low = np.minimum(sources, targets).astype(np.int64)
+    high = np.maximum(sources, targets).astype(np.int64)
+    keys = low * (int(high.max(initial=0)) + 1) + high
+    order = np.lexsort((weights, keys))
+    first = np.ones(len(order), dtype=bool)
+    first[1:] = keys[order][1:] != keys[order][:-1]
+    keep = order[first]
+    keep = keep[low[keep] != high[keep]]
+    return np.sort(keep)
+
+
+def load_network(edges_path, stations_path=None, chunk_rows=DEFAULT_CHUNK_ROWS,
+                 coefficients=None, source_column='source', target_column='target',
+                 distance_column='distance', transport_column='transport_type',
+                 station_column='station'):
+    """
+    Потоково завантажує мережу з файлів ребер і (необов'язково) станцій.
+
+    Номери станцій відповідають порядку файлу станцій, далі - порядку
+    першої появи у файлі ребер. Як і nx.Graph, мережа неорієнтована і без
+    кратних ребер: з повторів пари станцій залишається найшвидше ребро,
+    петлі відкидаються. Рядки ребер без початкової чи кінцевої станції
+    пропускаються; кожен з цих випадків окремо рахується в статистиці.
+
+    Args:
+        edges_path (str): Файл ребер (CSV або Parquet)
+        stations_path (str): Файл станцій; стовпці x / y стають координатами CSR
+        chunk_rows (int): Кількість рядків в одній частині
+        coefficients (dict): Коефіцієнти типів транспорту (за замовчуванням
+                             TRANSPORT_COEFFICIENTS)
+        source_column (str): Стовпець початкової станції ребра
+        target_column (str): Стовпець кінцевої станції ребра
+        distance_column (str): Стовпець відстані (км)
+        transport_column (str): Стовпець типу транспорту
+        station_column (str): Стовпець назви у файлі станцій
+
+    Returns:
+        tuple: (StreamedNetwork, статистика завантаження: rows, chunks,
+                stations, edges, missing_station_rows, self_loops_dropped,
+                duplicates_dropped, execution_time)
+    """
+    start_time = time.perf_counter()
+
+    station_index = StationIndex()
+    stations = {}
+    if stations_path is not None:
+        station_index, stations = load_stations(stations_path, station_index,
+                                                name_column=station_column,
+                                                chunk_rows=chunk_rows)
+
+    type_lookup = {name: code for code, name in enumerate(TRANSPORT_TYPES)}
+    sources, targets, distances, weights, transport = [], [], [], [], []
+    rows = 0
+    chunks = 0
+    missing_rows = 0
+
+    for chunk in iter_chunks(edges_path, chunk_rows=chunk_rows,
+                             text_columns=(source_column, target_column)):
+        chunks += 1
+        rows += len(chunk)
+        missing = chunk[source_column].isna() | chunk[target_column].isna()
+        if missing.any():
+            missing_rows += int(missing.sum())
+            chunk = chunk[~missing]
+        sources.append(station_index.ids(chunk[source_column].to_numpy()))
+        targets.append(station_index.ids(chunk[target_column].to_numpy()))
+
+        if distance_column in chunk:
+            chunk_distances = pd.to_numeric(chunk[distance_column]).to_numpy(dtype=np.float64)
+        else:
+            chunk_distances = np.full(len(chunk), np.nan)
+        if transport_column in chunk:
+            chunk_types = chunk[transport_column].to_numpy(dtype=object)
+        else:
+            chunk_types = np.full(len(chunk), None, dtype=object)
+
+        distances.append(chunk_distances)
+        weights.append(travel_time_weights(chunk_distances, chunk_types, coefficients))
+
+        # Коди типів транспорту - через унікальні значення частини
+        codes, uniques = pd.factorize(pd.Series(chunk_types, dtype=object))
+        lookup = np.array([type_lookup.get(name, -1) for name in uniques] + [-1],
+                          dtype=np.int16)
+        transport.append(lookup[codes])
+
+    def joined(parts, dtype):
+        return np.concatenate(parts) if parts else np.empty(0, dtype=dtype)
+
+    sources = joined(sources, np.int32)
+    targets = joined(targets, np.int32)
+    distances = joined(distances, np.float64)
+    weights = joined(weights, np.float64)
+    transport = joined(transport, np.int16)
+
+    self_loops = int(np.count_nonzero(sources == targets))
+    keep = deduplicate_edges(sources, targets, weights)
+    duplicates = len(sources) - self_loops - len(keep)
+    sources, targets = sources[keep], targets[keep]
+    distances, weights, transport = distances[keep], weights[keep], transport[keep]
+
+    num_stations = len(station_index)
+    _extend_attributes(stations, num_stations)
+    coords = None
+    if 'x' in stations and 'y' in stations:
+        coords = np.column_stack([stations['x'], stations['y']]).astype(np.float64)
+
+    csr = csr_from_edges(station_index.names, sources, targets, weights, coords=coords)
+
+    end_time = time.perf_counter()
+
+    stats = {
+        'rows': rows,
+        'chunks': chunks,
+        'stations': num_stations,
+        'edges': len(keep),
+        'missing_station_rows': missing_rows,
+        'self_loops_dropped': self_loops,
+        'duplicates_dropped': duplicates,
+        'execution_time': end_time - start_time
+    }
+
+    return StreamedNetwork(csr, distances, transport, stations), stats
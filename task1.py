@@ -8,7 +8,10 @@
 import networkx as nx
 import matplotlib.pyplot as plt
 import numpy as np
-from collections import Counter
+
+from centrality import compute_centrality
+from csr_graph import build_csr_graph
+from graph_metrics import connected_components_csr, eccentricity_summary, ifub_diameter
 
 def create_city_transport_network():
     """
@@ -21,31 +24,32 @@ def create_city_transport_network():
     G = nx.Graph()
     
     # Визначаємо станції/зупинки в різних районах міста
+    # Координати x, y - км на схід та на північ від Центральної площі
     stations = {
         # Центральний район
-        'Центральна площа': {'district': 'Центр', 'type': 'metro', 'population': 50000},
-        'Театральна': {'district': 'Центр', 'type': 'metro', 'population': 30000},
-        'Університет': {'district': 'Центр', 'type': 'metro', 'population': 40000},
+        'Центральна площа': {'district': 'Центр', 'type': 'metro', 'population': 50000, 'x': 0.0, 'y': 0.0},
+        'Театральна': {'district': 'Центр', 'type': 'metro', 'population': 30000, 'x': -1.2, 'y': 1.2},
+        'Університет': {'district': 'Центр', 'type': 'metro', 'population': 40000, 'x': 0.5, 'y': 1.6},
         
         # Північний район
-        'Північний вокзал': {'district': 'Північ', 'type': 'train', 'population': 35000},
-        'Озерна': {'district': 'Північ', 'type': 'bus', 'population': 25000},
-        'Лісопарк': {'district': 'Північ', 'type': 'bus', 'population': 15000},
+        'Північний вокзал': {'district': 'Північ', 'type': 'train', 'population': 35000, 'x': 0.5, 'y': 4.3},
+        'Озерна': {'district': 'Північ', 'type': 'bus', 'population': 25000, 'x': -1.5, 'y': 6.5},
+        'Лісопарк': {'district': 'Північ', 'type': 'bus', 'population': 15000, 'x': 0.8, 'y': 7.5},
         
         # Східний район
-        'Промислова': {'district': 'Схід', 'type': 'metro', 'population': 45000},
-        'Заводська': {'district': 'Схід', 'type': 'bus', 'population': 20000},
-        'Нова забудова': {'district': 'Схід', 'type': 'bus', 'population': 30000},
+        'Промислова': {'district': 'Схід', 'type': 'metro', 'population': 45000, 'x': 4.5, 'y': -1.0},
+        'Заводська': {'district': 'Схід', 'type': 'bus', 'population': 20000, 'x': 4.5, 'y': -3.1},
+        'Нова забудова': {'district': 'Схід', 'type': 'bus', 'population': 30000, 'x': 6.0, 'y': -3.5},
         
         # Західний район
-        'Аеропорт': {'district': 'Захід', 'type': 'train', 'population': 25000},
-        'Торговий центр': {'district': 'Захід', 'type': 'metro', 'population': 40000},
-        'Спортивний комплекс': {'district': 'Захід', 'type': 'bus', 'population': 20000},
+        'Аеропорт': {'district': 'Захід', 'type': 'train', 'population': 25000, 'x': -9.0, 'y': 6.5},
+        'Торговий центр': {'district': 'Захід', 'type': 'metro', 'population': 40000, 'x': -5.8, 'y': 0.8},
+        'Спортивний комплекс': {'district': 'Захід', 'type': 'bus', 'population': 20000, 'x': -6.5, 'y': 3.2},
         
         # Південний район
-        'Річковий порт': {'district': 'Південь', 'type': 'train', 'population': 30000},
-        'Ринок': {'district': 'Південь', 'type': 'bus', 'population': 35000},
-        'Житловий масив': {'district': 'Південь', 'type': 'bus', 'population': 40000}
+        'Річковий порт': {'district': 'Південь', 'type': 'train', 'population': 30000, 'x': -1.0, 'y': -7.0},
+        'Ринок': {'district': 'Південь', 'type': 'bus', 'population': 35000, 'x': 0.8, 'y': -7.6},
+        'Житловий масив': {'district': 'Південь', 'type': 'bus', 'population': 40000, 'x': 3.0, 'y': -7.6}
     }
     
     # Додаємо вершини до графа
@@ -214,12 +218,33 @@ def visualize_graph(G):
     plt.tight_layout()
     plt.show()
 
-def analyze_graph_characteristics(G):
+def _group_codes(values):
+    """
+    Кодує значення категорії цілими числами для групових сум np.bincount.
+    
+    Args:
+        values (list): Значення атрибута (для кожної вершини або ребра)
+        
+    Returns:
+        tuple: (категорії в порядку першої появи, масив кодів)
+    """
+    categories, first_seen, codes = np.unique(np.asarray(values), return_index=True,
+                                              return_inverse=True)
+    order = np.argsort(first_seen)
+    remap = np.empty(len(categories), dtype=np.intp)
+    remap[order] = np.arange(len(categories))
+    return categories[order].tolist(), remap[codes.ravel()]
+
+def analyze_graph_characteristics(G, mode='exact', k=None, workers=1):
     """
     Аналізує основні характеристики графа.
     
     Args:
         G (nx.Graph): Граф для аналізу
+        mode (str): Обчислення центральності: 'exact' - точне,
+                    'approx' - за k випадковими опорними вершинами
+        k (int): Кількість опорних вершин для режиму 'approx'
+        workers (int): Кількість процесів для обчислення центральності
     """
     print("🔍 АНАЛІЗ ХАРАКТЕРИСТИК ТРАНСПОРТНОЇ МЕРЕЖІ")
     print("=" * 60)
@@ -227,12 +252,25 @@ def analyze_graph_characteristics(G):
     # Основні характеристики
     num_nodes = G.number_of_nodes()
     num_edges = G.number_of_edges()
+    density = nx.density(G)
+    
+    # Центральність і метрики відстаней. У точному режимі прохід Брандеса
+    # з кожної вершини (centrality.py) дає і посередництво, і близькість, і
+    # ексцентриситети; у наближеному - лише зв'язність і діаметр iFUB
+    csr = build_csr_graph(G)
+    centrality = compute_centrality(G, mode=mode, k=k, workers=workers, csr=csr)
+    if mode == 'exact':
+        metrics = eccentricity_summary(centrality['eccentricity'])
+        is_connected = metrics['is_connected']
+    else:
+        metrics = None
+        is_connected = connected_components_csr(csr)[1] == 1
     
     print(f"📊 Основні характеристики:")
     print(f"   • Кількість станцій (вершин): {num_nodes}")
     print(f"   • Кількість з'єднань (ребер): {num_edges}")
-    print(f"   • Щільність графа: {nx.density(G):.3f}")
-    print(f"   • Чи є граф зв'язним: {'Так' if nx.is_connected(G) else 'Ні'}")
+    print(f"   • Щільність графа: {density:.3f}")
+    print(f"   • Чи є граф зв'язним: {'Так' if is_connected else 'Ні'}")
     
     # Аналіз ступенів вершин
     degrees = dict(G.degree())
@@ -251,74 +289,74 @@ def analyze_graph_characteristics(G):
     for i, (station, degree) in enumerate(top_connected, 1):
         print(f"     {i}. {station}: {degree} з'єднань")
     
-    # Аналіз за районами
+    # Аналіз за районами: колонки атрибутів вершин і групові суми np.bincount
+    degree_array = np.fromiter(degrees.values(), dtype=np.int64, count=num_nodes)
     print(f"\n🏘️  Аналіз за районами:")
-    districts = {}
-    for node in G.nodes():
-        district = G.nodes[node]['district']
-        if district not in districts:
-            districts[district] = []
-        districts[district].append(node)
-    
-    for district, stations in districts.items():
-        district_population = sum(G.nodes[station]['population'] for station in stations)
-        avg_connections = sum(degrees[station] for station in stations) / len(stations)
+    districts, district_codes = _group_codes([data['district'] for _, data in G.nodes(data=True)])
+    populations = np.fromiter((data['population'] for _, data in G.nodes(data=True)),
+                              dtype=np.float64, count=num_nodes)
+    district_sizes = np.bincount(district_codes, minlength=len(districts))
+    district_populations = np.bincount(district_codes, weights=populations, minlength=len(districts))
+    district_degrees = np.bincount(district_codes, weights=degree_array, minlength=len(districts))
+    
+    for i, district in enumerate(districts):
         print(f"   • {district}:")
-        print(f"     - Станцій: {len(stations)}")
-        print(f"     - Населення: {district_population:,}")
-        print(f"     - Середня кількість з'єднань: {avg_connections:.1f}")
+        print(f"     - Станцій: {district_sizes[i]}")
+        print(f"     - Населення: {int(district_populations[i]):,}")
+        print(f"     - Середня кількість з'єднань: {district_degrees[i] / district_sizes[i]:.1f}")
     
     # Аналіз за типами транспорту
     print(f"\n🚊 Аналіз транспортних типів:")
-    transport_types = Counter()
-    total_distance = 0
-    
-    for edge in G.edges():
-        transport_type = G.edges[edge]['transport_type']
-        distance = G.edges[edge]['distance']
-        transport_types[transport_type] += 1
-        total_distance += distance
+    edge_data = [data for _, _, data in G.edges(data=True)]
+    transport_types, transport_codes = _group_codes([data['transport_type'] for data in edge_data])
+    transport_counts = np.bincount(transport_codes, minlength=len(transport_types))
+    total_distance = np.fromiter((data['distance'] for data in edge_data),
+                                 dtype=np.float64, count=num_edges).sum()
     
     print(f"   • Загальна довжина мережі: {total_distance:.1f} км")
-    for transport_type, count in transport_types.items():
+    for transport_type, count in zip(transport_types, transport_counts.tolist()):
         percentage = (count / num_edges) * 100
         print(f"   • {transport_type.title()}: {count} з'єднань ({percentage:.1f}%)")
     
     # Аналіз за типами станцій
     print(f"\n🚉 Аналіз типів станцій:")
-    station_types = Counter()
-    for node in G.nodes():
-        station_type = G.nodes[node]['type']
-        station_types[station_type] += 1
+    station_types, station_codes = _group_codes([data['type'] for _, data in G.nodes(data=True)])
+    station_counts = np.bincount(station_codes, minlength=len(station_types))
     
-    for station_type, count in station_types.items():
+    for station_type, count in zip(station_types, station_counts.tolist()):
         percentage = (count / num_nodes) * 100
         print(f"   • {station_type.title()}: {count} станцій ({percentage:.1f}%)")
     
-    # Центральність вершин
+    # Центральність вершин (обидві міри за один прохід, див. centrality.py)
     print(f"\n🎯 Аналіз центральності:")
+    if mode == 'approx':
+        print(f"   • Оцінка за {centrality['pivots']} опорними вершинами "
+              f"(похибка посередництва ≤ {centrality['error_bound']:.3f} з імовірністю 95%)")
     
     # Центральність за близькістю
-    closeness_centrality = nx.closeness_centrality(G)
+    closeness_centrality = centrality['closeness']
     most_central = max(closeness_centrality.keys(), key=lambda x: closeness_centrality[x])
     print(f"   • Найбільш центральна станція (за близькістю): {most_central}")
     print(f"     Значення центральності: {closeness_centrality[most_central]:.3f}")
     
     # Центральність за посередництвом
-    betweenness_centrality = nx.betweenness_centrality(G)
+    betweenness_centrality = centrality['betweenness']
     most_between = max(betweenness_centrality.keys(), key=lambda x: betweenness_centrality[x])
     print(f"   • Найважливіша станція (за посередництвом): {most_between}")
     print(f"     Значення центральності: {betweenness_centrality[most_between]:.3f}")
     
     # Діаметр графа
-    if nx.is_connected(G):
-        diameter = nx.diameter(G)
-        radius = nx.radius(G)
-        center = nx.center(G)
+    if is_connected and metrics:
+        print(f"\n📏 Геометричні характеристики:")
+        print(f"   • Діаметр графа: {metrics['diameter']} (максимальна відстань між станціями)")
+        print(f"   • Радіус графа: {metrics['radius']}")
+        print(f"   • Центр графа: {', '.join(metrics['center'])}")
+    elif is_connected:
+        diameter, diameter_stats = ifub_diameter(G, csr=csr)
         print(f"\n📏 Геометричні характеристики:")
-        print(f"   • Діаметр графа: {diameter} (максимальна відстань між станціями)")
-        print(f"   • Радіус графа: {radius}")
-        print(f"   • Центр графа: {', '.join(center)}")
+        print(f"   • Діаметр графа: {diameter} (iFUB, {diameter_stats['bfs_runs']} BFS)")
+        print(f"   • Радіус і центр графа: не обчислюються в наближеному режимі "
+              f"(потрібні ексцентриситети всіх вершин, mode='exact')")
     
     # Кластеризація
     clustering_coefficient = nx.average_clustering(G)
@@ -327,8 +365,8 @@ def analyze_graph_characteristics(G):
     return {
         'num_nodes': num_nodes,
         'num_edges': num_edges,
-        'density': nx.density(G),
-        'is_connected': nx.is_connected(G),
+        'density': density,
+        'is_connected': is_connected,
         'avg_degree': avg_degree,
         'most_central': most_central,
         'clustering': clustering_coefficient
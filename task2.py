@@ -10,6 +10,9 @@ import matplotlib.pyplot as plt
 from collections import deque, defaultdict
 import time
 
+from csr_graph import build_csr_graph, dijkstra_csr
+from graph_cache import load_graph_cached
+
 def load_graph():
     """
     Завантажує граф з файлу або створює новий, якщо файл не знайдено.
@@ -18,7 +21,8 @@ def load_graph():
         nx.Graph: Граф транспортної мережі
     """
     try:
-        G = nx.read_gml("city_transport_network.gml")
+        # Бінарний знімок графа перебудовується лише після зміни GML-файлу
+        G = load_graph_cached("city_transport_network.gml")
         print("✅ Граф завантажено з файлу 'city_transport_network.gml'")
         return G
     except FileNotFoundError:
@@ -33,31 +37,138 @@ def dfs_paths(graph, start, end, path=None):
     """
     Пошук усіх шляхів від початкової до кінцевої вершини за допомогою DFS.
     
+    Обхід виконується з явним стеком ітераторів сусідів, тому довгі
+    ланцюжки станцій не впираються в обмеження глибини рекурсії. Поточний
+    шлях - один спільний список, а перевірка "вершина вже на шляху"
+    виконується через множину за O(1).
+    
+    Args:
+        graph (nx.Graph): Граф для пошуку
+        start (str): Початкова вершина
+        end (str): Кінцева вершина
+        path (list): Префікс шляху, вершини якого не можна відвідувати
+        
+    Yields:
+        list: Знайдені шляхи
+    """
+    yield from simple_paths(graph, start, end, path=path)
+
+def _hop_distances(graph, target):
+    hops = {target: 0}
+    queue = deque([target])
+    while queue:
+        current = queue.popleft()
+        for neighbor in graph.neighbors(current):
+            if neighbor not in hops:
+                hops[neighbor] = hops[current] + 1
+                queue.append(neighbor)
+    return hops
+
+def _weighted_distances(graph, target, weight):
+    csr = build_csr_graph(graph, weight=weight)
+    distances, _, _ = dijkstra_csr(csr, csr.index[target])
+    return {node: d for node, d in zip(csr.nodes, distances.tolist()) if d != float('inf')}
+
+# Допуск на похибку округлення: нижня оцінка ваги та вага шляху
+# додаються в різному порядку
+_WEIGHT_TOLERANCE = 1e-9
+
+def simple_paths(graph, start, end, path=None, max_hops=None, max_weight=None,
+                 max_paths=None, time_budget=None, weight='weight'):
+    """
+    Лінивий перебір простих шляхів з обмеженнями (DFS з явним стеком).
+    
+    Перед обходом обчислюються відстані до кінцевої вершини: кількість
+    ребер (BFS) для max_hops та зважена відстань (Дейкстра) для max_weight.
+    Гілка відсікається, щойно пройдене плюс ця нижня оцінка перевищує
+    обмеження, тож тупикові напрямки не досліджуються. Генератор можна
+    зупинити в будь-який момент.
+    
     Args:
         graph (nx.Graph): Граф для пошуку
         start (str): Початкова вершина
         end (str): Кінцева вершина
-        path (list): Поточний шлях (для рекурсії)
+        path (list): Префікс шляху, вершини якого не можна відвідувати
+                     (не враховується в обмеженнях)
+        max_hops (int): Максимальна кількість ребер у шляху
+        max_weight (float): Максимальна сумарна вага шляху
+        max_paths (int): Максимальна кількість шляхів
+        time_budget (float): Ліміт часу в секундах від першого звернення
+                             до генератора (включно з підготовкою)
+        weight (str): Атрибут ваги ребра (відсутній атрибут - вага 1)
         
     Yields:
         list: Знайдені шляхи
     """
-    if path is None:
-        path = []
+    deadline = None if time_budget is None else time.perf_counter() + time_budget
     
-    path = path + [start]
+    path = list(path) if path else []
+    prefix_length = len(path)
+    path.append(start)
+    on_path = set(path)
     
+    if max_paths is not None and max_paths <= 0:
+        return
     if start == end:
-        yield path
-    else:
-        for neighbor in graph.neighbors(start):
-            if neighbor not in path:  # Уникаємо циклів
-                yield from dfs_paths(graph, neighbor, end, path)
+        yield list(path)
+        return
+    
+    hops_left = None if max_hops is None else _hop_distances(graph, end)
+    weight_left = None if max_weight is None else _weighted_distances(graph, end, weight)
+    if hops_left is not None and hops_left.get(start, max_hops + 1) > max_hops:
+        return
+    if weight_left is not None and weight_left.get(start, float('inf')) > max_weight + _WEIGHT_TOLERANCE:
+        return
+    
+    costs = [0.0]  # Вага пройденої частини шляху для кожного рівня стеку
+    found = 0
+    stack = [iter(graph.neighbors(start))]
+    
+    while stack:
+        if deadline is not None and time.perf_counter() > deadline:
+            return
+        
+        for neighbor in stack[-1]:
+            if neighbor in on_path:  # Уникаємо циклів
+                continue
+            
+            if hops_left is not None:
+                remaining = hops_left.get(neighbor)
+                if remaining is None or len(path) - prefix_length + remaining > max_hops:
+                    continue
+            if weight_left is not None:
+                cost = costs[-1] + graph[path[-1]][neighbor].get(weight, 1.0)
+                remaining = weight_left.get(neighbor)
+                if remaining is None or cost + remaining > max_weight + _WEIGHT_TOLERANCE:
+                    continue
+            else:
+                cost = 0.0
+            
+            if neighbor == end:
+                yield path + [neighbor]
+                found += 1
+                if found == max_paths:
+                    return
+                continue
+            
+            path.append(neighbor)
+            on_path.add(neighbor)
+            costs.append(cost)
+            stack.append(iter(graph.neighbors(neighbor)))
+            break
+        else:
+            # Сусіди вичерпано - повертаємося на крок назад
+            stack.pop()
+            costs.pop()
+            on_path.discard(path.pop())
 
 def dfs_single_path(graph, start, end):
     """
     Знаходить один шлях за допомогою DFS з детальним логуванням.
     
+    Використовує явний стек замість рекурсії; порядок відвідування
+    такий самий, як у рекурсивного обходу.
+    
     Args:
         graph (nx.Graph): Граф для пошуку
         start (str): Початкова вершина
@@ -70,27 +181,33 @@ def dfs_single_path(graph, start, end):
     path = []
     visit_order = []
     
-    def dfs_recursive(node, target, current_path):
+    def visit(node):
         visited.add(node)
         visit_order.append(node)
-        current_path.append(node)
+        path.append(node)
         
-        if node == target:
+        if node == end:
             return True
         
         # Сортуємо сусідів для детермінованого результату
-        neighbors = sorted(graph.neighbors(node))
-        for neighbor in neighbors:
-            if neighbor not in visited:
-                if dfs_recursive(neighbor, target, current_path):
-                    return True
-        
-        current_path.pop()  # Backtrack
+        stack.append(iter(sorted(graph.neighbors(node))))
         return False
     
-    start_time = time.time()
-    found = dfs_recursive(start, end, path)
-    end_time = time.time()
+    start_time = time.perf_counter()
+    
+    stack = []
+    found = visit(start)
+    
+    while stack and not found:
+        for neighbor in stack[-1]:
+            if neighbor not in visited:
+                found = visit(neighbor)
+                break
+        else:
+            stack.pop()
+            path.pop()  # Backtrack
+    
+    end_time = time.perf_counter()
     
     stats = {
         'found': found,
@@ -106,6 +223,9 @@ def bfs_single_path(graph, start, end):
     """
     Знаходить найкоротший шлях за допомогою BFS з детальним логуванням.
     
+    У черзі зберігаються лише вершини, а для кожної відкритої вершини -
+    її батько; шлях відновлюється один раз наприкінці.
+    
     Args:
         graph (nx.Graph): Граф для пошуку
         start (str): Початкова вершина
@@ -117,46 +237,117 @@ def bfs_single_path(graph, start, end):
     if start == end:
         return [start], [start], {'found': True, 'path_length': 1, 'nodes_visited': 1, 'execution_time': 0, 'algorithm': 'BFS'}
     
-    visited = set([start])
-    queue = deque([(start, [start])])
+    parent = {start: None}
+    queue = deque([start])
     visit_order = [start]
+    found = False
     
-    start_time = time.time()
+    start_time = time.perf_counter()
     
-    while queue:
-        current, path = queue.popleft()
+    while queue and not found:
+        current = queue.popleft()
         
-        # Сортуємо сусідів для детермінованого результату
-        neighbors = sorted(graph.neighbors(current))
-        for neighbor in neighbors:
-            if neighbor not in visited:
-                visited.add(neighbor)
+        for neighbor in sorted(graph.neighbors(current)):
+            if neighbor not in parent:
+                parent[neighbor] = current
                 visit_order.append(neighbor)
-                new_path = path + [neighbor]
                 
                 if neighbor == end:
-                    end_time = time.time()
-                    stats = {
-                        'found': True,
-                        'path_length': len(new_path),
-                        'nodes_visited': len(visit_order),
-                        'execution_time': end_time - start_time,
-                        'algorithm': 'BFS'
-                    }
-                    return new_path, visit_order, stats
+                    found = True
+                    break
                 
-                queue.append((neighbor, new_path))
+                queue.append(neighbor)
+    
+    path = _path_from_parents(parent, end) if found else None
+    end_time = time.perf_counter()
     
-    end_time = time.time()
     stats = {
-        'found': False,
-        'path_length': 0,
+        'found': found,
+        'path_length': len(path) if found else 0,
         'nodes_visited': len(visit_order),
         'execution_time': end_time - start_time,
         'algorithm': 'BFS'
     }
     
-    return None, visit_order, stats
+    return path, visit_order, stats
+
+def _path_from_parents(parent, end):
+    path = []
+    node = end
+    while node is not None:
+        path.append(node)
+        node = parent[node]
+    path.reverse()
+    return path
+
+def bidirectional_bfs_path(graph, start, end):
+    """
+    Знаходить шлях з найменшою кількістю пересадок двонаправленим BFS.
+    
+    Пошук ведеться одночасно від початкової та кінцевої вершин; щоразу
+    розширюється повний рівень меншого з двох фронтів. Коли фронти
+    зустрічаються, серед вершин зустрічі обирається та, що дає
+    найкоротший шлях.
+    
+    Args:
+        graph (nx.Graph): Граф для пошуку
+        start (str): Початкова вершина
+        end (str): Кінцева вершина
+        
+    Returns:
+        tuple: (шлях, порядок відвідування, статистика)
+    """
+    if start == end:
+        return [start], [start], {'found': True, 'path_length': 1, 'nodes_visited': 1, 'execution_time': 0, 'algorithm': 'BiBFS'}
+    
+    parents = ({start: None}, {end: None})
+    depths = ({start: 0}, {end: 0})
+    frontiers = ([start], [end])
+    visit_order = [start, end]
+    meeting = None
+    
+    start_time = time.perf_counter()
+    
+    while frontiers[0] and frontiers[1] and meeting is None:
+        side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+        parent, depth = parents[side], depths[side]
+        other_depth = depths[1 - side]
+        best_length = None
+        next_frontier = []
+        
+        for current in frontiers[side]:
+            for neighbor in sorted(graph.neighbors(current)):
+                if neighbor in parent:
+                    continue
+                parent[neighbor] = current
+                depth[neighbor] = depth[current] + 1
+                visit_order.append(neighbor)
+                next_frontier.append(neighbor)
+                
+                if neighbor in other_depth:
+                    length = depth[neighbor] + other_depth[neighbor]
+                    if best_length is None or length < best_length:
+                        best_length = length
+                        meeting = neighbor
+        
+        frontiers = (next_frontier, frontiers[1]) if side == 0 else (frontiers[0], next_frontier)
+    
+    if meeting is not None:
+        path = _path_from_parents(parents[0], meeting)
+        path.extend(reversed(_path_from_parents(parents[1], meeting)[:-1]))
+    else:
+        path = None
+    end_time = time.perf_counter()
+    
+    stats = {
+        'found': path is not None,
+        'path_length': len(path) if path else 0,
+        'nodes_visited': len(visit_order),
+        'execution_time': end_time - start_time,
+        'algorithm': 'BiBFS'
+    }
+    
+    return path, visit_order, stats
 
 def visualize_path_comparison(graph, start, end, dfs_path, bfs_path, dfs_visit_order, bfs_visit_order):
     """
@@ -241,7 +432,8 @@ def visualize_path_comparison(graph, start, end, dfs_path, bfs_path, dfs_visit_o
     plt.tight_layout()
     plt.show()
 
-def analyze_algorithms_comparison(dfs_stats, bfs_stats, dfs_path, bfs_path):
+def analyze_algorithms_comparison(dfs_stats, bfs_stats, dfs_path, bfs_path,
+                                  bibfs_stats=None, bibfs_path=None):
     """
     Аналізує та порівнює результати алгоритмів DFS та BFS.
     
@@ -250,6 +442,8 @@ def analyze_algorithms_comparison(dfs_stats, bfs_stats, dfs_path, bfs_path):
         bfs_stats (dict): Статистика BFS
         dfs_path (list): Шлях DFS
         bfs_path (list): Шлях BFS
+        bibfs_stats (dict): Статистика двонаправленого BFS (необов'язково)
+        bibfs_path (list): Шлях двонаправленого BFS (необов'язково)
     """
     print("\n" + "="*70)
     print("📊 ПОРІВНЯЛЬНИЙ АНАЛІЗ АЛГОРИТМІВ DFS ТА BFS")
@@ -266,6 +460,10 @@ def analyze_algorithms_comparison(dfs_stats, bfs_stats, dfs_path, bfs_path):
           f"{dfs_stats['path_length']:<15} {dfs_stats['nodes_visited']:<15} {dfs_time_ms:.3f}")
     print(f"{'BFS':<10} {'Так' if bfs_stats['found'] else 'Ні':<10} "
           f"{bfs_stats['path_length']:<15} {bfs_stats['nodes_visited']:<15} {bfs_time_ms:.3f}")
+    if bibfs_stats is not None:
+        bibfs_time_ms = bibfs_stats['execution_time'] * 1000
+        print(f"{'BiBFS':<10} {'Так' if bibfs_stats['found'] else 'Ні':<10} "
+              f"{bibfs_stats['path_length']:<15} {bibfs_stats['nodes_visited']:<15} {bibfs_time_ms:.3f}")
     
     print(f"\n📈 Детальне порівняння:")
     
@@ -300,6 +498,13 @@ def analyze_algorithms_comparison(dfs_stats, bfs_stats, dfs_path, bfs_path):
         else:
             print(f"   • Швидкість: Приблизно однакова")
     
+    if bibfs_stats is not None and bibfs_stats['found'] and bfs_stats['found']:
+        diff = bfs_stats['nodes_visited'] - bibfs_stats['nodes_visited']
+        if diff > 0:
+            print(f"   • Двонаправлений BFS: відвідано на {diff} вузлів менше, ніж BFS")
+        else:
+            print(f"   • Двонаправлений BFS: відвідано на {-diff} вузлів більше, ніж BFS")
+    
     print(f"\n📝 Знайдені шляхи:")
     if dfs_path:
         print(f"   DFS: {' → '.join(dfs_path)}")
@@ -310,6 +515,12 @@ def analyze_algorithms_comparison(dfs_stats, bfs_stats, dfs_path, bfs_path):
         print(f"   BFS: {' → '.join(bfs_path)}")
     else:
         print(f"   BFS: Шлях не знайдено")
+    
+    if bibfs_stats is not None:
+        if bibfs_path:
+            print(f"   BiBFS: {' → '.join(bibfs_path)}")
+        else:
+            print(f"   BiBFS: Шлях не знайдено")
 
 def explain_algorithm_differences():
     """
@@ -458,13 +669,18 @@ def main():
     print(f"🔍 Виконуємо пошук в ширину (BFS)...")
     bfs_path, bfs_visit_order, bfs_stats = bfs_single_path(G, start_station, end_station)
     
+    # Виконуємо двонаправлений пошук BFS
+    print(f"🔍 Виконуємо двонаправлений пошук в ширину (BiBFS)...")
+    bibfs_path, _, bibfs_stats = bidirectional_bfs_path(G, start_station, end_station)
+    
     # Візуалізуємо результати
     print(f"\n📊 Візуалізація результатів...")
     visualize_path_comparison(G, start_station, end_station, 
                             dfs_path, bfs_path, dfs_visit_order, bfs_visit_order)
     
     # Аналізуємо результати
-    analyze_algorithms_comparison(dfs_stats, bfs_stats, dfs_path, bfs_path)
+    analyze_algorithms_comparison(dfs_stats, bfs_stats, dfs_path, bfs_path,
+                                  bibfs_stats, bibfs_path)
     
     # Пояснюємо відмінності
     explain_algorithm_differences()
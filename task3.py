@@ -7,42 +7,42 @@
 
 import networkx as nx
 import matplotlib.pyplot as plt
-import heapq
 import numpy as np
 import pandas as pd
-from collections import defaultdict
 import time
 
-def load_and_prepare_weighted_graph():
+from csr_graph import (build_csr_graph, dijkstra_csr, dijkstra_point_to_point_csr,
+                       bidirectional_dijkstra_csr, astar_csr, admissible_speed_factor,
+                       geographic_heuristic, TRANSPORT_COEFFICIENTS,
+                       DEFAULT_TRANSPORT_COEFFICIENT)
+from all_pairs import (all_pairs_shortest_paths, choose_all_pairs_method,
+                       many_to_many_dijkstra, ShortestPathsView, ShortestDistancesView)
+from contraction_hierarchy import ch_many_to_many
+from distance_store import save_distance_store, export_csv
+from graph_cache import load_graph_cached
+from k_shortest_paths import k_shortest_paths
+from route_cache import bump_graph_version
+from time_dependent import build_time_dependent_graph, earliest_arrival
+from multimodal import build_multimodal_graph, pareto_routes
+
+def apply_travel_time_weights(G):
     """
-    Завантажує граф та додає/оновлює ваги ребер на основі відстані та типу транспорту.
+    Додає/оновлює ваги ребер на основі відстані та типу транспорту.
     
+    Args:
+        G (nx.Graph): Граф транспортної мережі
+        
     Returns:
-        nx.Graph: Граф з вагами
+        nx.Graph: Той самий граф з вагами
     """
-    try:
-        G = nx.read_gml("city_transport_network.gml")
-        print("✅ Граф завантажено з файлу")
-    except FileNotFoundError:
-        print("⚠️  Файл графа не знайдено, створюємо новий...")
-        G = create_city_transport_network()
-        nx.write_gml(G, "city_transport_network.gml")
-    
-    # Додаємо/оновлюємо ваги на основі відстані та типу транспорту
     for edge in G.edges():
         if 'distance' in G.edges[edge]:
             distance = G.edges[edge]['distance']
             transport_type = G.edges[edge].get('transport_type', 'bus')
             
-            # Коефіцієнти для різних типів транспорту (час подорожі)
-            transport_coefficients = {
-                'metro': 1.0,    # Найшвидший
-                'train': 1.2,    # Трохи повільніше через зупинки
-                'bus': 1.8       # Найповільніше через трафік
-            }
-            
             # Обчислюємо вагу як час подорожі
-            coefficient = transport_coefficients.get(transport_type, 1.5)
+            coefficient = TRANSPORT_COEFFICIENTS.get(transport_type,
+                                                     DEFAULT_TRANSPORT_COEFFICIENT)
             weight = distance * coefficient
             
             G.edges[edge]['weight'] = weight
@@ -52,6 +52,35 @@ def load_and_prepare_weighted_graph():
             G.edges[edge]['weight'] = 5.0
             G.edges[edge]['travel_time'] = 5.0
     
+    # Ваги змінено - кешовані маршрути (route_cache.py) стають застарілими
+    bump_graph_version(G)
+    
+    return G
+
+def load_and_prepare_weighted_graph():
+    """
+    Завантажує граф та додає/оновлює ваги ребер на основі відстані та типу транспорту.
+    
+    Підготовлений граф кешується в бінарному знімку (див. graph_cache.py),
+    який перебудовується лише після зміни GML-файлу або коефіцієнтів.
+    
+    Returns:
+        nx.Graph: Граф з вагами
+    """
+    # Знімок із вагами, обчисленими за іншими коефіцієнтами, застарів
+    prepare_key = repr((sorted(TRANSPORT_COEFFICIENTS.items()), DEFAULT_TRANSPORT_COEFFICIENT))
+    
+    try:
+        G = load_graph_cached("city_transport_network.gml",
+                              prepare=apply_travel_time_weights,
+                              variant='weighted', prepare_key=prepare_key)
+        print("✅ Граф завантажено з файлу")
+    except FileNotFoundError:
+        print("⚠️  Файл графа не знайдено, створюємо новий...")
+        G = create_city_transport_network()
+        nx.write_gml(G, "city_transport_network.gml")
+        G = apply_travel_time_weights(G)
+    
     return G
 
 def create_city_transport_network():
@@ -60,22 +89,23 @@ def create_city_transport_network():
     """
     G = nx.Graph()
     
+    # Координати x, y - км на схід та на північ від Центральної площі
     stations = {
-        'Центральна площа': {'district': 'Центр', 'type': 'metro', 'population': 50000},
-        'Театральна': {'district': 'Центр', 'type': 'metro', 'population': 30000},
-        'Університет': {'district': 'Центр', 'type': 'metro', 'population': 40000},
-        'Північний вокзал': {'district': 'Північ', 'type': 'train', 'population': 35000},
-        'Озерна': {'district': 'Північ', 'type': 'bus', 'population': 25000},
-        'Лісопарк': {'district': 'Північ', 'type': 'bus', 'population': 15000},
-        'Промислова': {'district': 'Схід', 'type': 'metro', 'population': 45000},
-        'Заводська': {'district': 'Схід', 'type': 'bus', 'population': 20000},
-        'Нова забудова': {'district': 'Схід', 'type': 'bus', 'population': 30000},
-        'Аеропорт': {'district': 'Захід', 'type': 'train', 'population': 25000},
-        'Торговий центр': {'district': 'Захід', 'type': 'metro', 'population': 40000},
-        'Спортивний комплекс': {'district': 'Захід', 'type': 'bus', 'population': 20000},
-        'Річковий порт': {'district': 'Південь', 'type': 'train', 'population': 30000},
-        'Ринок': {'district': 'Південь', 'type': 'bus', 'population': 35000},
-        'Житловий масив': {'district': 'Південь', 'type': 'bus', 'population': 40000}
+        'Центральна площа': {'district': 'Центр', 'type': 'metro', 'population': 50000, 'x': 0.0, 'y': 0.0},
+        'Театральна': {'district': 'Центр', 'type': 'metro', 'population': 30000, 'x': -1.2, 'y': 1.2},
+        'Університет': {'district': 'Центр', 'type': 'metro', 'population': 40000, 'x': 0.5, 'y': 1.6},
+        'Північний вокзал': {'district': 'Північ', 'type': 'train', 'population': 35000, 'x': 0.5, 'y': 4.3},
+        'Озерна': {'district': 'Північ', 'type': 'bus', 'population': 25000, 'x': -1.5, 'y': 6.5},
+        'Лісопарк': {'district': 'Північ', 'type': 'bus', 'population': 15000, 'x': 0.8, 'y': 7.5},
+        'Промислова': {'district': 'Схід', 'type': 'metro', 'population': 45000, 'x': 4.5, 'y': -1.0},
+        'Заводська': {'district': 'Схід', 'type': 'bus', 'population': 20000, 'x': 4.5, 'y': -3.1},
+        'Нова забудова': {'district': 'Схід', 'type': 'bus', 'population': 30000, 'x': 6.0, 'y': -3.5},
+        'Аеропорт': {'district': 'Захід', 'type': 'train', 'population': 25000, 'x': -9.0, 'y': 6.5},
+        'Торговий центр': {'district': 'Захід', 'type': 'metro', 'population': 40000, 'x': -5.8, 'y': 0.8},
+        'Спортивний комплекс': {'district': 'Захід', 'type': 'bus', 'population': 20000, 'x': -6.5, 'y': 3.2},
+        'Річковий порт': {'district': 'Південь', 'type': 'train', 'population': 30000, 'x': -1.0, 'y': -7.0},
+        'Ринок': {'district': 'Південь', 'type': 'bus', 'population': 35000, 'x': 0.8, 'y': -7.6},
+        'Житловий масив': {'district': 'Південь', 'type': 'bus', 'population': 40000, 'x': 3.0, 'y': -7.6}
     }
     
     for station, attributes in stations.items():
@@ -117,59 +147,31 @@ def create_city_transport_network():
     
     return G
 
-def dijkstra_algorithm(graph, start):
+def dijkstra_algorithm(graph, start, csr=None):
     """
     Реалізація алгоритму Дейкстри для пошуку найкоротших шляхів від заданої вершини.
     
+    Обчислення виконується на CSR-представленні графа (див. csr_graph.py),
+    а результати перетворюються на словники з назвами станцій.
+    
     Args:
         graph (nx.Graph): Зважений граф
         start (str): Початкова вершина
+        csr (CSRGraph): Готове CSR-представлення графа (будується, якщо не задано)
         
     Returns:
         tuple: (відстані, попередники, статистика)
     """
-    # Ініціалізація
-    distances = {node: float('infinity') for node in graph.nodes()}
-    distances[start] = 0
-    predecessors = {node: None for node in graph.nodes()}
-    visited = set()
+    if csr is None:
+        csr = build_csr_graph(graph)
     
-    # Купа для ефективного вибору наступної вершини
-    heap = [(0, start)]
-    iterations = 0
+    dist, pred, stats = dijkstra_csr(csr, csr.index[start])
     
-    start_time = time.time()
-    
-    while heap:
-        iterations += 1
-        current_distance, current = heapq.heappop(heap)
-        
-        if current in visited:
-            continue
-        
-        visited.add(current)
-        
-        # Перевіряємо всіх сусідів
-        for neighbor in graph.neighbors(current):
-            if neighbor not in visited:
-                # Отримуємо вагу ребра
-                edge_weight = graph.edges[current, neighbor]['weight']
-                new_distance = current_distance + edge_weight
-                
-                # Якщо знайшли коротший шлях
-                if new_distance < distances[neighbor]:
-                    distances[neighbor] = new_distance
-                    predecessors[neighbor] = current
-                    heapq.heappush(heap, (new_distance, neighbor))
-    
-    end_time = time.time()
-    
-    stats = {
-        'iterations': iterations,
-        'execution_time': end_time - start_time,
-        'nodes_processed': len(visited),
-        'reachable_nodes': sum(1 for d in distances.values() if d != float('infinity'))
-    }
+    # Перетворюємо масиви з цілими номерами на словники з назвами станцій
+    nodes = csr.nodes
+    distances = dict(zip(nodes, dist.tolist()))
+    predecessors = {node: nodes[p] if p >= 0 else None
+                    for node, p in zip(nodes, pred.tolist())}
     
     return distances, predecessors, stats
 
@@ -200,34 +202,151 @@ def reconstruct_path(predecessors, start, end):
     
     return path
 
-def find_all_shortest_paths(graph):
+def shortest_path(graph, start, end, method='dijkstra', csr=None):
+    """
+    Знаходить найкоротший шлях між двома вершинами без обходу всього графа.
+    
+    На відміну від dijkstra_algorithm, пошук зупиняється, щойно відстань
+    до кінцевої вершини стає остаточною.
+    
+    Args:
+        graph (nx.Graph): Зважений граф
+        start (str): Початкова вершина
+        end (str): Кінцева вершина
+        method (str): 'dijkstra' - з ранньою зупинкою,
+                      'bidirectional' - двонаправлений пошук,
+                      'astar' - A* з географічною евристикою
+        csr (CSRGraph): Готове CSR-представлення графа (будується, якщо не задано)
+        
+    Returns:
+        tuple: (шлях або None, відстань, статистика)
+    """
+    if csr is None:
+        csr = build_csr_graph(graph)
+    
+    if method == 'astar':
+        return astar_algorithm(graph, start, end, csr=csr)
+    
+    searches = {
+        'dijkstra': dijkstra_point_to_point_csr,
+        'bidirectional': bidirectional_dijkstra_csr
+    }
+    if method not in searches:
+        raise ValueError(f"Невідомий метод пошуку: {method}")
+    
+    path_ids, distance, stats = searches[method](csr, csr.index[start], csr.index[end])
+    path = [csr.nodes[i] for i in path_ids] if path_ids is not None else None
+    stats['total_nodes'] = csr.num_nodes
+    
+    return path, distance, stats
+
+def astar_algorithm(graph, start, end, csr=None, speed_factor=None):
+    """
+    Алгоритм A* для пошуку найкоротшого шляху між двома станціями.
+    
+    Евристика - пряма відстань між координатами станцій (атрибути x, y),
+    помножена на коефіцієнт швидкості. За замовчуванням коефіцієнт
+    підбирається за самим графом як мінімум відношення ваги ребра до його
+    прямої довжини; якщо довжини ребер не менші за прямі відстані, він не
+    менший за коефіцієнт найшвидшого транспорту з TRANSPORT_COEFFICIENTS.
+    Без координат пошук зводиться до алгоритму Дейкстри.
+    
+    Args:
+        graph (nx.Graph): Зважений граф
+        start (str): Початкова вершина
+        end (str): Кінцева вершина
+        csr (CSRGraph): Готове CSR-представлення графа (будується, якщо не задано)
+        speed_factor (float): Коефіцієнт евристики (обчислюється, якщо не задано)
+        
+    Returns:
+        tuple: (шлях або None, відстань, статистика)
+    """
+    if csr is None:
+        csr = build_csr_graph(graph)
+    if speed_factor is None:
+        speed_factor = admissible_speed_factor(csr)
+    
+    target = csr.index[end]
+    heuristic = geographic_heuristic(csr, target, speed_factor)
+    path_ids, distance, stats = astar_csr(csr, csr.index[start], target, heuristic)
+    
+    path = [csr.nodes[i] for i in path_ids] if path_ids is not None else None
+    stats['total_nodes'] = csr.num_nodes
+    stats['speed_factor'] = speed_factor
+    
+    return path, distance, stats
+
+def many_to_many(graph, sources, targets, csr=None, ch=None):
+    """
+    Обчислює блок матриці відстаней між наборами станцій (OD-матриця).
+    
+    Args:
+        graph (nx.Graph): Зважений граф
+        sources (list): Станції відправлення
+        targets (list): Станції призначення
+        csr (CSRGraph): Готове CSR-представлення графа (будується, якщо не задано)
+        ch (ContractionHierarchy): Ієрархія скорочень; якщо задана,
+            використовується алгоритм з кошиками замість окремих пошуків
+        
+    Returns:
+        np.ndarray: Матриця |sources| x |targets| (inf - недосяжно)
+    """
+    if ch is not None:
+        return ch_many_to_many(ch, [ch.index[s] for s in sources],
+                               [ch.index[t] for t in targets])
+    
+    if csr is None:
+        csr = build_csr_graph(graph)
+    
+    return many_to_many_dijkstra(csr, [csr.index[s] for s in sources],
+                                 [csr.index[t] for t in targets])
+
+def find_all_shortest_paths(graph, workers=1, quiet=False, progress_callback=None,
+                            method='auto'):
     """
     Знаходить найкоротші шляхи між всіма парами вершин.
     
     Args:
         graph (nx.Graph): Зважений граф
+        method (str): 'auto' (за щільністю графа), 'dijkstra' або 'floyd_warshall'
+        workers (int): Кількість процесів для Дейкстри (1 - послідовно,
+                       None - за кількістю ядер)
+        quiet (bool): Не друкувати прогрес обробки вершин
+        progress_callback (callable): Викликається як progress_callback(done, total)
         
     Returns:
-        dict: Словник з результатами для всіх пар вершин
+        tuple: (шляхи, відстані) - ліниві словники з ключами (початок, кінець).
+            Зберігаються лише матриці відстаней і попередників, а шлях
+            відновлюється під час звернення до нього.
     """
-    all_paths = {}
-    all_distances = {}
     nodes = list(graph.nodes())
     total_pairs = len(nodes) * (len(nodes) - 1)
     
-    print(f"🔄 Обчислюємо найкоротші шляхи для {total_pairs} пар вершин...")
+    if not quiet:
+        print(f"🔄 Обчислюємо найкоротші шляхи для {total_pairs} пар вершин...")
+    
+    # CSR-представлення будуємо один раз для всіх запусків
+    csr = build_csr_graph(graph)
+    if method == 'auto':
+        method = choose_all_pairs_method(csr)
+    # Послідовно вершини обробляються по порядку, тож відома і назва;
+    # паралельні пакети завершуються в довільному порядку - лише кількість
+    in_order = method == 'floyd_warshall' or workers == 1
+    
+    def report_progress(done, total):
+        if not quiet:
+            if in_order:
+                print(f"   Обробка вершини {done}/{total}: {csr.nodes[done - 1]}")
+            else:
+                print(f"   Оброблено вершин: {done}/{total}")
+        if progress_callback is not None:
+            progress_callback(done, total)
     
-    for i, start in enumerate(nodes):
-        print(f"   Обробка вершини {i+1}/{len(nodes)}: {start}")
-        
-        distances, predecessors, _ = dijkstra_algorithm(graph, start)
-        
-        for end in nodes:
-            if start != end and distances[end] != float('infinity'):
-                path = reconstruct_path(predecessors, start, end)
-                if path:
-                    all_paths[(start, end)] = path
-                    all_distances[(start, end)] = distances[end]
+    dist_matrix, pred_matrix, _ = all_pairs_shortest_paths(csr, method=method, workers=workers,
+                                                           progress_callback=report_progress)
+    
+    all_paths = ShortestPathsView(nodes, dist_matrix, pred_matrix)
+    all_distances = ShortestDistancesView(nodes, dist_matrix, pred_matrix)
     
     return all_paths, all_distances
 
@@ -336,18 +455,37 @@ def visualize_shortest_path(graph, start, end, path, distances):
     plt.tight_layout()
     plt.show()
 
-def create_distance_matrix(graph, all_distances):
+def create_distance_matrix(graph, all_distances, sources=None, targets=None):
     """
     Створює матрицю відстаней між всіма парами вершин.
     
     Args:
         graph (nx.Graph): Граф
-        all_distances (dict): Відстані між всіма парами
+        all_distances (dict | np.ndarray): Відстані між всіма парами або
+            готова матриця n x n у порядку graph.nodes()
+        sources (list): Підписи рядків блоку з many_to_many (за замовчуванням
+            усі вершини графа)
+        targets (list): Підписи стовпців блоку з many_to_many
         
     Returns:
         pd.DataFrame: Матриця відстаней
     """
     nodes = list(graph.nodes())
+    
+    # Лінивий словник з find_all_shortest_paths уже містить готову матрицю
+    if isinstance(all_distances, ShortestDistancesView):
+        all_distances = all_distances.matrix
+    
+    # Готову матрицю (наприклад, з Флойда-Воршелла або блок з many_to_many)
+    # використовуємо напряму
+    if isinstance(all_distances, np.ndarray):
+        rows = list(sources) if sources is not None else nodes
+        columns = list(targets) if targets is not None else nodes
+        if all_distances.shape != (len(rows), len(columns)):
+            raise ValueError(f"Очікується матриця {len(rows)}x{len(columns)}, "
+                             f"отримано {all_distances.shape}")
+        return pd.DataFrame(all_distances, index=rows, columns=columns)
+    
     matrix = np.full((len(nodes), len(nodes)), np.inf)
     
     # Заповнюємо матрицю
@@ -383,50 +521,61 @@ def analyze_shortest_paths(graph, all_paths, all_distances):
     print(f"   • Знайдено шляхів: {found_paths}")
     print(f"   • Відсоток досяжності: {(found_paths/total_possible_paths)*100:.1f}%")
     
+    # Уся статистика рахується прямо з матриці відстаней: маска досяжних
+    # пар (без діагоналі) і суми за рядками/стовпцями замість словників
+    if isinstance(all_distances, ShortestDistancesView):
+        matrix = all_distances.matrix
+    else:
+        matrix = create_distance_matrix(graph, all_distances).to_numpy()
+    nodes = list(graph.nodes())
+    n = len(nodes)
+    reachable = np.isfinite(matrix)
+    np.fill_diagonal(reachable, False)
+    
     # Аналіз довжин шляхів
-    if all_distances:
-        distances_list = list(all_distances.values())
-        avg_distance = np.mean(distances_list)
-        min_distance = min(distances_list)
-        max_distance = max(distances_list)
+    if reachable.any():
+        distances_list = matrix[reachable]
+        avg_distance = distances_list.mean()
+        min_distance = distances_list.min()
+        max_distance = distances_list.max()
         
         print(f"\n📏 Аналіз відстаней:")
         print(f"   • Середня відстань: {avg_distance:.2f}")
         print(f"   • Мінімальна відстань: {min_distance:.2f}")
         print(f"   • Максимальна відстань: {max_distance:.2f}")
         
-        # Знаходимо найкоротший та найдовший шляхи
-        min_path = min(all_distances.keys(), key=lambda x: all_distances[x])
-        max_path = max(all_distances.keys(), key=lambda x: all_distances[x])
+        # Знаходимо найкоротший та найдовший шляхи (перша пара в порядку рядків)
+        min_i, min_j = divmod(int(np.where(reachable, matrix, np.inf).argmin()), n)
+        max_i, max_j = divmod(int(np.where(reachable, matrix, -np.inf).argmax()), n)
         
-        print(f"   • Найкоротший шлях: {min_path[0]} → {min_path[1]} ({min_distance:.2f})")
-        print(f"   • Найдовший шлях: {max_path[0]} → {max_path[1]} ({max_distance:.2f})")
+        print(f"   • Найкоротший шлях: {nodes[min_i]} → {nodes[min_j]} ({min_distance:.2f})")
+        print(f"   • Найдовший шлях: {nodes[max_i]} → {nodes[max_j]} ({max_distance:.2f})")
     
     # Аналіз центральності станцій
     print(f"\n🎯 Аналіз доступності станцій:")
     
-    # Підрахунок кількості шляхів від кожної станції
-    outgoing_paths = defaultdict(int)
-    incoming_paths = defaultdict(int)
-    avg_outgoing_distance = defaultdict(list)
-    
-    for (start, end), distance in all_distances.items():
-        outgoing_paths[start] += 1
-        incoming_paths[end] += 1
-        avg_outgoing_distance[start].append(distance)
+    # Кількість шляхів від кожної станції та до неї
+    outgoing_paths = reachable.sum(axis=1)
+    incoming_paths = reachable.sum(axis=0)
+    outgoing_sums = np.where(reachable, matrix, 0.0).sum(axis=1)
     
-    # Топ-5 найбільш доступних станцій (з яких можна дістатися до багатьох місць)
-    top_accessible = sorted(outgoing_paths.items(), key=lambda x: x[1], reverse=True)[:5]
+    # Топ-5 найбільш доступних станцій (з яких можна дістатися до багатьох місць);
+    # за рівної кількості - у порядку станцій
+    top_accessible = [i for i in np.lexsort((np.arange(n), -outgoing_paths))
+                      if outgoing_paths[i] > 0][:5]
     print(f"   • Топ-5 станцій з найбільшою доступністю:")
-    for i, (station, count) in enumerate(top_accessible, 1):
-        avg_dist = np.mean(avg_outgoing_distance[station]) if avg_outgoing_distance[station] else 0
-        print(f"     {i}. {station}: {count} напрямків, середня відстань {avg_dist:.2f}")
-    
-    # Центральні станції (до яких легко дістатися)
-    top_central = sorted(incoming_paths.items(), key=lambda x: x[1], reverse=True)[:5]
+    for rank, i in enumerate(top_accessible, 1):
+        avg_dist = outgoing_sums[i] / outgoing_paths[i]
+        print(f"     {rank}. {nodes[i]}: {outgoing_paths[i]} напрямків, середня відстань {avg_dist:.2f}")
+    
+    # Центральні станції (до яких легко дістатися); за рівної кількості -
+    # у порядку першої появи станції як кінця шляху при обході за рядками
+    first_seen = reachable.argmax(axis=0) * n + np.arange(n)
+    top_central = [j for j in np.lexsort((first_seen, -incoming_paths))
+                   if incoming_paths[j] > 0][:5]
     print(f"   • Топ-5 найбільш центральних станцій:")
-    for i, (station, count) in enumerate(top_central, 1):
-        print(f"     {i}. {station}: {count} шляхів ведуть сюди")
+    for rank, j in enumerate(top_central, 1):
+        print(f"     {rank}. {nodes[j]}: {incoming_paths[j]} шляхів ведуть сюди")
 
 def compare_with_networkx(graph, start, end):
     """
@@ -441,22 +590,21 @@ def compare_with_networkx(graph, start, end):
     print("="*50)
     
     # Наша реалізація
-    start_time = time.time()
-    distances, predecessors, stats = dijkstra_algorithm(graph, start)
-    our_path = reconstruct_path(predecessors, start, end)
-    our_time = time.time() - start_time
-    our_distance = distances[end] if distances[end] != float('infinity') else None
+    start_time = time.perf_counter()
+    our_path, our_distance, stats = shortest_path(graph, start, end)
+    our_time = time.perf_counter() - start_time
+    our_distance = our_distance if our_distance != float('infinity') else None
     
     # NetworkX реалізація
-    start_time = time.time()
+    start_time = time.perf_counter()
     try:
         nx_path = nx.shortest_path(graph, start, end, weight='weight')
         nx_distance = nx.shortest_path_length(graph, start, end, weight='weight')
-        nx_time = time.time() - start_time
+        nx_time = time.perf_counter() - start_time
     except nx.NetworkXNoPath:
         nx_path = None
         nx_distance = None
-        nx_time = time.time() - start_time
+        nx_time = time.perf_counter() - start_time
     
     print(f"Маршрут: {start} → {end}")
     print(f"\n{'Реалізація':<15} {'Відстань':<12} {'Час (мс)':<10} {'Шлях'}")
@@ -493,23 +641,60 @@ def main():
     print(f"\n🎯 Демонстрація алгоритму Дейкстри:")
     print(f"Пошук найкоротшого шляху: {start_station} → {end_station}")
     
-    # Виконуємо алгоритм Дейкстри
-    distances, predecessors, stats = dijkstra_algorithm(G, start_station)
-    path = reconstruct_path(predecessors, start_station, end_station)
+    # Виконуємо пошук з ранньою зупинкою
+    path, distance, stats = shortest_path(G, start_station, end_station)
     
     print(f"\n📊 Результати:")
     if path:
         print(f"   • Знайдений шлях: {' → '.join(path)}")
-        print(f"   • Загальна відстань: {distances[end_station]:.2f}")
+        print(f"   • Загальна відстань: {distance:.2f}")
         print(f"   • Кількість станцій: {len(path)}")
     else:
         print(f"   • Шлях не знайдено")
     
     print(f"   • Час виконання: {stats['execution_time']*1000:.3f} мс")
     print(f"   • Ітерацій: {stats['iterations']}")
-    print(f"   • Оброблено вузлів: {stats['nodes_processed']}")
-    
-    # Візуалізуємо результат
+    print(f"   • Оброблено вузлів: {stats['settled_nodes']} з {stats['total_nodes']}")
+    
+    # Порівнюємо кількість оброблених вузлів з повним запуском
+    _, _, bidirectional_stats = shortest_path(G, start_station, end_station,
+                                              method='bidirectional')
+    distances, predecessors, full_stats = dijkstra_algorithm(G, start_station)
+    print(f"\n⚖️  Оброблено вузлів різними режимами:")
+    print(f"   • Повний запуск з одного джерела: {full_stats['nodes_processed']}")
+    print(f"   • З ранньою зупинкою: {stats['settled_nodes']}")
+    print(f"   • Двонаправлений пошук: {bidirectional_stats['settled_nodes']}")
+    
+    # A* на довгому маршруті через усе місто
+    long_start, long_end = 'Аеропорт', 'Нова забудова'
+    _, _, dijkstra_long_stats = shortest_path(G, long_start, long_end)
+    astar_path, astar_distance, astar_stats = astar_algorithm(G, long_start, long_end)
+    print(f"\n🧭 A* на маршруті {long_start} → {long_end}:")
+    if astar_path:
+        print(f"   • Шлях: {' → '.join(astar_path)} ({astar_distance:.2f})")
+    print(f"   • Розкрито вузлів: Дейкстра {dijkstra_long_stats['settled_nodes']}, "
+          f"A* {astar_stats['settled_nodes']}")
+    
+    # Альтернативні маршрути в порядку зростання часу подорожі
+    print(f"\n🔀 Три найкращі маршрути {start_station} → {end_station}:")
+    for rank, (route, cost) in enumerate(k_shortest_paths(G, start_station, end_station, k=3), 1):
+        print(f"   {rank}. {' → '.join(route)} ({cost:.2f})")
+    
+    # Той самий маршрут з урахуванням завантаженості в різний час доби
+    tdg = build_time_dependent_graph(G)
+    print(f"\n🕗 Час у дорозі {start_station} → {end_station} залежно від часу відправлення:")
+    for departure in (8 * 60, 12 * 60, 18 * 60):
+        td_path, arrival, _ = earliest_arrival(tdg, start_station, end_station, departure)
+        print(f"   • {departure // 60:02d}:00 - {arrival - departure:.2f} хв "
+              f"({' → '.join(td_path)})")
+    
+    # Компроміси між часом і кількістю пересадок на довгому маршруті
+    print(f"\n🔁 Маршрути {long_start} → {long_end} з урахуванням пересадок (час / пересадки):")
+    for route, modes, total_time, transfers in pareto_routes(build_multimodal_graph(G),
+                                                             long_start, long_end):
+        print(f"   • {total_time:.2f} хв, пересадок: {transfers} - {' → '.join(route)}")
+    
+    # Візуалізуємо результат (градієнт потребує відстаней до всіх вершин)
     print(f"\n📈 Візуалізація найкоротшого шляху...")
     visualize_shortest_path(G, start_station, end_station, path, distances)
     
@@ -533,8 +718,10 @@ def main():
     
     # Зберігаємо результати
     print(f"\n💾 Збереження результатів...")
-    distance_matrix.to_csv('distance_matrix.csv')
-    print(f"   • Матриця відстаней збережена в 'distance_matrix.csv'")
+    save_distance_store('distance_matrix.bin', distance_matrix.index, distance_matrix.to_numpy())
+    print(f"   • Матриця відстаней збережена в 'distance_matrix.bin'")
+    export_csv('distance_matrix.bin', 'distance_matrix.csv')
+    print(f"   • Копія для сумісності експортована в 'distance_matrix.csv'")
     
     print(f"\n✅ Завдання 3 завершено!")
     print(f"📋 Реалізовано алгоритм Дейкстри")
@@ -0,0 +1,89 @@
+"""
+Масштабування наближеного посередництва: збіг з NetworkX і незміщеність.
+"""
+
+import itertools
+import random
+
+import networkx as nx
+import numpy as np
+import pytest
+
+import centrality
+from centrality import compute_centrality
+
+
+def small_graph():
+    graph = nx.connected_watts_strogatz_graph(9, 4, 0.3, seed=3)
+    return nx.relabel_nodes(graph, {i: f"s{i}" for i in graph})
+
+
+@pytest.mark.parametrize('k', [2, 4, 7])
+def test_sampled_betweenness_matches_networkx(k):
+    graph = small_graph()
+    result = compute_centrality(graph, mode='approx', k=k, seed=11)
+    # NetworkX вибирає опорні вершини тим самим random.Random(seed).sample
+    expected = nx.betweenness_centrality(graph, k=k, seed=11)
+    for node in graph:
+        assert result['betweenness'][node] == pytest.approx(expected[node], abs=1e-12)
+
+
+class _FixedSample(random.Random):
+    """random.Random, що повертає заздалегідь задану вибірку опорних вершин."""
+    pivots = None
+
+    def sample(self, population, k):
+        return list(self.pivots)
+
+
+@pytest.mark.parametrize('k', [2, 3, 5])
+def test_sampled_betweenness_is_unbiased(monkeypatch, k):
+    graph = small_graph()
+    n = graph.number_of_nodes()
+    exact = compute_centrality(graph, mode='exact')['betweenness']
+    monkeypatch.setattr(centrality.random, 'Random', _FixedSample)
+
+    # Середнє за всіма k-вибірками опорних вершин дорівнює точному значенню
+    total = np.zeros(n)
+    subsets = list(itertools.combinations(range(n), k))
+    for pivots in subsets:
+        _FixedSample.pivots = pivots
+        estimate = compute_centrality(graph, mode='approx', k=k)['betweenness']
+        total += [estimate[node] for node in graph]
+
+    mean = total / len(subsets)
+    np.testing.assert_allclose(mean, [exact[node] for node in graph], rtol=0, atol=1e-12)
+
+    # Незміщеність і за умови, що вершина опорна; масштабування n / k
+    # (NetworkX до 3.5) для опорних вершин зміщене в n(k - 1) / (k(n - 1)) разів
+    for index, node in enumerate(graph):
+        with_node = [p for p in subsets if index in p]
+        conditional = 0.0
+        for pivots in with_node:
+            _FixedSample.pivots = pivots
+            conditional += compute_centrality(graph, mode='approx', k=k)['betweenness'][node]
+        conditional /= len(with_node)
+        assert conditional == pytest.approx(exact[node], abs=1e-12)
+
+        old_scaling = conditional * n * (k - 1) / (k * (n - 1))
+        if exact[node] > 0:
+            assert old_scaling < exact[node]
+
+
+def test_exact_pass_yields_eccentricity_summary():
+    from graph_metrics import eccentricity_summary
+
+    graph = small_graph()
+    result = compute_centrality(graph, mode='exact')
+    summary = eccentricity_summary(result['eccentricity'])
+    assert summary['eccentricity'] == nx.eccentricity(graph)
+    assert summary['diameter'] == nx.diameter(graph)
+    assert summary['radius'] == nx.radius(graph)
+    assert summary['center'] == nx.center(graph)
+    expected = nx.closeness_centrality(graph)
+    for node in graph:
+        assert result['closeness'][node] == pytest.approx(expected[node], abs=1e-12)
+
+    graph.add_edge('x', 'y')
+    summary = eccentricity_summary(compute_centrality(graph, mode='exact')['eccentricity'])
+    assert not summary['is_connected'] and summary['diameter'] is None
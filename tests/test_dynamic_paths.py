@@ -0,0 +1,118 @@
+"""
+Еквівалентність DynamicShortestPaths повному перерахунку після кожної зміни ребра.
+"""
+
+import math
+import random
+
+import networkx as nx
+import numpy as np
+import pytest
+
+from csr_graph import build_csr_graph, dijkstra_csr
+from dynamic_paths import DynamicShortestPaths
+
+OPERATIONS = ('increase', 'decrease', 'insert', 'delete')
+
+
+def random_graph(rng, num_nodes=18, num_edges=34):
+    graph = nx.gnm_random_graph(num_nodes, num_edges, seed=rng.randrange(10 ** 6))
+    graph = nx.relabel_nodes(graph, {i: f"s{i}" for i in graph})
+    for u, v in graph.edges():
+        graph[u][v]['weight'] = rng.choice([1.0, 2.0, 2.5, 4.0, 7.0])
+    return graph
+
+
+def apply_random_update(dynamic, graph, rng, operation):
+    edges = list(graph.edges())
+    if operation == 'insert' or not edges:
+        nodes = list(graph.nodes())
+        while True:
+            u, v = rng.sample(nodes, 2)
+            if not graph.has_edge(u, v):
+                break
+        dynamic.update_edge(u, v, rng.choice([0.5, 1.0, 3.0, 6.0]))
+        return
+
+    u, v = rng.choice(edges)
+    weight = graph[u][v]['weight']
+    if operation == 'increase':
+        dynamic.update_edge(u, v, weight + rng.choice([0.5, 2.0, 10.0]))
+    elif operation == 'decrease':
+        dynamic.update_edge(u, v, weight * rng.choice([0.0, 0.25, 0.5]))
+    else:
+        dynamic.update_edge(u, v, None)
+
+
+def assert_matches_recompute(dynamic, graph):
+    csr = build_csr_graph(graph)
+    assert csr.nodes == dynamic.nodes
+    all_paths, all_distances = dynamic.views()
+
+    for source in graph.nodes():
+        i = csr.index[source]
+        expected, _, _ = dijkstra_csr(csr, i)
+        np.testing.assert_allclose(dynamic.distances[i], expected, rtol=0, atol=1e-9)
+
+        nx_distances, _ = nx.single_source_dijkstra(graph, source, weight='weight')
+        for target in graph.nodes():
+            if target == source:
+                continue
+            if target not in nx_distances:
+                assert (source, target) not in all_distances
+                continue
+            assert all_distances[(source, target)] == pytest.approx(nx_distances[target], abs=1e-9)
+
+            # Рівноцінні шляхи можуть відрізнятися, тому перевіряємо, що
+            # шлях існує в графі та має найкоротшу довжину
+            path = all_paths[(source, target)]
+            assert path[0] == source and path[-1] == target
+            length = sum(graph[a][b]['weight'] for a, b in zip(path, path[1:]))
+            assert length == pytest.approx(nx_distances[target], abs=1e-9)
+
+
+@pytest.mark.parametrize('seed', range(6))
+def test_random_updates_match_full_recompute(seed):
+    rng = random.Random(seed)
+    graph = random_graph(rng)
+    dynamic = DynamicShortestPaths(graph)
+    assert_matches_recompute(dynamic, graph)
+
+    for step in range(40):
+        operation = OPERATIONS[step % len(OPERATIONS)] if step < 8 else rng.choice(OPERATIONS)
+        apply_random_update(dynamic, graph, rng, operation)
+        assert_matches_recompute(dynamic, graph)
+        assert dynamic.verify()
+
+
+def test_deleting_bridge_disconnects_pairs():
+    graph = nx.Graph()
+    graph.add_weighted_edges_from([('a', 'b', 1.0), ('b', 'c', 2.0), ('c', 'd', 1.0)])
+    dynamic = DynamicShortestPaths(graph)
+
+    dynamic.update_edge('b', 'c', None)
+    assert_matches_recompute(dynamic, graph)
+    assert math.isinf(dynamic.distances[dynamic.index['a'], dynamic.index['d']])
+
+    dynamic.update_edge('a', 'd', 4.0)
+    assert_matches_recompute(dynamic, graph)
+
+
+def test_update_keeps_graph_attributes_in_sync():
+    from route_cache import graph_version
+
+    graph = nx.Graph()
+    graph.add_edge('a', 'b', weight=2.0, travel_time=2.0, distance=1.0, transport_type='metro')
+    graph.add_edge('b', 'c', weight=3.0, travel_time=3.0, distance=2.0, transport_type='bus')
+    dynamic = DynamicShortestPaths(graph)
+    version = graph_version(graph)
+
+    dynamic.update_edge('a', 'b', 5.0)
+    assert graph['a']['b'] == {'weight': 5.0, 'travel_time': 5.0, 'distance': 1.0,
+                               'transport_type': 'metro'}
+
+    dynamic.update_edge('a', 'c', 1.5, distance=0.8)
+    assert graph['a']['c'] == {'weight': 1.5, 'travel_time': 1.5, 'distance': 0.8,
+                               'transport_type': 'bus'}
+    assert graph_version(graph) == version + 2
+    assert_matches_recompute(dynamic, graph)
@@ -0,0 +1,30 @@
+"""
+Перевірка сумісності індексу орієнтирів з графом перед запитами ALT.
+"""
+
+import pytest
+
+from csr_graph import dijkstra_point_to_point_csr
+from landmarks import alt_shortest_path, build_landmark_index
+from network_generator import generate_city_network
+
+
+def test_alt_matches_dijkstra():
+    csr = generate_city_network(500, seed=3).csr
+    index = build_landmark_index(None, csr=csr)
+    nodes = csr.nodes
+    for s, t in [(0, 499), (17, 250), (123, 321)]:
+        _, expected, _ = dijkstra_point_to_point_csr(csr, s, t)
+        _, distance, _ = alt_shortest_path(index, csr, nodes[s], nodes[t])
+        assert distance == pytest.approx(expected)
+
+
+def test_in_place_weight_change_after_verification_is_rejected():
+    csr = generate_city_network(500, seed=3).csr
+    index = build_landmark_index(None, csr=csr)
+    nodes = csr.nodes
+    alt_shortest_path(index, csr, nodes[0], nodes[499])
+
+    csr.weights[0] *= 0.5
+    with pytest.raises(ValueError):
+        alt_shortest_path(index, csr, nodes[0], nodes[499])
@@ -0,0 +1,49 @@
+"""
+Скидання кешу CachingRouter після змін графа.
+"""
+
+import networkx as nx
+
+from route_cache import CachingRouter, bump_graph_version, set_edge_weight
+
+
+def line_graph():
+    graph = nx.Graph()
+    graph.add_weighted_edges_from([('a', 'b', 1.0), ('b', 'c', 1.0), ('a', 'c', 5.0)])
+    return graph
+
+
+def test_set_edge_weight_invalidates_cache():
+    graph = line_graph()
+    router = CachingRouter(graph)
+    assert router.distance('a', 'c') == 2.0
+
+    set_edge_weight(graph, 'a', 'c', 0.5)
+    assert router.distance('a', 'c') == 0.5
+    assert router.stats()['invalidations'] == 1
+
+
+def test_structural_change_without_version_bump_invalidates_cache():
+    graph = line_graph()
+    router = CachingRouter(graph)
+    assert router.distance('a', 'c') == 2.0
+
+    graph.remove_edge('a', 'b')
+    assert router.distance('a', 'c') == 5.0
+
+    graph.add_edge('a', 'd', weight=1.0)
+    graph.add_edge('d', 'c', weight=1.0)
+    assert router.distance('a', 'c') == 2.0
+    assert router.stats()['invalidations'] == 2
+
+
+def test_direct_weight_change_needs_version_bump():
+    graph = line_graph()
+    router = CachingRouter(graph)
+    assert router.distance('a', 'c') == 2.0
+
+    graph['a']['c']['weight'] = 0.5
+    assert router.distance('a', 'c') == 2.0
+
+    bump_graph_version(graph)
+    assert router.distance('a', 'c') == 0.5
@@ -0,0 +1,74 @@
+"""
+Потокове завантаження: типи назв станцій між частинами, пропущені назви та
+статистика відкинутих ребер.
+"""
+
+import pytest
+
+from streaming_loader import load_network, load_stations
+
+
+def write_edges(tmp_path, rows):
+    path = tmp_path / "edges.csv"
+    lines = ["source,target,distance,transport_type"]
+    lines += [",".join(str(value) for value in row) for row in rows]
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return str(path)
+
+
+def test_numeric_station_names_are_interned_once_across_chunks(tmp_path):
+    # Перша частина - лише числа, друга - з текстовою назвою: без dtype=str
+    # станція 3 потрапила б в індекс і як 3, і як '3'
+    path = write_edges(tmp_path, [
+        (1, 2, 1.0, "bus"),
+        (2, 3, 1.0, "bus"),
+        (3, "Вокзал", 2.0, "metro"),
+        (3, 1, 4.0, "bus"),
+    ])
+
+    network, stats = load_network(path, chunk_rows=2)
+
+    assert stats['chunks'] == 2
+    assert network.csr.nodes == ['1', '2', '3', 'Вокзал']
+    assert stats['edges'] == 4
+
+
+def test_rows_without_station_are_skipped_and_counted(tmp_path):
+    path = write_edges(tmp_path, [
+        ("A", "B", 1.0, "bus"),
+        ("", "B", 1.0, "bus"),
+        ("B", " ", 1.0, "bus"),
+        ("B", "C", 1.0, "bus"),
+    ])
+
+    network, stats = load_network(path, chunk_rows=3)
+
+    assert network.csr.nodes == ['A', 'B', 'C']
+    assert stats['missing_station_rows'] == 2
+    assert stats['edges'] == 2
+
+
+def test_self_loops_and_duplicates_are_counted_separately(tmp_path):
+    path = write_edges(tmp_path, [
+        ("A", "B", 3.0, "bus"),
+        ("B", "A", 1.0, "bus"),
+        ("A", "A", 1.0, "bus"),
+        ("A", "A", 2.0, "bus"),
+        ("B", "C", 1.0, "bus"),
+    ])
+
+    network, stats = load_network(path)
+
+    assert stats['rows'] == 5
+    assert stats['self_loops_dropped'] == 2
+    assert stats['duplicates_dropped'] == 1
+    assert stats['edges'] == 2
+    assert sorted(network.distances.tolist()) == [1.0, 1.0]
+
+
+def test_station_file_without_name_is_rejected(tmp_path):
+    path = tmp_path / "stations.csv"
+    path.write_text("station,x,y\nA,0,0\n,1,1\n", encoding="utf-8")
+
+    with pytest.raises(ValueError):
+        load_stations(str(path))
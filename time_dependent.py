@@ -0,0 +1,428 @@
+"""
+Залежні від часу ваги ребер для маршрутів у години пік.
+
+Час проїзду ребра e з моменту t дорівнює base(e) * factor(p(e), t), де
+base - статична вага (час подорожі з task3), а factor - кусково-лінійний
+профіль завантаженості типу транспорту (період - одна доба, час у
+хвилинах від півночі). Профілі зберігаються в масивах:
+
+    profile_indptr  - зсуви точок кожного профілю (як indptr у CSR)
+    profile_times   - моменти точок зламу
+    profile_factors - коефіцієнти в точках зламу
+
+а кожен запис CSR-графа має лише номер свого профілю (arc_profiles).
+
+Профілі перевіряються на властивість FIFO: пізніший виїзд ніколи не дає
+ранішого прибуття. Для цього нахил коефіцієнта, помножений на найбільшу
+базову вагу ребер з цим профілем, не може бути меншим за -1. За FIFO
+алгоритм Дейкстри за часом прибуття дає точний результат.
+
+Профільний запит повертає функцію часу прибуття від часу відправлення на
+всьому вікні відправлення. Мітки вершин - кусково-лінійні функції
+(масиви точок зламу); проходження ребра - композиція з профілем ребра
+(link), злиття міток - поточковий мінімум з точками перетину (merge).
+"""
+
+import bisect
+import heapq
+import itertools
+import time
+
+import numpy as np
+
+from csr_graph import build_csr_graph, edge_attribute_codes
+
+# Період профілів: доба в хвилинах
+PERIOD = 24 * 60
+
+# Назва профілю для ребер з невідомим типом транспорту
+CONSTANT_PROFILE = 'constant'
+
+# Коефіцієнти завантаженості: (хвилина доби, множник часу проїзду)
+DEFAULT_PROFILES = {
+    'metro': [(0, 1.0), (420, 1.0), (480, 1.15), (570, 1.0),
+              (1020, 1.0), (1080, 1.15), (1170, 1.0), (1440, 1.0)],
+    'train': [(0, 1.0), (420, 1.0), (480, 1.25), (600, 1.0),
+              (1020, 1.0), (1080, 1.25), (1200, 1.0), (1440, 1.0)],
+    'bus': [(0, 1.0), (360, 1.0), (480, 1.8), (600, 1.1),
+            (960, 1.1), (1080, 1.7), (1200, 1.0), (1440, 1.0)],
+}
+
+# Допуск порівняння часів прибуття
+_EPSILON = 1e-9
+
+
+class TimeDependentGraph:
+    """
+    CSR-граф з кусково-лінійними профілями часу проїзду.
+
+    Attributes:
+        csr (CSRGraph): Граф з базовими вагами
+        profile_names (list): Назви профілів у порядку їх номерів
+        profile_indptr (np.ndarray): Зсуви точок профілів
+        profile_times (np.ndarray): Моменти точок зламу (хвилини доби)
+        profile_factors (np.ndarray): Коефіцієнти в точках зламу
+        arc_profiles (np.ndarray): Номер профілю для кожного запису CSR
+    """
+
+    def __init__(self, csr, profile_names, profile_indptr, profile_times,
+                 profile_factors, arc_profiles):
+        self.csr = csr
+        self.profile_names = list(profile_names)
+        self.profile_indptr = np.asarray(profile_indptr, dtype=np.int64)
+        self.profile_times = np.asarray(profile_times, dtype=np.float64)
+        self.profile_factors = np.asarray(profile_factors, dtype=np.float64)
+        self.arc_profiles = np.asarray(arc_profiles, dtype=np.int16)
+        self._lists = None
+
+    def profile(self, profile_id):
+        """
+        Повертає точки зламу профілю.
+
+        Args:
+            profile_id (int): Номер профілю
+
+        Returns:
+            tuple: (моменти, коефіцієнти)
+        """
+        lo, hi = self.profile_indptr[profile_id], self.profile_indptr[profile_id + 1]
+        return self.profile_times[lo:hi], self.profile_factors[lo:hi]
+
+    def profile_lists(self):
+        """
+        Повертає профілі як списки Python (моменти, коефіцієнти, нахили).
+
+        Returns:
+            list: Кортеж списків для кожного профілю
+        """
+        if self._lists is None:
+            self._lists = []
+            for profile_id in range(len(self.profile_names)):
+                times, factors = self.profile(profile_id)
+                slopes = np.diff(factors) / np.diff(times)
+                self._lists.append((times.tolist(), factors.tolist(), slopes.tolist()))
+        return self._lists
+
+    def travel_time(self, arc, departure):
+        """
+        Час проїзду запису CSR з моменту departure.
+
+        Args:
+            arc (int): Номер запису CSR
+            departure (float): Момент виїзду (хвилини, можна понад добу)
+
+        Returns:
+            float: Час проїзду в хвилинах
+        """
+        times, factors, slopes = self.profile_lists()[self.arc_profiles[arc]]
+        return self.csr.weights[arc] * _factor_at(times, factors, slopes, departure)
+
+
+def _factor_at(times, factors, slopes, moment):
+    moment = moment % PERIOD
+    k = min(bisect.bisect_right(times, moment) - 1, len(slopes) - 1)
+    return factors[k] + slopes[k] * (moment - times[k])
+
+
+def _validate_profile(name, points):
+    times = np.array([t for t, _ in points], dtype=np.float64)
+    factors = np.array([f for _, f in points], dtype=np.float64)
+    if len(times) < 2 or times[0] != 0 or times[-1] != PERIOD:
+        raise ValueError(f"Профіль '{name}' має покривати добу від 0 до {PERIOD} хвилин")
+    if np.any(np.diff(times) <= 0):
+        raise ValueError(f"Моменти профілю '{name}' мають зростати")
+    if np.any(factors <= 0):
+        raise ValueError(f"Коефіцієнти профілю '{name}' мають бути додатними")
+    if factors[0] != factors[-1]:
+        raise ValueError(f"Профіль '{name}' має бути неперервним на межі доби")
+    return times, factors
+
+
+def build_time_dependent_graph(graph, profiles=None, weight='weight'):
+    """
+    Будує граф із залежними від часу вагами.
+
+    Профіль ребра обирається за атрибутом 'profile' (якщо він є), інакше -
+    за типом транспорту; ребра без відомого профілю мають сталий час проїзду.
+
+    Args:
+        graph (nx.Graph): Зважений граф (ваги - час проїзду поза годиною пік)
+        profiles (dict): Назва → список (хвилина доби, коефіцієнт);
+                         за замовчуванням DEFAULT_PROFILES
+        weight (str): Атрибут ребра з базовою вагою
+
+    Returns:
+        TimeDependentGraph: Граф з профілями
+
+    Raises:
+        ValueError: Якщо профіль некоректний або порушує FIFO
+    """
+    if profiles is None:
+        profiles = DEFAULT_PROFILES
+    profiles = dict(profiles)
+    profiles.setdefault(CONSTANT_PROFILE, [(0, 1.0), (PERIOD, 1.0)])
+
+    names = list(profiles)
+    validated = [_validate_profile(name, profiles[name]) for name in names]
+    indptr = np.zeros(len(names) + 1, dtype=np.int64)
+    np.cumsum([len(times) for times, _ in validated], out=indptr[1:])
+
+    csr = build_csr_graph(graph, weight=weight)
+
+    # Явно вказаний профіль ребра має перевагу над типом транспорту
+    by_profile = edge_attribute_codes(graph, 'profile', names)
+    by_transport = edge_attribute_codes(graph, 'transport_type', names)
+    edge_profiles = np.where(by_profile >= 0, by_profile, by_transport)
+    edge_profiles[edge_profiles < 0] = names.index(CONSTANT_PROFILE)
+    arc_profiles = edge_profiles[csr.edge_ids]
+
+    # FIFO: t + base * factor(t) не спадає, тобто base * нахил >= -1
+    for profile_id, (times, factors) in enumerate(validated):
+        arcs = arc_profiles == profile_id
+        if not np.any(arcs):
+            continue
+        min_slope = float(np.min(np.diff(factors) / np.diff(times)))
+        max_base = float(np.max(csr.weights[arcs]))
+        if max_base * min_slope < -1:
+            raise ValueError(f"Профіль '{names[profile_id]}' порушує FIFO: "
+                             f"пізніший виїзд може дати раніше прибуття")
+
+    return TimeDependentGraph(csr, names, indptr,
+                              np.concatenate([times for times, _ in validated]),
+                              np.concatenate([factors for _, factors in validated]),
+                              arc_profiles)
+
+
+def td_dijkstra(tdg, source, departure, target=None):
+    """
+    Алгоритм Дейкстри за часом прибуття для заданого моменту відправлення.
+
+    Args:
+        tdg (TimeDependentGraph): Граф з профілями
+        source (int): Номер початкової вершини
+        departure (float): Момент відправлення (хвилини від півночі)
+        target (int): Номер цільової вершини для ранньої зупинки (необов'язково)
+
+    Returns:
+        tuple: (масив часів прибуття, масив попередників (-1 - немає), статистика)
+    """
+    indptr, indices, weights = tdg.csr.adjacency_lists()
+    arc_profiles = tdg.arc_profiles.tolist()
+    profile_lists = tdg.profile_lists()
+    n = tdg.csr.num_nodes
+    inf = float('infinity')
+
+    arrival = [inf] * n
+    pred = [-1] * n
+    settled = [False] * n
+    arrival[source] = float(departure)
+
+    heap = [(float(departure), source)]
+    iterations = 0
+    processed = 0
+
+    start_time = time.perf_counter()
+
+    while heap:
+        iterations += 1
+        current_time, current = heapq.heappop(heap)
+        if settled[current]:
+            continue
+        settled[current] = True
+        processed += 1
+
+        if current == target:
+            break
+
+        for k in range(indptr[current], indptr[current + 1]):
+            neighbor = indices[k]
+            if settled[neighbor]:
+                continue
+            times, factors, slopes = profile_lists[arc_profiles[k]]
+            new_time = current_time + weights[k] * _factor_at(times, factors, slopes, current_time)
+            if new_time < arrival[neighbor]:
+                arrival[neighbor] = new_time
+                pred[neighbor] = current
+                heapq.heappush(heap, (new_time, neighbor))
+
+    end_time = time.perf_counter()
+
+    stats = {
+        'iterations': iterations,
+        'execution_time': end_time - start_time,
+        'settled_nodes': processed
+    }
+
+    return np.array(arrival, dtype=np.float64), np.array(pred, dtype=np.int32), stats
+
+
+def link_arrival(xs, ys, base, times, factors):
+    """
+    Функція прибуття після проходження ребра: g(x) = f(x) + base * factor(f(x)).
+
+    Args:
+        xs (np.ndarray): Моменти відправлення (точки зламу f)
+        ys (np.ndarray): Час прибуття до початку ребра в цих точках
+        base (float): Базова вага ребра
+        times (np.ndarray): Моменти точок зламу профілю ребра
+        factors (np.ndarray): Коефіцієнти профілю ребра
+
+    Returns:
+        tuple: (моменти відправлення, час прибуття до кінця ребра)
+    """
+    first, last = int(ys[0] // PERIOD), int(ys[-1] // PERIOD)
+    breaks = np.concatenate([times + k * PERIOD for k in range(first, last + 1)])
+    breaks = breaks[(breaks > ys[0]) & (breaks < ys[-1])]
+
+    if len(breaks):
+        # f не спадає (FIFO), тому прообрази точок зламу знаходимо інтерполяцією
+        new_xs = np.union1d(xs, np.interp(breaks, ys, xs))
+        ys = np.interp(new_xs, xs, ys)
+        xs = new_xs
+
+    return xs, ys + base * np.interp(ys % PERIOD, times, factors)
+
+
+def merge_arrival(xs, ys, other_xs, other_ys):
+    """
+    Поточковий мінімум двох функцій прибуття з однаковою областю визначення.
+
+    Args:
+        xs, ys (np.ndarray): Поточна функція
+        other_xs, other_ys (np.ndarray): Функція-кандидат
+
+    Returns:
+        tuple: (моменти, мінімум функцій, чи покращив кандидат поточну функцію)
+    """
+    grid = np.union1d(xs, other_xs)
+    current = np.interp(grid, xs, ys)
+    candidate = np.interp(grid, other_xs, other_ys)
+    difference = current - candidate
+
+    # Точки перетину всередині відрізків, де знак різниці змінюється
+    crossing = np.flatnonzero(difference[:-1] * difference[1:] < 0)
+    if len(crossing):
+        share = difference[crossing] / (difference[crossing] - difference[crossing + 1])
+        extra = grid[crossing] + (grid[crossing + 1] - grid[crossing]) * share
+        grid = np.union1d(grid, extra)
+        current = np.interp(grid, xs, ys)
+        candidate = np.interp(grid, other_xs, other_ys)
+
+    improved = bool(np.any(candidate < current - _EPSILON))
+    if not improved:
+        return xs, ys, False
+
+    return _simplify(grid, np.minimum(current, candidate)) + (True,)
+
+
+def _simplify(xs, ys):
+    """Прибирає внутрішні точки, що лежать на прямій між сусідами."""
+    if len(xs) <= 2:
+        return xs, ys
+    expected = ys[:-2] + (ys[2:] - ys[:-2]) * (xs[1:-1] - xs[:-2]) / (xs[2:] - xs[:-2])
+    keep = np.ones(len(xs), dtype=bool)
+    keep[1:-1] = np.abs(expected - ys[1:-1]) > _EPSILON
+    return xs[keep], ys[keep]
+
+
+def profile_query(tdg, source, target, window_start, window_end):
+    """
+    Функція часу прибуття до цілі для всіх моментів відправлення у вікні.
+
+    Мітки вершин - кусково-лінійні функції прибуття. Вершина з найменшим
+    можливим часом прибуття обробляється першою (алгоритм з корекцією
+    міток); пошук зупиняється, коли жодна вершина в черзі вже не може
+    покращити функцію цілі.
+
+    Args:
+        tdg (TimeDependentGraph): Граф з профілями
+        source (int): Номер початкової вершини
+        target (int): Номер кінцевої вершини
+        window_start (float): Початок вікна відправлення (хвилини)
+        window_end (float): Кінець вікна відправлення (хвилини)
+
+    Returns:
+        tuple: (моменти відправлення або None, час прибуття, статистика)
+    """
+    if window_end < window_start:
+        raise ValueError("Кінець вікна відправлення раніше за початок")
+
+    indptr, indices, weights = tdg.csr.adjacency_lists()
+    arc_profiles = tdg.arc_profiles.tolist()
+    profiles = [tdg.profile(profile_id) for profile_id in range(len(tdg.profile_names))]
+
+    window = np.array([window_start, window_end], dtype=np.float64)
+    if window_end == window_start:
+        window = window[:1]
+    labels = {source: (window, window.copy())}
+    versions = {source: 0}
+    counter = itertools.count()
+    heap = [(float(window[0]), next(counter), source, 0)]
+    iterations = 0
+
+    start_time = time.perf_counter()
+
+    while heap:
+        key, _, current, version = heapq.heappop(heap)
+        if version != versions[current]:
+            continue
+
+        # Жоден шлях через вершини з черги не прибуде раніше, ніж ціль уже
+        if target in labels and key >= labels[target][1][-1]:
+            break
+
+        iterations += 1
+        xs, ys = labels[current]
+        for k in range(indptr[current], indptr[current + 1]):
+            neighbor = indices[k]
+            times, factors = profiles[arc_profiles[k]]
+            new_xs, new_ys = link_arrival(xs, ys, weights[k], times, factors)
+
+            if neighbor in labels:
+                new_xs, new_ys, improved = merge_arrival(*labels[neighbor], new_xs, new_ys)
+                if not improved:
+                    continue
+            labels[neighbor] = (new_xs, new_ys)
+            versions[neighbor] = versions.get(neighbor, -1) + 1
+            heapq.heappush(heap, (float(new_ys[0]), next(counter), neighbor,
+                                  versions[neighbor]))
+
+    end_time = time.perf_counter()
+
+    stats = {
+        'iterations': iterations,
+        'execution_time': end_time - start_time,
+        'labeled_nodes': len(labels)
+    }
+
+    if target not in labels:
+        return None, None, stats
+    departures, arrivals = labels[target]
+    stats['breakpoints'] = len(departures)
+    return departures, arrivals, stats
+
+
+def earliest_arrival(tdg, start, end, departure):
+    """
+    Найраніший час прибуття та шлях між станціями.
+
+    Args:
+        tdg (TimeDependentGraph): Граф з профілями
+        start (str): Початкова станція
+        end (str): Кінцева станція
+        departure (float): Момент відправлення (хвилини від півночі)
+
+    Returns:
+        tuple: (шлях або None, час прибуття, статистика)
+    """
+    csr = tdg.csr
+    source, target = csr.index[start], csr.index[end]
+    arrival, pred, stats = td_dijkstra(tdg, source, departure, target=target)
+    if not np.isfinite(arrival[target]):
+        return None, float('infinity'), stats
+
+    path = [target]
+    while pred[path[-1]] != -1:
+        path.append(int(pred[path[-1]]))
+    path.reverse()
+    return [csr.nodes[i] for i in path], float(arrival[target]), stats